@@ -2,17 +2,38 @@ import asyncio
 from tradedeck.app.core.database import async_session
 from sqlalchemy import text
 
+# One round trip: both result sets tagged by src ('ctl' sorts before 'state')
+CHECK_SQL = """
+WITH recent_ctl AS (
+    SELECT 'ctl' AS src, strategy_name, CAST(action AS TEXT) AS c1, actor AS c2,
+           acked_at AS c3, created_at AS c4
+    FROM strategy_control_log ORDER BY created_at DESC LIMIT 5
+),
+states AS (
+    SELECT 'state' AS src, strategy_name, CAST(status AS TEXT), CAST(control_intent AS TEXT),
+           intent_set_at, intent_acked_at
+    FROM strategy_states
+)
+SELECT * FROM recent_ctl
+UNION ALL
+SELECT * FROM states
+ORDER BY src, c4 DESC
+"""
+
+HEADERS = {
+    "ctl":   "--- Last 5 Control Log Entries ---",
+    "state": "\n--- Strategy States ---",
+}
+
 async def check():
     async with async_session() as db:
-        print("--- Last 5 Control Log Entries ---")
-        r = await db.execute(text("SELECT strategy_name, action, actor, acked_at, created_at FROM strategy_control_log ORDER BY created_at DESC LIMIT 5"))
-        for row in r.fetchall():
-            print(row)
-            
-        print("\n--- Strategy States ---")
-        r = await db.execute(text("SELECT strategy_name, status, control_intent, intent_set_at, intent_acked_at FROM strategy_states"))
-        for row in r.fetchall():
-            print(row)
+        r = await db.stream(text(CHECK_SQL))
+        src = None
+        async for row in r:
+            if row.src != src:
+                src = row.src
+                print(HEADERS[src])
+            print(tuple(row)[1:])
 
 if __name__ == "__main__":
     asyncio.run(check())
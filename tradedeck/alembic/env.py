@@ -5,6 +5,7 @@ import asyncio
 from logging.config import fileConfig
 
 from alembic import context
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from app.core.config import settings
@@ -16,9 +17,13 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Postgres advisory lock key — serializes upgrades across processes
+# (several app workers with MIGRATION_MODE=sync/async, a sidecar, a manual run)
+MIGRATION_LOCK_KEY = "alembic_upgrade"
+
 
 def run_migrations_offline() -> None:
-    url = settings.DATABASE_URL
+    url = settings.ASYNC_DATABASE_URL
     context.configure(
         url=url, target_metadata=target_metadata,
         literal_binds=True, dialect_opts={"paramstyle": "named"},
@@ -28,7 +33,7 @@ def run_migrations_offline() -> None:
 
 
 async def run_migrations_online() -> None:
-    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+    engine = create_async_engine(settings.ASYNC_DATABASE_URL, echo=False)
     async with engine.connect() as connection:
         await connection.run_sync(do_run_migrations)
     await engine.dispose()
@@ -36,8 +41,20 @@ async def run_migrations_online() -> None:
 
 def do_run_migrations(connection):
     context.configure(connection=connection, target_metadata=target_metadata)
-    with context.begin_transaction():
-        context.run_migrations()
+    serialize = connection.dialect.name == "postgresql"
+    if serialize:
+        # Session-level lock: other upgraders block here until this one
+        # finishes, then find the schema already at head. Survives the
+        # per-migration commits (and autocommit_block) on this connection.
+        connection.execute(text("SELECT pg_advisory_lock(hashtext(:k))"), {"k": MIGRATION_LOCK_KEY})
+        connection.commit()
+    try:
+        with context.begin_transaction():
+            context.run_migrations()
+    finally:
+        if serialize:
+            connection.execute(text("SELECT pg_advisory_unlock(hashtext(:k))"), {"k": MIGRATION_LOCK_KEY})
+            connection.commit()
 
 
 def run_async_migrations():
@@ -75,10 +75,10 @@ def upgrade() -> None:
         sa.UniqueConstraint("idempotency_key", name="uq_order_idempotency"),
         sa.UniqueConstraint("broker_order_id", name="uq_order_broker_id"),
     )
-    op.create_index("idx_order_status",  "orders", ["status"])
     op.create_index("idx_order_symbol",  "orders", ["symbol"])
     op.create_index("idx_order_session", "orders", ["session_id"])
     op.create_index("idx_order_broker",  "orders", ["broker_order_id"])
+    # idx_order_status is built CONCURRENTLY in 0005_concurrent_indexes
 
     # ── positions ─────────────────────────────────────────────
     op.create_table(
@@ -130,8 +130,8 @@ def upgrade() -> None:
         sa.Column("created_at",  sa.DateTime, server_default=sa.text("NOW()"), nullable=False),
     )
     op.create_index("idx_audit_event",   "audit_logs", ["event_type"])
-    op.create_index("idx_audit_entity",  "audit_logs", ["entity_type", "entity_id"])
     op.create_index("idx_audit_time",    "audit_logs", ["created_at"])
+    # idx_audit_entity is built CONCURRENTLY in 0005_concurrent_indexes
 
     # ── AUDIT LOG TAMPER-PROOF TRIGGER ────────────────────────
     # Prevents any UPDATE or DELETE on audit_logs at DB level.
@@ -192,17 +192,32 @@ def upgrade() -> None:
         END;
         $$ LANGUAGE plpgsql;
     """)
-    for table in ["trading_sessions", "orders", "positions", "circuit_breaker_states"]:
-        op.execute(f"""
-            CREATE TRIGGER {table}_updated_at
-            BEFORE UPDATE ON {table}
-            FOR EACH ROW EXECUTE FUNCTION update_updated_at();
-        """)
+    # One DO block → one round trip for all tables
+    op.execute("""
+        DO $$
+        DECLARE t text;
+        BEGIN
+            FOREACH t IN ARRAY ARRAY['trading_sessions', 'orders', 'positions', 'circuit_breaker_states'] LOOP
+                EXECUTE format(
+                    'CREATE TRIGGER %I BEFORE UPDATE ON %I '
+                    'FOR EACH ROW EXECUTE FUNCTION update_updated_at()',
+                    t || '_updated_at', t
+                );
+            END LOOP;
+        END $$;
+    """)
 
 
 def downgrade() -> None:
-    for table in ["trading_sessions", "orders", "positions", "circuit_breaker_states"]:
-        op.execute(f"DROP TRIGGER IF EXISTS {table}_updated_at ON {table}")
+    op.execute("""
+        DO $$
+        DECLARE t text;
+        BEGIN
+            FOREACH t IN ARRAY ARRAY['trading_sessions', 'orders', 'positions', 'circuit_breaker_states'] LOOP
+                EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_updated_at', t);
+            END LOOP;
+        END $$;
+    """)
     op.execute("DROP TRIGGER IF EXISTS audit_log_immutable ON audit_logs")
     op.execute("DROP FUNCTION IF EXISTS prevent_audit_modification()")
     op.execute("DROP FUNCTION IF EXISTS update_updated_at()")
@@ -84,7 +84,7 @@ def upgrade() -> None:
 
         sa.UniqueConstraint("strategy_name", name="uq_strategy_name"),
     )
-    op.create_index("idx_ss_status",   "strategy_states", ["status"])
+    # idx_ss_status is built CONCURRENTLY in 0005_concurrent_indexes
     op.create_index("idx_ss_session",  "strategy_states", ["session_id"])
     op.create_index("idx_ss_intent",   "strategy_states", ["control_intent"],
                     postgresql_where="control_intent IS NOT NULL")
@@ -57,16 +57,14 @@ def upgrade() -> None:
         sa.Column("tick_rate_hz",       sa.Float, nullable=True),  # ticks/sec in last interval
     )
 
-    op.create_index("idx_rm_time",      "resource_metrics", ["recorded_at"])
+    # idx_rm_time is built CONCURRENTLY in 0005_concurrent_indexes
     op.create_index("idx_rm_rss",       "resource_metrics", ["rss_mb"])
     op.create_index("idx_rm_leak_flag", "resource_metrics", ["rss_leak_flag"],
                     postgresql_where="rss_leak_flag = true")
 
-    # Automatic cleanup: delete rows older than 7 days
-    # This runs via the monitor worker, not a DB job, to keep it portable.
-    # But we add a partial index to make the delete fast.
-    op.create_index("idx_rm_cleanup", "resource_metrics", ["recorded_at"],
-                    postgresql_where="recorded_at < NOW() - INTERVAL '7 days'")
+    # Automatic cleanup: rows older than 7 days are removed by the monitor
+    # worker. Since 0008 this drops whole daily partitions, so there is no
+    # idx_rm_cleanup (a NOW()-based predicate is not IMMUTABLE anyway).
 
     # ── resource_alerts ───────────────────────────────────────────────────
     # When monitor detects a threshold breach, it inserts here.
@@ -0,0 +1,60 @@
+"""
+Alembic migration: 0005_concurrent_indexes.py
+
+Builds secondary indexes with CREATE INDEX CONCURRENTLY.
+
+Why:
+  A plain CREATE INDEX holds a SHARE lock for the whole build — every
+  INSERT/UPDATE/DELETE on orders, audit_logs, resource_metrics etc. stalls
+  until it finishes. CONCURRENTLY builds without blocking writers, so this
+  revision can run against a live trading database.
+
+CONCURRENTLY cannot run inside a transaction, so every statement here runs
+in an autocommit block. IF NOT EXISTS keeps it idempotent: databases that
+already got these indexes from 0001–0003 skip them.
+
+Also creates the indexes declared on the models but never migrated
+(idx_order_created, idx_order_active, idx_position_*, idx_pnl_*,
+idx_audit_session).
+"""
+from alembic import op
+
+revision = "0005_concurrent_indexes"
+down_revision = "0004_add_strategy_details"
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, partial WHERE clause)
+INDEXES = [
+    # Long-tail indexes moved out of 0001–0003
+    ("idx_order_status",     "orders",           "status",                  None),
+    ("idx_audit_entity",     "audit_logs",       "entity_type, entity_id",  None),
+    ("idx_ss_status",        "strategy_states",  "status",                  None),
+    ("idx_rm_time",          "resource_metrics", "recorded_at",             None),
+
+    # Declared in app/models/db.py, missing from earlier migrations
+    ("idx_order_created",    "orders",           "created_at",              None),
+    ("idx_order_active",     "orders",           "session_id, status",
+     "status NOT IN ('FILLED','CANCELLED','REJECTED','EXPIRED','RISK_REJECTED')"),
+    ("idx_position_symbol",  "positions",        "symbol",                  None),
+    ("idx_position_active",  "positions",        "session_id, net_quantity", "net_quantity != 0"),
+    ("idx_pnl_order",        "pnl_records",      "order_id",                None),
+    ("idx_pnl_time",         "pnl_records",      "recorded_at",             None),
+    ("idx_audit_session",    "audit_logs",       "session_id",              None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, cols, where in INDEXES:
+            sql = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({cols})"
+            if where:
+                sql += f" WHERE {where}"
+            op.execute(sql)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
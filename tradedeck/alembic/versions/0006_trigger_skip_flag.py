@@ -0,0 +1,52 @@
+"""
+Alembic migration: 0006_trigger_skip_flag.py
+
+Lets bulk data migrations bypass the per-row update_updated_at() trigger.
+
+update_updated_at() is a BEFORE UPDATE ... FOR EACH ROW trigger, so a
+backfill that touches N rows pays N plpgsql calls. Data migrations can now
+opt out for the current transaction only:
+
+    op.execute("SET LOCAL app.skip_trigger = 'on'")
+    op.execute("UPDATE orders SET ... WHERE ...")
+
+SET LOCAL is transaction-scoped, takes no table lock (unlike ALTER TABLE
+... DISABLE TRIGGER) and needs no superuser (unlike session_replication_role).
+The setting is unknown to normal sessions → current_setting(..., true)
+returns NULL → trigger runs as before.
+
+Note: INSERTs (e.g. the feed_heartbeat seed in 0002) never fire this trigger.
+"""
+from alembic import op
+
+revision = "0006_trigger_skip_flag"
+down_revision = "0005_concurrent_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_updated_at()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF current_setting('app.skip_trigger', true) = 'on' THEN
+                RETURN NEW;
+            END IF;
+            NEW.updated_at = NOW();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_updated_at()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.updated_at = NOW();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
@@ -0,0 +1,46 @@
+"""
+Alembic migration: 0007_covering_indexes.py
+
+Covering (INCLUDE) indexes for the "latest N rows" queries.
+
+  strategy_control_log — debug_strategy.py / GET /control-log:
+      SELECT strategy_name, action, actor, acked_at, created_at
+      ORDER BY created_at DESC LIMIT n
+  resource_metrics — ResourceMonitor.get_recent() dashboard reads
+
+With the payload columns in the index leaf pages, Postgres answers these
+with an index-only scan — no heap fetch per row. The plain time indexes
+they replace are dropped so each insert maintains one btree, not two.
+
+Built CONCURRENTLY (see 0005) so live writers are not blocked.
+"""
+from alembic import op
+
+revision = "0007_covering_indexes"
+down_revision = "0006_trigger_skip_flag"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_scl_time_covering "
+            "ON strategy_control_log (created_at) "
+            "INCLUDE (strategy_name, action, actor, acked_at)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rm_time_covering "
+            "ON resource_metrics (recorded_at) "
+            "INCLUDE (rss_mb, cpu_pct, active_tasks)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_scl_time")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_rm_time")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rm_time ON resource_metrics (recorded_at)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_scl_time ON strategy_control_log (created_at)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_rm_time_covering")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_scl_time_covering")
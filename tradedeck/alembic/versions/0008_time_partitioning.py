@@ -0,0 +1,164 @@
+"""
+Alembic migration: 0008_time_partitioning.py
+
+Converts the append-only, time-ordered tables to declarative range partitioning:
+
+  audit_logs            PARTITION BY RANGE (created_at)   — monthly
+  strategy_control_log  PARTITION BY RANGE (created_at)   — monthly
+  resource_metrics      PARTITION BY RANGE (recorded_at)  — daily
+
+Why:
+  - Recent-window reads (ORDER BY created_at DESC LIMIT n,
+    WHERE recorded_at > NOW() - INTERVAL ...) prune to the newest partitions.
+  - resource_metrics retention becomes DETACH + DROP of whole days instead of
+    a DELETE that rewrites pages and bloats indexes. idx_rm_cleanup is gone.
+
+Partitions are named <table>_pYYYYMM / <table>_pYYYYMMDD and created ahead of
+time by ensure_time_partitions() (called here and by ResourceMonitor).
+Each table also gets a DEFAULT partition so an INSERT never fails if
+maintenance falls behind.
+
+The partition key must be part of the primary key → PK is (id, <time col>).
+The tamper-proof triggers are recreated on the parent; partitions inherit them.
+"""
+from alembic import op
+
+revision = "0008_time_partitioning"
+down_revision = "0007_covering_indexes"
+branch_labels = None
+depends_on = None
+
+
+# table → (time column, partition step, id sequence or None, indexes, triggers)
+TABLES = {
+    "audit_logs": (
+        "created_at", "month", None,
+        [
+            "CREATE INDEX idx_audit_event ON audit_logs (event_type)",
+            "CREATE INDEX idx_audit_entity ON audit_logs (entity_type, entity_id)",
+            "CREATE INDEX idx_audit_time ON audit_logs (created_at)",
+            "CREATE INDEX idx_audit_session ON audit_logs (session_id)",
+        ],
+        [
+            "CREATE TRIGGER audit_log_immutable BEFORE UPDATE OR DELETE ON audit_logs "
+            "FOR EACH ROW EXECUTE FUNCTION prevent_audit_modification()",
+        ],
+    ),
+    "strategy_control_log": (
+        "created_at", "month", "strategy_control_log_id_seq",
+        [
+            "CREATE INDEX idx_scl_strategy ON strategy_control_log (strategy_name)",
+            "CREATE INDEX idx_scl_time_covering ON strategy_control_log (created_at) "
+            "INCLUDE (strategy_name, action, actor, acked_at)",
+        ],
+        [
+            "CREATE TRIGGER scl_immutable BEFORE UPDATE OR DELETE ON strategy_control_log "
+            "FOR EACH ROW EXECUTE FUNCTION prevent_control_log_modification()",
+        ],
+    ),
+    "resource_metrics": (
+        "recorded_at", "day", "resource_metrics_id_seq",
+        [
+            "CREATE INDEX idx_rm_time_covering ON resource_metrics (recorded_at) "
+            "INCLUDE (rss_mb, cpu_pct, active_tasks)",
+            "CREATE INDEX idx_rm_rss ON resource_metrics (rss_mb)",
+            "CREATE INDEX idx_rm_leak_flag ON resource_metrics (rss_leak_flag) "
+            "WHERE rss_leak_flag = true",
+        ],
+        [],
+    ),
+}
+
+PARTITIONS_AHEAD = {"month": 2, "day": 7}
+
+
+def upgrade() -> None:
+    # ── Partition maintenance functions ───────────────────────────────────
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ensure_time_partitions(
+            parent text, step text, from_ts timestamp, ahead int
+        ) RETURNS void AS $$
+        DECLARE
+            fmt      text := CASE step WHEN 'day' THEN 'YYYYMMDD' ELSE 'YYYYMM' END;
+            one      interval := ('1 ' || step)::interval;
+            start_ts timestamp := date_trunc(step, from_ts);
+            stop_ts  timestamp := date_trunc(step, NOW()::timestamp) + (ahead + 1) * ('1 ' || step)::interval;
+        BEGIN
+            WHILE start_ts < stop_ts LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                    parent || '_p' || to_char(start_ts, fmt), parent, start_ts, start_ts + one
+                );
+                start_ts := start_ts + one;
+            END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION drop_time_partitions(
+            parent text, step text, cutoff timestamp
+        ) RETURNS int AS $$
+        DECLARE
+            fmt     text := CASE step WHEN 'day' THEN 'YYYYMMDD' ELSE 'YYYYMM' END;
+            r       record;
+            dropped int := 0;
+        BEGIN
+            FOR r IN
+                SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = parent::regclass AND c.relname ~ ('^' || parent || '_p[0-9]+$')
+            LOOP
+                IF to_date(substring(r.relname from '_p([0-9]+)$'), fmt)::timestamp
+                   + ('1 ' || step)::interval <= cutoff THEN
+                    EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, r.relname);
+                    EXECUTE format('DROP TABLE %I', r.relname);
+                    dropped := dropped + 1;
+                END IF;
+            END LOOP;
+            RETURN dropped;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # ── Swap each heap for a partitioned parent ───────────────────────────
+    for table, (col, step, seq, indexes, triggers) in TABLES.items():
+        legacy = f"{table}_legacy"
+        op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        if seq:
+            op.execute(f"ALTER SEQUENCE {seq} OWNED BY NONE")
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE ({col})"
+        )
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        # Cover existing rows first so none land in the DEFAULT partition
+        op.execute(
+            f"SELECT ensure_time_partitions('{table}', '{step}', "
+            f"COALESCE((SELECT MIN({col}) FROM {legacy}), NOW()::timestamp), "
+            f"{PARTITIONS_AHEAD[step]})"
+        )
+        op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+        op.execute(f"DROP TABLE {legacy}")
+        if seq:
+            op.execute(f"ALTER SEQUENCE {seq} OWNED BY {table}.id")
+        # Constraint/index names are only free once the legacy table is gone
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {col})")
+        for ddl in indexes + triggers:
+            op.execute(ddl)
+
+
+def downgrade() -> None:
+    for table, (col, step, seq, indexes, triggers) in TABLES.items():
+        partitioned = f"{table}_partitioned"
+        op.execute(f"ALTER TABLE {table} RENAME TO {partitioned}")
+        if seq:
+            op.execute(f"ALTER SEQUENCE {seq} OWNED BY NONE")
+        op.execute(f"CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {partitioned}")
+        op.execute(f"DROP TABLE {partitioned} CASCADE")
+        if seq:
+            op.execute(f"ALTER SEQUENCE {seq} OWNED BY {table}.id")
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+        for ddl in indexes + triggers:
+            op.execute(ddl)
+    op.execute("DROP FUNCTION IF EXISTS drop_time_partitions(text, text, timestamp)")
+    op.execute("DROP FUNCTION IF EXISTS ensure_time_partitions(text, text, timestamp, int)")
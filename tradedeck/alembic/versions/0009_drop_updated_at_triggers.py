@@ -0,0 +1,58 @@
+"""
+Alembic migration: 0009_drop_updated_at_triggers.py
+
+Drops the per-row update_updated_at() triggers.
+
+Every UPDATE on these tables paid a plpgsql dispatch per row just to do
+NEW.updated_at = NOW(). The application now sets updated_at in the UPDATE's
+own SET clause:
+  - ORM: Column(onupdate=clock_now()) → "updated_at=clock_timestamp()"
+  - Raw SQL: every UPDATE statement sets updated_at explicitly
+and the column default becomes clock_timestamp() for INSERTs.
+
+update_updated_at() itself is kept so downgrade can reattach it.
+"""
+from alembic import op
+
+revision = "0009_drop_updated_at_triggers"
+down_revision = "0008_time_partitioning"
+branch_labels = None
+depends_on = None
+
+
+TABLES = [
+    "trading_sessions", "orders", "positions", "circuit_breaker_states",
+    "strategy_states", "feed_heartbeat",
+]
+
+
+def _for_each_table(body: str) -> None:
+    """Run a plpgsql body once per table (bound to t) in a single DO block."""
+    tables = ", ".join(f"'{t}'" for t in TABLES)
+    op.execute(f"""
+        DO $$
+        DECLARE t text;
+        BEGIN
+            FOREACH t IN ARRAY ARRAY[{tables}] LOOP
+                {body}
+            END LOOP;
+        END $$;
+    """)
+
+
+def upgrade() -> None:
+    _for_each_table("""
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_updated_at', t);
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN updated_at SET DEFAULT clock_timestamp()', t);
+    """)
+
+
+def downgrade() -> None:
+    _for_each_table("""
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN updated_at SET DEFAULT NOW()', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I BEFORE UPDATE ON %I '
+            'FOR EACH ROW EXECUTE FUNCTION update_updated_at()',
+            t || '_updated_at', t
+        );
+    """)
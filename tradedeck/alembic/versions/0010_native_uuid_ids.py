@@ -0,0 +1,70 @@
+"""
+Alembic migration: 0010_native_uuid_ids.py
+
+Converts UUID-in-text id columns (VARCHAR(36)) to the native 16-byte uuid type.
+
+Why:
+  - 16 bytes per key instead of ~40 (36 ASCII chars + varlena header)
+  - PK/FK indexes roughly halve → more of idx_order_session,
+    idx_position_session, etc. stays in shared_buffers
+  - Joins compare fixed-width 128-bit values, not strings
+
+The models already declare these columns as UUID(as_uuid=False), so the
+Python side keeps passing str ids; asyncpg encodes them to uuid.
+
+FKs referencing a converted column are dropped and re-added around the
+type change (both sides must share a type).
+"""
+from alembic import op
+
+revision = "0010_native_uuid_ids"
+down_revision = "0009_drop_updated_at_triggers"
+branch_labels = None
+depends_on = None
+
+
+# (table, column)
+UUID_COLUMNS = [
+    ("trading_sessions",       "id"),
+    ("orders",                 "id"),
+    ("orders",                 "session_id"),
+    ("positions",              "id"),
+    ("positions",              "session_id"),
+    ("pnl_records",            "id"),
+    ("pnl_records",            "order_id"),
+    ("audit_logs",             "id"),
+    ("audit_logs",             "session_id"),
+    ("circuit_breaker_states", "id"),
+    ("reconciliation_logs",    "id"),
+    ("strategy_states",        "session_id"),
+]
+
+# (table, constraint, column, referenced table)
+FOREIGN_KEYS = [
+    ("orders",      "orders_session_id_fkey",    "session_id", "trading_sessions"),
+    ("positions",   "positions_session_id_fkey", "session_id", "trading_sessions"),
+    ("pnl_records", "pnl_records_order_id_fkey", "order_id",   "orders"),
+]
+
+
+def _convert(to_type: str, using: str) -> None:
+    for table, name, _, _ in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+    for table, col in UUID_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {col} TYPE {to_type} "
+            f"USING {col}::{using}"
+        )
+    for table, name, col, ref in FOREIGN_KEYS:
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+            f"FOREIGN KEY ({col}) REFERENCES {ref} (id) ON DELETE RESTRICT"
+        )
+
+
+def upgrade() -> None:
+    _convert("uuid", "uuid")
+
+
+def downgrade() -> None:
+    _convert("varchar(36)", "text")
@@ -0,0 +1,73 @@
+"""
+Alembic migration: 0011_native_enums.py
+
+Converts small fixed-vocabulary text columns to native Postgres ENUMs.
+
+A native enum is stored as a 4-byte OID instead of a varlena string, so rows
+shrink and idx_order_status / idx_ss_status / idx_ss_intent / idx_ra_type get
+smaller and cheaper to probe.
+
+Type names match SQLAlchemy's defaults for the model enums (Enum(OrderStatus)
+→ "orderstatus") so the ORM binds to them natively.
+
+orders.order_type is deliberately left as text: the ORM persists enum names
+("SL_M") while the column's natural values are "SL-M".
+"""
+from alembic import op
+
+revision = "0011_native_enums"
+down_revision = "0010_native_uuid_ids"
+branch_labels = None
+depends_on = None
+
+
+ENUM_TYPES = {
+    "orderstatus": [
+        "CREATED", "RISK_CHECKING", "RISK_APPROVED", "RISK_REJECTED", "SENDING",
+        "ACKNOWLEDGED", "PENDING", "PARTIALLY_FILLED", "FILLED", "CANCELLED",
+        "REJECTED", "EXPIRED",
+    ],
+    "orderside":       ["BUY", "SELL"],
+    "strategy_status": ["running", "paused", "error", "stopped", "starting", "stopping"],
+    "control_intent":  ["pause", "resume", "stop", "start"],
+    "resource_alert_type": [
+        "RSS_HIGH", "RSS_WARN", "RSS_LEAK", "CPU_SPIKE", "FD_HIGH", "FD_LEAK",
+        "TASK_HIGH", "TASK_LEAK", "POOL_WARN", "POOL_EXHAUSTED",
+    ],
+}
+
+# (table, column, enum type, server default or None, original text type)
+COLUMNS = [
+    ("orders",               "status",         "orderstatus",         "CREATED", "varchar(20)"),
+    ("orders",               "side",           "orderside",           None,      "varchar(10)"),
+    ("strategy_states",      "status",         "strategy_status",     "stopped", "varchar(20)"),
+    ("strategy_states",      "control_intent", "control_intent",      None,      "varchar(20)"),
+    ("strategy_control_log", "action",         "control_intent",      None,      "varchar(20)"),
+    ("resource_alerts",      "alert_type",     "resource_alert_type", None,      "varchar(40)"),
+]
+
+
+def upgrade() -> None:
+    for name, labels in ENUM_TYPES.items():
+        values = ", ".join(f"'{v}'" for v in labels)
+        op.execute(f"CREATE TYPE {name} AS ENUM ({values})")
+
+    for table, col, enum, default, _ in COLUMNS:
+        # A text default cannot be cast automatically — drop, convert, restore
+        if default:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {col} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {col} TYPE {enum} USING {col}::text::{enum}")
+        if default:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {col} SET DEFAULT '{default}'::{enum}")
+
+
+def downgrade() -> None:
+    for table, col, enum, default, text_type in COLUMNS:
+        if default:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {col} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {col} TYPE {text_type} USING {col}::text")
+        if default:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {col} SET DEFAULT '{default}'")
+
+    for name in ENUM_TYPES:
+        op.execute(f"DROP TYPE IF EXISTS {name}")
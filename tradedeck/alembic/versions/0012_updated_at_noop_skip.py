@@ -0,0 +1,53 @@
+"""
+Alembic migration: 0012_updated_at_noop_skip.py
+
+Lets update_updated_at() skip no-op UPDATEs.
+
+update_updated_at() is no longer attached to any table (0009) but is kept for
+downgrades and ad-hoc use; it now leaves NEW untouched when the UPDATE
+changes nothing, so idempotent writes don't dirty the page or emit WAL for
+the timestamp alone.
+
+audit_log_immutable / scl_immutable deliberately stay FOR EACH ROW: audit_logs
+and strategy_control_log are partitioned (0008), and only row-level triggers
+on the parent are cloned onto its partitions. A statement-level guard would
+leave UPDATE/DELETE aimed directly at a partition unguarded.
+"""
+from alembic import op
+
+revision = "0012_updated_at_noop_skip"
+down_revision = "0011_native_enums"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_updated_at()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF current_setting('app.skip_trigger', true) = 'on' THEN
+                RETURN NEW;
+            END IF;
+            IF NEW IS DISTINCT FROM OLD THEN
+                NEW.updated_at := clock_timestamp();
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_updated_at()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF current_setting('app.skip_trigger', true) = 'on' THEN
+                RETURN NEW;
+            END IF;
+            NEW.updated_at = NOW();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
@@ -0,0 +1,65 @@
+"""
+Alembic migration: 0013_orders_audit_split.py
+
+Vertically splits orders into a narrow hot table and a 1:1 cold sidecar.
+
+orders carried two JSONB blobs (status_history, risk_snapshot) and free-text
+rejection details next to the small fixed-width columns every status/session
+lookup reads. Wide rows → few tuples per 8KB page → every heap fetch behind
+idx_order_status / idx_order_session / idx_order_active costs more I/O.
+
+  orders        — identity, status, quantities, prices, timestamps (hot)
+  orders_audit  — status_history, risk_snapshot, reject_reason,
+                  broker_reject_code (written at transitions, read rarely)
+
+orders_full joins both for ad-hoc queries and tools that expect the old shape.
+
+DROP COLUMN only marks the columns dead; existing tuples shrink as they are
+rewritten. Run VACUUM FULL orders (or pg_repack) in a maintenance window to
+compact the heap immediately.
+"""
+from alembic import op
+
+revision = "0013_orders_audit_split"
+down_revision = "0012_updated_at_noop_skip"
+branch_labels = None
+depends_on = None
+
+
+COLD_COLUMNS = [
+    ("status_history",     "jsonb NOT NULL DEFAULT '[]'"),
+    ("risk_snapshot",      "jsonb"),
+    ("reject_reason",      "text"),
+    ("broker_reject_code", "varchar(50)"),
+]
+
+
+def upgrade() -> None:
+    op.execute(f"""
+        CREATE TABLE orders_audit (
+            order_id uuid PRIMARY KEY REFERENCES orders(id) ON DELETE CASCADE,
+            {", ".join(f"{name} {ddl}" for name, ddl in COLD_COLUMNS)}
+        )
+    """)
+    cols = ", ".join(name for name, _ in COLD_COLUMNS)
+    op.execute(f"INSERT INTO orders_audit (order_id, {cols}) SELECT id, {cols} FROM orders")
+    for name, _ in COLD_COLUMNS:
+        op.execute(f"ALTER TABLE orders DROP COLUMN {name}")
+
+    op.execute(f"""
+        CREATE VIEW orders_full AS
+        SELECT o.*, {", ".join(f"a.{name}" for name, _ in COLD_COLUMNS)}
+        FROM orders o
+        LEFT JOIN orders_audit a ON a.order_id = o.id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS orders_full")
+    for name, ddl in COLD_COLUMNS:
+        op.execute(f"ALTER TABLE orders ADD COLUMN {name} {ddl}")
+    op.execute(f"""
+        UPDATE orders o SET {", ".join(f"{name} = a.{name}" for name, _ in COLD_COLUMNS)}
+        FROM orders_audit a WHERE a.order_id = o.id
+    """)
+    op.execute("DROP TABLE orders_audit")
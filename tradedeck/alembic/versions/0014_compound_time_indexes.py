@@ -0,0 +1,74 @@
+"""
+Alembic migration: 0014_compound_time_indexes.py
+
+Compound (key, time DESC) indexes for "latest rows for X" lookups.
+
+  strategy_control_log (strategy_name, created_at DESC)
+      StrategyControlService ack update:
+        WHERE strategy_name=:name AND action=:action AND acked_at IS NULL
+        ORDER BY created_at DESC LIMIT 1
+      A single ordered index scan replaces a BitmapAnd of idx_scl_strategy and
+      the time index. idx_scl_strategy is a prefix of the new index → dropped.
+      idx_scl_time_covering stays: the global "latest N" reads use it.
+
+  resource_alerts (alert_type, alerted_at DESC)
+      Replaces idx_ra_type and idx_ra_time; no query orders all alerts by time
+      (open alerts go through idx_ra_open).
+
+strategy_control_log is range-partitioned (0008) and Postgres cannot build a
+partitioned index CONCURRENTLY, so the parent index is created ON ONLY (no
+data scanned), each partition's index is built CONCURRENTLY and attached;
+the parent becomes valid once every partition is attached. Partitions
+created later by ensure_time_partitions() get the index automatically.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0014_compound_time_indexes"
+down_revision = "0013_orders_audit_split"
+branch_labels = None
+depends_on = None
+
+
+def _partitions(table: str) -> list[str]:
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:t AS regclass)"
+        ),
+        {"t": table},
+    )
+    return [r.relname for r in rows]
+
+
+def _create_partitioned_index(name: str, table: str, cols: str) -> None:
+    op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {table} ({cols})")
+    for part in _partitions(table):
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {part}_{name} ON {part} ({cols})")
+        op.execute(f"ALTER INDEX {name} ATTACH PARTITION {part}_{name}")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        _create_partitioned_index(
+            "idx_scl_strategy_time", "strategy_control_log", "strategy_name, created_at DESC"
+        )
+        # Partitioned indexes cannot be dropped CONCURRENTLY; this is catalog-only
+        op.execute("DROP INDEX IF EXISTS idx_scl_strategy")
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ra_type_time "
+            "ON resource_alerts (alert_type, alerted_at DESC)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_ra_type")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_ra_time")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ra_time ON resource_alerts (alerted_at)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ra_type ON resource_alerts (alert_type)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_ra_type_time")
+
+        _create_partitioned_index("idx_scl_strategy", "strategy_control_log", "strategy_name")
+        op.execute("DROP INDEX IF EXISTS idx_scl_strategy_time")
@@ -0,0 +1,89 @@
+"""
+Alembic migration: 0015_order_status_history.py
+
+Moves order status history from a JSONB array to append-only rows.
+
+orders_audit.status_history was rewritten in full on every transition:
+read the array, append one element, write the whole (TOASTed) document back
+— O(n²) bytes over an order's lifetime. Each transition is now one INSERT
+into order_status_history.
+
+Existing arrays are unpacked into rows. Entries used either "time" or "ts"
+for the timestamp; entries with neither fall back to the order's updated_at,
+entries whose status is not an OrderStatus label are skipped.
+
+reconciliation_logs.mismatches / corrections stay JSON: they are written
+once per reconciliation run, never appended to.
+"""
+from alembic import op
+
+revision = "0015_order_status_history"
+down_revision = "0014_compound_time_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _create_orders_full(cold_cols: str) -> None:
+    op.execute(f"""
+        CREATE VIEW orders_full AS
+        SELECT o.*, {cold_cols}
+        FROM orders o
+        LEFT JOIN orders_audit a ON a.order_id = o.id
+    """)
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE order_status_history (
+            id       serial PRIMARY KEY,
+            order_id uuid NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+            status   orderstatus NOT NULL,
+            actor    varchar(50),
+            reason   text,
+            at       timestamp NOT NULL DEFAULT clock_timestamp()
+        )
+    """)
+    op.execute("CREATE INDEX idx_osh_order_time ON order_status_history (order_id, at)")
+
+    op.execute("""
+        INSERT INTO order_status_history (order_id, status, actor, reason, at)
+        SELECT a.order_id,
+               (e->>'status')::orderstatus,
+               e->>'actor',
+               e->>'reason',
+               COALESCE(
+                   (COALESCE(e->>'time', e->>'ts')::timestamptz AT TIME ZONE 'UTC'),
+                   o.updated_at
+               )
+        FROM orders_audit a
+        JOIN orders o ON o.id = a.order_id
+        CROSS JOIN LATERAL jsonb_array_elements(a.status_history) WITH ORDINALITY AS h(e, n)
+        WHERE e->>'status' IN (SELECT unnest(enum_range(NULL::orderstatus))::text)
+        ORDER BY a.order_id, n
+    """)
+
+    op.execute("DROP VIEW orders_full")
+    op.execute("ALTER TABLE orders_audit DROP COLUMN status_history")
+    _create_orders_full("a.risk_snapshot, a.reject_reason, a.broker_reject_code")
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW orders_full")
+    op.execute("ALTER TABLE orders_audit ADD COLUMN status_history jsonb NOT NULL DEFAULT '[]'")
+    op.execute("""
+        UPDATE orders_audit a SET status_history = h.history
+        FROM (
+            SELECT order_id,
+                   jsonb_agg(
+                       jsonb_strip_nulls(jsonb_build_object(
+                           'status', status, 'time', to_char(at, 'YYYY-MM-DD"T"HH24:MI:SS.US+00:00'),
+                           'actor', actor, 'reason', reason
+                       ))
+                       ORDER BY at, id
+                   ) AS history
+            FROM order_status_history GROUP BY order_id
+        ) h
+        WHERE h.order_id = a.order_id
+    """)
+    _create_orders_full("a.status_history, a.risk_snapshot, a.reject_reason, a.broker_reject_code")
+    op.execute("DROP TABLE order_status_history")
@@ -0,0 +1,40 @@
+"""
+Alembic migration: 0016_clock_timestamp_defaults.py
+
+Append-only tables default their timestamp to clock_timestamp() instead of
+NOW().
+
+NOW() is the transaction start time, so every row written in one transaction
+(a batched INSERT, COPY, a multi-row audit write) got the same created_at:
+ORDER BY created_at DESC LIMIT n had no stable tiebreak between them.
+clock_timestamp() is read per row.
+"""
+from alembic import op
+
+revision = "0016_clock_timestamp_defaults"
+down_revision = "0015_order_status_history"
+branch_labels = None
+depends_on = None
+
+
+# (table, column, previous default or None)
+COLUMNS = [
+    ("audit_logs",           "created_at",  "NOW()"),
+    ("strategy_control_log", "created_at",  "NOW()"),
+    ("resource_metrics",     "recorded_at", None),
+    ("pnl_records",          "recorded_at", "NOW()"),
+    ("reconciliation_logs",  "run_at",      "NOW()"),
+]
+
+
+def upgrade() -> None:
+    for table, col, _ in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {col} SET DEFAULT clock_timestamp()")
+
+
+def downgrade() -> None:
+    for table, col, previous in COLUMNS:
+        if previous:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {col} SET DEFAULT {previous}")
+        else:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {col} DROP DEFAULT")
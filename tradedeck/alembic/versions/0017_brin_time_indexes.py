@@ -0,0 +1,48 @@
+"""
+Alembic migration: 0017_brin_time_indexes.py
+
+BRIN instead of btree for insert-ordered time columns that are only ever
+range-filtered.
+
+  reconciliation_logs (run_at)       idx_recon_time → idx_recon_time_brin
+  pnl_records         (recorded_at)  idx_pnl_time   → idx_pnl_time_brin
+
+Rows arrive in time order, so each block range holds a narrow min/max window
+and a BRIN summary (one entry per 32 pages) prunes as well as the btree for
+BETWEEN-style reads, at a tiny fraction of its size and insert cost.
+
+Kept as btree on purpose — BRIN cannot return rows in order, and these back
+ORDER BY <time> DESC LIMIT n reads:
+  idx_audit_time        GET /observe/logs
+  idx_rm_time_covering  ResourceMonitor.get_recent() (index-only scan)
+"""
+from alembic import op
+
+revision = "0017_brin_time_indexes"
+down_revision = "0016_clock_timestamp_defaults"
+branch_labels = None
+depends_on = None
+
+
+# (btree name, brin name, table, column)
+INDEXES = [
+    ("idx_recon_time", "idx_recon_time_brin", "reconciliation_logs", "run_at"),
+    ("idx_pnl_time",   "idx_pnl_time_brin",   "pnl_records",         "recorded_at"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for btree, brin, table, col in INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {brin} ON {table} "
+                f"USING brin ({col}) WITH (pages_per_range = 32)"
+            )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {btree}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for btree, brin, table, col in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {btree} ON {table} ({col})")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {brin}")
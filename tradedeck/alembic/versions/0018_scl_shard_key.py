@@ -0,0 +1,41 @@
+"""
+Alembic migration: 0018_scl_shard_key.py
+
+Spreads strategy_control_log primary-key inserts over 16 btree leaves.
+
+The PK led with the serial id, so every INSERT landed on the rightmost leaf
+of the same btree page — concurrent control actions for different strategies
+serialized on that buffer's content lock. A stored shard_id derived from
+strategy_name now leads the key:
+
+    PRIMARY KEY (shard_id, created_at, id)
+
+Each strategy appends in time order inside its own shard (16 insert points
+instead of 1), and "actions for strategy X" reads stay ordered. created_at
+must stay in the key because the table is range-partitioned on it (0008).
+
+resource_metrics is left as is: it has a single writer (ResourceMonitor),
+so there is no insert contention to spread.
+"""
+from alembic import op
+
+revision = "0018_scl_shard_key"
+down_revision = "0017_brin_time_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE strategy_control_log
+        ADD COLUMN shard_id smallint
+        GENERATED ALWAYS AS ((hashtext(strategy_name) & 15)::smallint) STORED
+    """)
+    op.execute("ALTER TABLE strategy_control_log DROP CONSTRAINT strategy_control_log_pkey")
+    op.execute("ALTER TABLE strategy_control_log ADD PRIMARY KEY (shard_id, created_at, id)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE strategy_control_log DROP CONSTRAINT strategy_control_log_pkey")
+    op.execute("ALTER TABLE strategy_control_log DROP COLUMN shard_id")
+    op.execute("ALTER TABLE strategy_control_log ADD PRIMARY KEY (id, created_at)")
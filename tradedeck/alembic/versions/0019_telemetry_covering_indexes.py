@@ -0,0 +1,54 @@
+"""
+Alembic migration: 0019_telemetry_covering_indexes.py
+
+Partial covering indexes for the two aggregates GET /observe/telemetry runs
+on every 2s poll.
+
+  idx_order_latency        fill latency (observability._TELEMETRY_SQL):
+      WHERE session_id = today AND status='FILLED'
+        AND sent_at/fill_timestamp NOT NULL
+      ORDER BY fill_timestamp DESC LIMIT 100
+  idx_position_open_covering   open exposure (observability._TELEMETRY_SQL):
+      COUNT / SUM(ABS(net_quantity)) / SUM(unrealized_pnl)
+      WHERE session_id = today AND net_quantity != 0
+
+The predicates match the queries, so each index holds only the rows they
+can return, and the INCLUDE columns make both index-only scans: 100 leaf
+entries walked in order instead of a heap scan + sort.
+
+idx_position_open_covering has the same predicate and leading column as
+idx_position_active, with net_quantity moved into INCLUDE → it replaces it.
+
+Built CONCURRENTLY (see 0005) so live writers are not blocked.
+"""
+from alembic import op
+
+revision = "0019_telemetry_covering_indexes"
+down_revision = "0018_scl_shard_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_order_latency "
+            "ON orders (session_id, fill_timestamp DESC) INCLUDE (sent_at) "
+            "WHERE status = 'FILLED' AND sent_at IS NOT NULL AND fill_timestamp IS NOT NULL"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_position_open_covering "
+            "ON positions (session_id) INCLUDE (net_quantity, unrealized_pnl, ltp) "
+            "WHERE net_quantity != 0"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_position_active")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_position_active "
+            "ON positions (session_id, net_quantity) WHERE net_quantity != 0"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_position_open_covering")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_order_latency")
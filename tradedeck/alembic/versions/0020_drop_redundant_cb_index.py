@@ -0,0 +1,35 @@
+"""
+Alembic migration: 0020_drop_redundant_cb_index.py
+
+circuit_breaker_states lookups by service_name (the _get_or_create_state
+upsert, all_statuses' IN list) are already served by the unique index
+behind uq_cb_service — ON CONFLICT (service_name) needs it anyway.
+idx_cb_service is a second btree on the same column: no plan uses it, and
+every insert maintains it. Dropped.
+
+No INCLUDE columns are added to the unique index: state and the counters
+are rewritten on every recorded failure, and indexing them would turn
+those HOT updates into index updates — for a table of four rows whose
+heap page is always in cache.
+
+Built CONCURRENTLY (see 0005) so live writers are not blocked.
+"""
+from alembic import op
+
+revision = "0020_drop_redundant_cb_index"
+down_revision = "0019_telemetry_covering_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cb_service")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cb_service "
+            "ON circuit_breaker_states (service_name)"
+        )
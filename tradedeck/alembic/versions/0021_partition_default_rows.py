@@ -0,0 +1,114 @@
+"""
+Alembic migration: 0021_partition_default_rows.py
+
+ensure_time_partitions() (0008) no longer fails when rows for a missing
+partition are sitting in <table>_default.
+
+CREATE TABLE … PARTITION OF is rejected if the DEFAULT partition already
+holds rows for the new range — which is exactly what happens after
+maintenance falls behind. The error aborted ResourceMonitor's maintenance
+transaction, so drop_time_partitions() retention never ran either.
+
+For such a range the function now:
+  1. detaches <table>_default (its cloned tamper-guard triggers go with it),
+  2. creates the range partition,
+  3. copies the range from the detached default into the parent — routed to
+     the new partition — and deletes it from the default,
+  4. re-attaches <table>_default, which re-clones the parent's triggers.
+The column list skips generated columns (strategy_control_log.shard_id,
+0018). Ranges with nothing stranded in the default take the plain CREATE
+path as before, without the ACCESS EXCLUSIVE detach.
+"""
+from alembic import op
+
+revision = "0021_partition_default_rows"
+down_revision = "0020_drop_redundant_cb_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ensure_time_partitions(
+            parent text, step text, from_ts timestamp, ahead int
+        ) RETURNS void AS $$
+        DECLARE
+            fmt      text := CASE step WHEN 'day' THEN 'YYYYMMDD' ELSE 'YYYYMM' END;
+            one      interval := ('1 ' || step)::interval;
+            start_ts timestamp := date_trunc(step, from_ts);
+            stop_ts  timestamp := date_trunc(step, NOW()::timestamp) + (ahead + 1) * ('1 ' || step)::interval;
+            dflt     text := parent || '_default';
+            part     text;
+            col      text;
+            cols     text;
+            stranded boolean;
+        BEGIN
+            SELECT a.attname INTO col
+            FROM pg_partitioned_table pt
+            JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+            WHERE pt.partrelid = parent::regclass;
+
+            SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO cols
+            FROM pg_attribute
+            WHERE attrelid = parent::regclass AND attnum > 0
+              AND NOT attisdropped AND attgenerated = '';
+
+            WHILE start_ts < stop_ts LOOP
+                part := parent || '_p' || to_char(start_ts, fmt);
+                stranded := false;
+                IF to_regclass(part) IS NULL AND to_regclass(dflt) IS NOT NULL THEN
+                    EXECUTE format(
+                        'SELECT EXISTS (SELECT 1 FROM %I WHERE %I >= %L AND %I < %L)',
+                        dflt, col, start_ts, col, start_ts + one
+                    ) INTO stranded;
+                END IF;
+
+                IF stranded THEN
+                    EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, dflt);
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                        part, parent, start_ts, start_ts + one
+                    );
+                    EXECUTE format(
+                        'INSERT INTO %I (%s) SELECT %s FROM %I WHERE %I >= %L AND %I < %L',
+                        parent, cols, cols, dflt, col, start_ts, col, start_ts + one
+                    );
+                    EXECUTE format(
+                        'DELETE FROM %I WHERE %I >= %L AND %I < %L',
+                        dflt, col, start_ts, col, start_ts + one
+                    );
+                    EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I DEFAULT', parent, dflt);
+                ELSE
+                    EXECUTE format(
+                        'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                        part, parent, start_ts, start_ts + one
+                    );
+                END IF;
+                start_ts := start_ts + one;
+            END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ensure_time_partitions(
+            parent text, step text, from_ts timestamp, ahead int
+        ) RETURNS void AS $$
+        DECLARE
+            fmt      text := CASE step WHEN 'day' THEN 'YYYYMMDD' ELSE 'YYYYMM' END;
+            one      interval := ('1 ' || step)::interval;
+            start_ts timestamp := date_trunc(step, from_ts);
+            stop_ts  timestamp := date_trunc(step, NOW()::timestamp) + (ahead + 1) * ('1 ' || step)::interval;
+        BEGIN
+            WHILE start_ts < stop_ts LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                    parent || '_p' || to_char(start_ts, fmt), parent, start_ts, start_ts + one
+                );
+                start_ts := start_ts + one;
+            END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
@@ -5,129 +5,283 @@ Endpoints:
   GET /health           — Quick liveness probe (no DB, for load balancer)
   GET /health/ready     — Full readiness: DB + broker + circuit breakers
   GET /health/detailed  — Complete diagnostic for ops dashboard
+  GET /health/migrations — Alembic upgrade state (pending|running|done|failed)
 """
+import asyncio
+import hashlib
 import time
 import logging
 from datetime import datetime, timezone, date
 
+import orjson
 from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from app.core.database import get_db
+from app.core.database import (
+    DB_HEARTBEAT_S, get_db_heartbeat, get_readonly_session_factory, pool_free_connections,
+    readonly_session,
+)
 from app.core.circuit_breaker import BrokerCircuitBreakers
+from app.core.config import settings
+from app.core.migrations import get_migration_state
 
 logger    = logging.getLogger(__name__)
 router    = APIRouter(prefix="/health", tags=["Health"])
-_start_ts = time.time()
+
+# Clock aliases, used throughout this module: one global lookup instead of
+# global + attribute per call on the probe paths
+_now  = datetime.now
+_UTC  = timezone.utc
+_mono = time.monotonic
+_time = time.time
+
+_start_ts = _mono()   # Uptime must not jump with NTP wall-clock corrections
+
+# Readiness probes arrive every few seconds from every orchestrator replica.
+# A single background task (readiness_refresh_loop) re-runs the checks every
+# _READY_REFRESH_S; the endpoint only reads the latest snapshot.
+_READY_REFRESH_S = 3.0
+_READY_STALE_S   = _READY_REFRESH_S * 5   # Refresher stalled → report not ready
+_ready_cache = {
+    "ts":      None,     # monotonic time of the last refresh
+    "payload": {"status": "not_ready", "checks": {}, "detail": "Readiness not yet evaluated"},
+    "status":  503,
+    "etag":    None,
+}
+# Fields that tick on every refresh without changing the verdict; left out of
+# the ETag so a stable snapshot keeps the same validator across refreshes.
+_ETAG_VOLATILE = frozenset({"time", "heartbeat_age_s", "cache_age_s"})
+
+# Per-query budget on the health paths: a stalled DB fails the check fast
+# instead of pinning a connection + worker until the probe's own timeout.
+_HC_TIMEOUT = 0.5
+_HC_TIMEOUT_RESULT = {"status": "timeout", "timeout_ms": int(_HC_TIMEOUT * 1000)}
+
+
+async def _t(coro):
+    return await asyncio.wait_for(coro, _HC_TIMEOUT)
+
+
+# Probe SQL is built once at import; TextClause parses bind params on construction
+_SQL_PING = text("SELECT 1")
+_SQL_SESSION = text(
+    "SELECT is_killed, kill_reason, reconcile_failure_count, "
+    "last_reconcile_at, last_reconcile_status "
+    "FROM trading_sessions WHERE date=:d"
+)
+_SQL_FULL_SESSION = text("SELECT * FROM trading_sessions WHERE date=:d")
+_SQL_ORDERS = text(
+    "SELECT status, COUNT(*) as count FROM orders "
+    "WHERE session_id=:sid GROUP BY status"
+)
+
+# Readiness fails once the background DB heartbeat is older than this
+_DB_HEARTBEAT_STALE_S = DB_HEARTBEAT_S * 1.5
 
 
 # ─────────────────────────────────────────────
 # LIVENESS — Used by Docker / k8s: is the process alive?
 # Should NEVER fail unless process is dead. No external checks.
+# Hit every few seconds → pre-serialized body, no jsonable_encoder pass.
 # ─────────────────────────────────────────────
-@router.get("", summary="Liveness probe")
+# Integers only (epoch seconds "t", whole-second uptime) → no datetime or
+# isoformat allocation per probe. ISO timestamps stay on /ready and /detailed.
+_LIVENESS_TEMPLATE = b'{"status":"ok","service":"tradedeck-api","t":%d,"uptime_s":%d}'
+
+
+@router.get("", summary="Liveness probe", response_class=Response)
 async def liveness():
-    return {
-        "status":   "ok",
-        "service":  "tradedeck-api",
-        "time":     datetime.now(timezone.utc).isoformat(),
-        "uptime_s": round(time.time() - _start_ts, 1),
-    }
+    body = _LIVENESS_TEMPLATE % (int(_time()), int(_mono() - _start_ts))
+    return Response(content=body, media_type="application/json")
+
+
+# ─────────────────────────────────────────────
+# MIGRATIONS — Background schema upgrade progress (MIGRATION_MODE=async)
+# No DB access: reads in-process state only.
+# ─────────────────────────────────────────────
+@router.get("/migrations", summary="Migration state")
+async def migrations():
+    return {"mode": settings.MIGRATION_MODE, **get_migration_state()}
 
 
 # ─────────────────────────────────────────────
 # READINESS — Is the service ready to handle traffic?
 # Fails if DB or critical services are down.
+#
+# Sub-checks are independent, so they run concurrently. An AsyncSession
+# cannot multiplex queries → each check opens its own session.
+# Each returns ({key: payload, ...}, is_ready).
 # ─────────────────────────────────────────────
 @router.get("/ready", summary="Readiness probe")
-async def readiness(
-    request: Request,
-    db: AsyncSession = Depends(get_db),
-):
+async def readiness(request: Request):
+    http_status = _ready_cache["status"]
+    etag        = _ready_cache["etag"]
+    age = None if _ready_cache["ts"] is None else round(_mono() - _ready_cache["ts"], 1)
+    stale = age is not None and age > _READY_STALE_S
+    # 304 counts as success for probes → only ever short-circuit a 200
+    if (
+        http_status == 200 and not stale and etag
+        and request.headers.get("if-none-match") == etag
+    ):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    payload = dict(_ready_cache["payload"])
+    payload["cache_age_s"] = age
+    if stale:
+        payload["status"] = "stale"
+        return JSONResponse(payload, status_code=503)
+    headers = {"ETag": etag} if etag else None
+    return JSONResponse(payload, status_code=http_status, headers=headers)
+
+
+def _readiness_etag(payload: dict, http_status: int) -> str:
+    def stable(value):
+        if isinstance(value, dict):
+            return {k: stable(v) for k, v in value.items() if k not in _ETAG_VOLATILE}
+        return value
+
+    body = orjson.dumps([http_status, stable(payload)], option=orjson.OPT_SORT_KEYS, default=str)
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+async def readiness_refresh_loop(interval: float = _READY_REFRESH_S) -> None:
+    """Started from the app lifespan. Probe rate no longer drives DB load."""
+    while True:
+        try:
+            payload, http_status = await _readiness_checks(readonly_session)
+            _ready_cache.update(
+                ts=_mono(), payload=payload, status=http_status,
+                etag=_readiness_etag(payload, http_status),
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[HEALTH] Readiness refresh failed: {e}")
+        await asyncio.sleep(interval)
+
+
+async def _readiness_checks(session_factory: async_sessionmaker) -> tuple[dict, int]:
+    # Resolved once so every check sees the same day, even across midnight
+    today = date.today().isoformat()
+    probes = [
+        ("database",              _check_db),
+        ("broker_orders_circuit", _check_broker),
+        ("trading_session",       _check_session),
+    ]
+    results = await asyncio.gather(
+        *(probe(session_factory, today) for _, probe in probes), return_exceptions=True
+    )
+
     checks   = {}
     is_ready = True
+    for (default_key, _), result in zip(probes, results):
+        if isinstance(result, BaseException):
+            checks[default_key] = {"status": "error", "detail": str(result)}
+            is_ready = False
+            continue
+        entries, ok = result
+        checks.update(entries)
+        is_ready = is_ready and ok
 
-    # ── Database ──────────────────────────────
-    try:
-        result = await db.execute(text("SELECT 1"))
-        result.fetchone()
-        checks["database"] = {"status": "ok"}
-    except Exception as e:
-        checks["database"] = {"status": "error", "detail": str(e)}
-        is_ready = False
+    http_status = 200 if is_ready else 503
+    return {
+        "status":  "ready" if is_ready else "not_ready",
+        "checks":  checks,
+        "time":    _now(_UTC).isoformat(),   # Formatted once per refresh, not per probe
+    }, http_status
 
-    # ── Broker connectivity (via circuit breaker state) ────────
-    try:
-        cb_statuses = await BrokerCircuitBreakers.all_statuses(db)
-        order_cb    = next(c for c in cb_statuses if c["service"] == "fyers_orders")
-        checks["broker_orders_circuit"] = {
-            "status": "ok" if order_cb["state"] != "OPEN" else "degraded",
-            "circuit_state": order_cb["state"],
-        }
-        if order_cb["state"] == "OPEN":
-            is_ready = False  # Can't place orders if circuit is open
-    except Exception as e:
-        checks["broker_circuit"] = {"status": "error", "detail": str(e)}
 
-    # ── Trading session ────────────────────────
+async def _check_db(session_factory: async_sessionmaker, today: str) -> tuple[dict, bool]:
+    """
+    No query on the probe path: freshness of the background heartbeat
+    (db_heartbeat_loop) + free pool slots as a pressure signal.
+    SELECT 1 itself is kept for /health/detailed.
+    """
+    heartbeat = get_db_heartbeat()
+    if heartbeat["last_ok"] is None:
+        age = None
+    else:
+        age = round(_mono() - heartbeat["last_ok"], 1)
+    if age is None or age > _DB_HEARTBEAT_STALE_S:
+        return {"database": {
+            "status": "error",
+            "heartbeat_age_s": age,
+            "detail": heartbeat["error"] or "No recent DB heartbeat",
+        }}, False
+
+    free = pool_free_connections()
+    return {"database": {
+        "status": "degraded" if free == 0 else "ok",
+        "free_connections": free,
+        "heartbeat_age_s": age,
+    }}, True
+
+
+async def _check_broker(session_factory: async_sessionmaker, today: str) -> tuple[dict, bool]:
+    # Broker connectivity (via circuit breaker state)
     try:
-        result = await db.execute(
-            text("SELECT is_killed, kill_reason FROM trading_sessions WHERE date=:d"),
-            {"d": date.today().isoformat()}
-        )
-        row = result.fetchone()
-        if row:
-            checks["trading_session"] = {
-                "status":     "killed" if row.is_killed else "ok",
-                "is_killed":  row.is_killed,
-                "kill_reason": row.kill_reason,
-            }
-        else:
-            checks["trading_session"] = {"status": "no_session", "detail": "Session not yet created"}
+        # In-process mirror; the DB is only read to resync it (or seed it after boot)
+        order_state = BrokerCircuitBreakers.snapshot().get("fyers_orders")
+        if order_state is None or BrokerCircuitBreakers.snapshot_stale():
+            await _t(BrokerCircuitBreakers.cached_statuses(session_factory))
+            order_state = BrokerCircuitBreakers.snapshot()["fyers_orders"]
+        return {"broker_orders_circuit": {
+            "status": "ok" if order_state != "OPEN" else "degraded",
+            "circuit_state": order_state,
+        }}, order_state != "OPEN"   # Can't place orders if circuit is open
+    except asyncio.TimeoutError:
+        return {"broker_orders_circuit": dict(_HC_TIMEOUT_RESULT)}, False
     except Exception as e:
-        checks["trading_session"] = {"status": "error", "detail": str(e)}
+        return {"broker_circuit": {"status": "error", "detail": str(e)}}, True
+
 
-    # ── Reconciliation health ──────────────────
+async def _check_session(session_factory: async_sessionmaker, today: str) -> tuple[dict, bool]:
+    """Trading session + reconciliation health — both from one trading_sessions row."""
     try:
-        result = await db.execute(
-            text(
-                "SELECT reconcile_failure_count, last_reconcile_at, last_reconcile_status "
-                "FROM trading_sessions WHERE date=:d"
-            ),
-            {"d": date.today().isoformat()}
-        )
-        row = result.fetchone()
-        if row:
-            checks["reconciliation"] = {
-                "status":          "degraded" if row.reconcile_failure_count > 0 else "ok",
-                "failure_count":   row.reconcile_failure_count,
-                "last_run":        row.last_reconcile_at.isoformat() if row.last_reconcile_at else None,
-                "last_status":     row.last_reconcile_status,
-            }
+        async with session_factory() as db:
+            result = await _t(db.execute(_SQL_SESSION, {"d": today}))
+            row = result.mappings().first()
+    except asyncio.TimeoutError:
+        return {"trading_session": dict(_HC_TIMEOUT_RESULT)}, False
     except Exception as e:
-        checks["reconciliation"] = {"status": "error", "detail": str(e)}
+        error = {"status": "error", "detail": str(e)}
+        return {"trading_session": error, "reconciliation": error}, True
 
-    http_status = 200 if is_ready else 503
+    if not row:
+        return {"trading_session": {"status": "no_session", "detail": "Session not yet created"}}, True
     return {
-        "status":  "ready" if is_ready else "not_ready",
-        "checks":  checks,
-        "time":    datetime.now(timezone.utc).isoformat(),
-    }
+        "trading_session": {
+            "status":     "killed" if row["is_killed"] else "ok",
+            "is_killed":  row["is_killed"],
+            "kill_reason": row["kill_reason"],
+        },
+        "reconciliation": {
+            "status":          "degraded" if row["reconcile_failure_count"] > 0 else "ok",
+            "failure_count":   row["reconcile_failure_count"],
+            "last_run":        row["last_reconcile_at"].isoformat() if row["last_reconcile_at"] else None,
+            "last_status":     row["last_reconcile_status"],
+        },
+    }, True
 
 
 # ─────────────────────────────────────────────
 # DETAILED — Full diagnostics for ops/monitoring
+# Sections run concurrently, one session each (see READINESS).
+# Dashboards should scrape /metrics instead: breaker state, realized P&L,
+# rejections and reconcile failures are kept in memory at their source.
 # ─────────────────────────────────────────────
-@router.get("/detailed", summary="Detailed diagnostic")
+@router.get("/detailed", summary="Detailed diagnostic", response_class=ORJSONResponse)
 async def detailed_health(
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_readonly_session_factory),
 ):
+    today = date.today().isoformat()
     result_data = {
         "service":       "tradedeck-api",
-        "time":          datetime.now(timezone.utc).isoformat(),
-        "uptime_s":      round(time.time() - _start_ts, 1),
+        "time":          _now(_UTC),
+        "uptime_s":      round(_mono() - _start_ts, 1),
         "database":      {},
         "circuit_breakers": [],
         "trading_session": {},
@@ -135,59 +289,77 @@ async def detailed_health(
         "orders_today":  {},
     }
 
-    # Database stats
+    sections = (_detail_db, _detail_circuit_breakers, _detail_session)
+    results = await asyncio.gather(
+        *(section(session_factory, today) for section in sections), return_exceptions=True
+    )
+    for section, result in zip(sections, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"[HEALTH] Detailed section {section.__name__} raised: {result}")
+            continue
+        result_data.update(result)
+
+    # Returned as a Response so FastAPI skips its jsonable_encoder walk;
+    # orjson serializes datetimes natively. UUIDs are str()'d at the source:
+    # asyncpg returns its own UUID subclass, which orjson rejects.
+    return ORJSONResponse(result_data)
+
+
+async def _detail_db(session_factory: async_sessionmaker, today: str) -> dict:
     try:
         # Check if we can reach the DB
-        await db.execute(text("SELECT 1"))
-        result_data["database"] = {
+        async with session_factory() as db:
+            await _t(db.scalar(_SQL_PING))
+        return {"database": {
             "status": "ok",
             "active_connections": "N/A (SQLite)",
-        }
+        }}
+    except asyncio.TimeoutError:
+        return {"database": dict(_HC_TIMEOUT_RESULT)}
     except Exception as e:
-        result_data["database"] = {"status": "error", "detail": str(e)}
+        return {"database": {"status": "error", "detail": str(e)}}
 
-    # Circuit breaker states
-    try:
-        result_data["circuit_breakers"] = await BrokerCircuitBreakers.all_statuses(db)
-    except Exception as e:
-        result_data["circuit_breakers"] = [{"error": str(e)}]
 
-    # Today's session summary
+async def _detail_circuit_breakers(session_factory: async_sessionmaker, today: str) -> dict:
     try:
-        result = await db.execute(
-            text("SELECT * FROM trading_sessions WHERE date=:d"),
-            {"d": date.today().isoformat()}
-        )
-        row = result.fetchone()
-        if row:
-            result_data["trading_session"] = {
-                "id":                row.id,
-                "date":              row.date,
-                "is_killed":         row.is_killed,
-                "kill_reason":       row.kill_reason,
-                "realized_pnl":      row.realized_pnl,
-                "unrealized_pnl":    row.unrealized_pnl,
-                "day_pnl":           round(row.realized_pnl + row.unrealized_pnl, 2),
-                "total_orders":      row.total_orders,
-                "rejected_orders":   row.rejected_orders,
-                "max_daily_loss":    row.max_daily_loss,
-                "max_lot_size":      row.max_lot_size,
-                "reconcile_failures": row.reconcile_failure_count,
-                "last_reconcile":    row.last_reconcile_at.isoformat() if row.last_reconcile_at else None,
-                "last_reconcile_status": row.last_reconcile_status,
-            }
+        return {"circuit_breakers": await _t(BrokerCircuitBreakers.cached_statuses(session_factory))}
+    except asyncio.TimeoutError:
+        return {"circuit_breakers": [dict(_HC_TIMEOUT_RESULT)]}
     except Exception as e:
-        result_data["trading_session"] = {"error": str(e)}
+        return {"circuit_breakers": [{"error": str(e)}]}
+
 
-    # Today's order breakdown by status
+async def _detail_session(session_factory: async_sessionmaker, today: str) -> dict:
+    # Today's session summary + order breakdown. The orders query keys on the
+    # session id we just read, so it probes idx_order_session with no JOIN.
     try:
-        result = await db.execute(text(
-            "SELECT status, COUNT(*) as count FROM orders o "
-            "JOIN trading_sessions s ON o.session_id=s.id "
-            "WHERE s.date=:d GROUP BY status"
-        ), {"d": date.today().isoformat()})
-        result_data["orders_today"] = {row.status: row.count for row in result.fetchall()}
+        async with session_factory() as db:
+            result = await _t(db.execute(_SQL_FULL_SESSION, {"d": today}))
+            row = result.mappings().first()
+            if not row:
+                return {}
+            result = await _t(db.execute(_SQL_ORDERS, {"sid": row["id"]}))
+            orders_today = dict(result.all())   # (status, count) pairs
+    except asyncio.TimeoutError:
+        return {"trading_session": dict(_HC_TIMEOUT_RESULT), "orders_today": dict(_HC_TIMEOUT_RESULT)}
     except Exception as e:
-        result_data["orders_today"] = {"error": str(e)}
-
-    return result_data
+        return {"trading_session": {"error": str(e)}, "orders_today": {"error": str(e)}}
+    return {
+        "trading_session": {
+            "id":                str(row["id"]),   # asyncpg UUID subclass: not orjson-serializable
+            "date":              row["date"],
+            "is_killed":         row["is_killed"],
+            "kill_reason":       row["kill_reason"],
+            "realized_pnl":      row["realized_pnl"],
+            "unrealized_pnl":    row["unrealized_pnl"],
+            "day_pnl":           round(row["realized_pnl"] + row["unrealized_pnl"], 2),
+            "total_orders":      row["total_orders"],
+            "rejected_orders":   row["rejected_orders"],
+            "max_daily_loss":    row["max_daily_loss"],
+            "max_lot_size":      row["max_lot_size"],
+            "reconcile_failures": row["reconcile_failure_count"],
+            "last_reconcile":    row["last_reconcile_at"],
+            "last_reconcile_status": row["last_reconcile_status"],
+        },
+        "orders_today": orders_today,
+    }
@@ -13,46 +13,125 @@ import asyncio
 import json
 import logging
 import os
-import statistics
+import queue
 import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime, date, timedelta, timezone
 from typing import Optional
 
+import numpy as np
+import orjson
 import psutil
 from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, Field
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.core.database import get_db, engine   # engine exposed for pool stats
+from sqlalchemy import JSON, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import (   # engine exposed for pool stats
+    get_db, get_db_readonly, get_readonly_session_factory, readonly_session,
+    engine, pool_checked_out,
+)
 from app.core.auth import verify_token
 from app.core.circuit_breaker import BrokerCircuitBreakers
+from app.core.observability import JSONFormatter, set_pool_size, set_redis_memory
 from app.services.strategy_control import StrategyControlService, StrategyControlError
 
 logger     = logging.getLogger(__name__)
-router     = APIRouter(prefix="/api/v1/observe", tags=["Observability"])
+# Polled endpoints → orjson; naive datetimes serialize as ISO-8601 without .isoformat()
+router     = APIRouter(prefix="/api/v1/observe", tags=["Observability"], default_response_class=ORJSONResponse)
 _start_ts  = time.time()
 _ctrl_svc  = StrategyControlService()
 
 
+class _DroppingQueueHandler(QueueHandler):
+    """Drops the record when the queue is full instead of blocking the loop."""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+# Endpoint failure traces → emergency_trace.log. File I/O runs on the
+# listener thread; the event loop only does a put_nowait. Records are
+# JSON-formatted before enqueueing so the request_id contextvar is still set.
+# The file is only opened on the first trace (delay=True) and the listener
+# thread is started/stopped by the app lifespan, so importing this module
+# has no side effects on disk.
+_emergency_queue: queue.Queue = queue.Queue(maxsize=1000)
+_emergency_handler = _DroppingQueueHandler(_emergency_queue)
+_emergency_handler.setFormatter(JSONFormatter())
+_emergency_listener = QueueListener(
+    _emergency_queue,
+    RotatingFileHandler("emergency_trace.log", maxBytes=10_000_000, backupCount=3, delay=True),
+)
+
+emergency_logger = logging.getLogger("tradedeck.emergency")
+emergency_logger.addHandler(_emergency_handler)
+emergency_logger.propagate = False
+
+
+def start_emergency_listener() -> None:
+    """Started from the app lifespan."""
+    if _emergency_listener._thread is None:
+        _emergency_listener.start()
+
+
+def stop_emergency_listener() -> None:
+    """Flushes queued traces to the file and joins the listener thread."""
+    if _emergency_listener._thread is not None:
+        _emergency_listener.stop()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # HELPERS
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _percentile(data: list[float], pct: float) -> float:
+def _percentiles(data: np.ndarray, pcts: tuple[float, ...]) -> list[float]:
     """
-    Correct percentile calculation.
+    Correct percentile calculation, all requested percentiles in one pass.
     p95 = pct=0.95 → the value below which 95% of observations fall.
     p5  = pct=0.05 → the 5th percentile.
     NOT the same thing. Previously this function returned p5 when called for p95.
     """
-    if not data:
-        return 0.0
-    s = sorted(data)
-    # Linear interpolation (same as numpy percentile)
-    idx = pct * (len(s) - 1)
-    lo, hi = int(idx), min(int(idx) + 1, len(s) - 1)
-    return round(s[lo] + (idx - lo) * (s[hi] - s[lo]), 1)
+    if not data.size:
+        return [0.0] * len(pcts)
+    # Linear interpolation (same as Postgres PERCENTILE_CONT); one partition/sort
+    # in C instead of a sorted() per pct. Full precision — see fmt_ms.
+    return np.quantile(data, pcts, method="linear").tolist()
+
+
+def fmt_ms(v: float) -> float:
+    """Response-side rounding for latencies; comparisons use the raw value."""
+    return round(v, 1)
+
+
+# Redis sits on the polled paths: each call gets REDIS_TIMEOUT_S, and one
+# timeout skips Redis entirely for REDIS_BACKOFF_S (DB fallback / no cache)
+# instead of every poller waiting out the same slow server.
+REDIS_TIMEOUT_S = 0.05
+REDIS_BACKOFF_S = 5.0
+_redis_backoff = {"until": 0.0}
+
+
+class RedisDegraded(Exception):
+    """Redis skipped: too slow just now, or still inside the backoff window."""
+
+
+async def _redis_call(fn, *args, **kwargs):
+    if time.monotonic() < _redis_backoff["until"]:
+        raise RedisDegraded("backoff")
+    try:
+        return await asyncio.wait_for(fn(*args, **kwargs), REDIS_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        _redis_backoff["until"] = time.monotonic() + REDIS_BACKOFF_S
+        logger.warning(
+            f"Redis slower than {int(REDIS_TIMEOUT_S * 1000)}ms — skipping it for {REDIS_BACKOFF_S:.0f}s"
+        )
+        raise RedisDegraded("timeout")
 
 
 def _parse_ts(ts_val):
@@ -67,7 +146,13 @@ def _parse_ts(ts_val):
     return None
 
 
-async def _get_feed_health(db: AsyncSession, redis_client=None) -> dict:
+_SQL_FEED_HEARTBEAT = text(
+    "SELECT last_tick_at, is_connected, updated_at "
+    "FROM feed_heartbeat WHERE feed_name='fyers_ws'"
+)
+
+
+async def _get_feed_health(db: AsyncSession, redis_client, now: datetime) -> dict:
     """
     Real feed health. Priority:
       1. Redis key "tradedeck:last_tick_ts" (set by WS worker on every tick)
@@ -76,13 +161,17 @@ async def _get_feed_health(db: AsyncSession, redis_client=None) -> dict:
 
     Never hardcodes. If Redis and DB both fail → status="unknown", which
     causes the UI to show a warning, not a false green.
-    """
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
 
+    `now` is the caller's naive-UTC request time, so age_seconds and the
+    response "ts" agree.
+    """
     # ── Try Redis first (sub-millisecond) ─────────────────────────────────
     if redis_client:
         try:
-            raw = await redis_client.get("tradedeck:last_tick_ts")
+            # Both keys in one round trip
+            raw, raw_conn = await _redis_call(
+                redis_client.mget, "tradedeck:last_tick_ts", "tradedeck:ws_connected"
+            )
             if raw:
                 # Use robust parser that handles both bytes and str, and Z replacement
                 last_tick = _parse_ts(raw)
@@ -92,7 +181,6 @@ async def _get_feed_health(db: AsyncSession, redis_client=None) -> dict:
                         last_tick = last_tick.replace(tzinfo=None)
                     
                     age_s     = (now - last_tick).total_seconds()
-                    raw_conn  = await redis_client.get("tradedeck:ws_connected")
                     ws_conn   = (raw_conn == "1")
                     status    = "live" if age_s < 1.0 else "stale" if age_s < 3.0 else "dead"
                     return {
@@ -102,6 +190,8 @@ async def _get_feed_health(db: AsyncSession, redis_client=None) -> dict:
                         "source":       "redis",
                         "last_tick_utc": last_tick.isoformat(),
                     }
+        except RedisDegraded:
+            pass   # Already logged once by _redis_call → DB fallback
         except Exception as e:
             logger.warning(f"Redis feed health check failed: {e} — falling back to DB")
 
@@ -109,12 +199,7 @@ async def _get_feed_health(db: AsyncSession, redis_client=None) -> dict:
 
     # ── Fall back to PostgreSQL feed_heartbeat ─────────────────────────────
     try:
-        result = await db.execute(
-            text(
-                "SELECT last_tick_at, is_connected, updated_at "
-                "FROM feed_heartbeat WHERE feed_name='fyers_ws'"
-            )
-        )
+        result = await db.execute(_SQL_FEED_HEARTBEAT)
         row = result.fetchone()
         if row:
             last_tick = _parse_ts(row.last_tick_at)
@@ -143,34 +228,70 @@ async def _get_feed_health(db: AsyncSession, redis_client=None) -> dict:
     }
 
 
-async def _get_net_delta(db: AsyncSession) -> dict:
+_SQL_DELTA = text(
+    "SELECT "
+    "  COALESCE(SUM(net_delta), 0.0)  AS total_delta, "
+    "  COALESCE(SUM(CASE WHEN direction_bias='BULL' THEN 1 ELSE 0 END), 0) AS bull_count, "
+    "  COALESCE(SUM(CASE WHEN direction_bias='BEAR' THEN 1 ELSE 0 END), 0) AS bear_count, "
+    "  COALESCE(SUM(CASE WHEN direction_bias='NEUTRAL' THEN 1 ELSE 0 END), 0) AS neutral_count, "
+    "  COUNT(*) AS running_count "
+    "FROM strategy_states WHERE status='running'"
+)
+
+
+# The SUM over running strategies is shared by every poller → kept in a Redis
+# hash for NET_DELTA_CACHE_TTL_S; one HGETALL instead of a scan per poll.
+NET_DELTA_CACHE_KEY   = "tradedeck:net_delta"
+NET_DELTA_CACHE_TTL_S = 5
+
+
+async def _get_net_delta(db: AsyncSession, redis_client=None) -> dict:
     """
     Real net delta aggregated from strategy_states.
     Only counts running strategies — paused/stopped strategies
     hold no live positions from new signals.
     """
-    result = await db.execute(
-        text(
-            "SELECT "
-            "  COALESCE(SUM(net_delta), 0.0)  AS total_delta, "
-            "  COALESCE(SUM(CASE WHEN direction_bias='BULL' THEN 1 ELSE 0 END), 0) AS bull_count, "
-            "  COALESCE(SUM(CASE WHEN direction_bias='BEAR' THEN 1 ELSE 0 END), 0) AS bear_count, "
-            "  COALESCE(SUM(CASE WHEN direction_bias='NEUTRAL' THEN 1 ELSE 0 END), 0) AS neutral_count, "
-            "  COUNT(*) AS running_count "
-            "FROM strategy_states WHERE status='running'"
-        )
-    )
-    row = result.fetchone()
+    if redis_client:
+        try:
+            cached = await _redis_call(redis_client.hgetall, NET_DELTA_CACHE_KEY)
+            if cached:
+                return _net_delta_from_row({
+                    "total_delta":   float(cached["total_delta"]),
+                    "bull_count":    int(cached["bull_count"]),
+                    "bear_count":    int(cached["bear_count"]),
+                    "neutral_count": int(cached["neutral_count"]),
+                })
+        except RedisDegraded:
+            pass
+        except Exception as e:
+            logger.warning(f"Redis net delta read failed: {e}")
+
+    row = (await db.execute(_SQL_DELTA)).mappings().first()
+
+    if redis_client and row:
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.hset(NET_DELTA_CACHE_KEY, mapping={k: str(v) for k, v in row.items()})
+            pipe.expire(NET_DELTA_CACHE_KEY, NET_DELTA_CACHE_TTL_S)
+            await _redis_call(pipe.execute)
+        except RedisDegraded:
+            pass
+        except Exception as e:
+            logger.warning(f"Redis net delta write failed: {e}")
+    return _net_delta_from_row(row)
+
+
+def _net_delta_from_row(row) -> dict:
     if not row:
         return {"total": 0.0, "bull": 0, "bear": 0, "neutral": 0, "direction": "NEUTRAL"}
 
-    total   = round(float(row.total_delta), 3)
+    total   = round(float(row["total_delta"]), 3)
     direction = "BULL" if total > 0.3 else "BEAR" if total < -0.3 else "NEUTRAL"
     return {
         "total":     total,
-        "bull":      row.bull_count,
-        "bear":      row.bear_count,
-        "neutral":   row.neutral_count,
+        "bull":      row["bull_count"],
+        "bear":      row["bear_count"],
+        "neutral":   row["neutral_count"],
         "direction": direction,
     }
 
@@ -184,19 +305,21 @@ async def _get_live_pool_stats() -> dict:
         pool = engine.pool
         
         # SQLite uses NullPool or SingletonThreadPool which don't have .size()
+        checked_out = pool_checked_out()   # Maintained by pool checkout/checkin events
         if hasattr(pool, 'size'):
+            size = pool.size()
             return {
-                "size":        pool.size(),
-                "checked_out": pool.checkedout(),
+                "size":        size,
+                "checked_out": checked_out,
                 "overflow":    pool.overflow(),
                 "checked_in":  pool.checkedin(),
-                "usage_pct":   round((pool.checkedout() / max(pool.size(), 1)) * 100),
+                "usage_pct":   round((checked_out / max(size, 1)) * 100),
             }
         else:
             # Fallback for SQLite NullPool
             return {
                 "size": 1,
-                "checked_out": pool.checkedout() if hasattr(pool, 'checkedout') else 0,
+                "checked_out": checked_out,
                 "overflow": 0,
                 "checked_in": 0,
                 "usage_pct": 0
@@ -206,12 +329,66 @@ async def _get_live_pool_stats() -> dict:
         return {"size": 0, "checked_out": 0, "overflow": 0, "usage_pct": 0}
 
 
+# Infra stats sampled off the request path by infra_stats_loop(): psutil's
+# cpu_percent(interval=0.1) would otherwise sleep 100ms on the event loop, and
+# every /infra poller would fire its own Redis INFO + pg_stat_activity query.
+# The same samples feed the Prometheus gauges served by /metrics.
+HOST_CPU_SAMPLE_S = 1.0
+HOST_MEM_DISK_SAMPLE_S = 5.0
+_host_stats: dict = {
+    "cpu": None, "mem": None, "disk": None, "cores": psutil.cpu_count(),
+    "redis": {"available": False}, "active_queries": None,
+}
+
+
+def _sample_mem_disk() -> None:
+    _host_stats["mem"]  = psutil.virtual_memory()
+    _host_stats["disk"] = psutil.disk_usage("/")
+
+
+def _sample_pool() -> None:
+    pool = engine.pool
+    if hasattr(pool, "size"):
+        set_pool_size(pool.size(), pool.overflow())
+
+
+_SQL_ACTIVE_CONNS = text("SELECT count(*) FROM pg_stat_activity WHERE state='active'")
+
+
+async def _sample_active_queries() -> None:
+    if engine.dialect.name != "postgresql":
+        return
+    async with readonly_session() as db:
+        _host_stats["active_queries"] = (await db.execute(_SQL_ACTIVE_CONNS)).scalar()
+
+
+async def infra_stats_loop(redis_client=None) -> None:
+    """Started from the app lifespan. /infra only reads _host_stats."""
+    psutil.cpu_percent(interval=None)   # Prime: the first non-blocking call returns 0.0
+    last_mem_disk = 0.0
+    while True:
+        try:
+            _host_stats["cpu"] = psutil.cpu_percent(interval=None)
+            _sample_pool()
+            _host_stats["redis"] = await _get_redis_stats(redis_client)
+            if time.monotonic() - last_mem_disk >= HOST_MEM_DISK_SAMPLE_S:
+                _sample_mem_disk()
+                await _sample_active_queries()
+                last_mem_disk = time.monotonic()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Infra stats sample failed: {e}")
+        await asyncio.sleep(HOST_CPU_SAMPLE_S)
+
+
 async def _get_redis_stats(redis_client=None) -> dict:
     """Real Redis INFO. Returns structured stats or safe defaults."""
     if not redis_client:
         return {"available": False}
     try:
-        info = await redis_client.info("memory")
+        info = await _redis_call(redis_client.info, "memory")
+        set_redis_memory(info["used_memory"])
         return {
             "available":          True,
             "memory_mb":          round(info["used_memory"] / 1024 / 1024, 1),
@@ -222,179 +399,316 @@ async def _get_redis_stats(redis_client=None) -> dict:
             ) if info.get("maxmemory") else None,
             "rdb_last_save":      info.get("rdb_last_bgsave_status"),
         }
+    except RedisDegraded as e:
+        return {"available": False, "error": str(e)}
     except Exception as e:
         logger.warning(f"Redis INFO failed: {e}")
         return {"available": False, "error": str(e)}
 
 
+# Postgres: every DB-side telemetry aggregate in one statement → one round
+# trip and one snapshot. Each CTE comes back as a JSONB column.
+# The latency CTE is served by idx_order_latency and the exposure CTE by
+# idx_position_open_covering (0019) — keep their WHERE clauses in sync.
+_TELEMETRY_SQL = text("""
+    WITH sess AS (
+        SELECT id, is_killed, kill_reason, realized_pnl, unrealized_pnl,
+               max_daily_loss, max_margin_usage_pct, reconcile_failure_count,
+               last_reconcile_at, last_reconcile_status
+        FROM trading_sessions WHERE date = :d
+    ),
+    recent AS (
+        SELECT (EXTRACT(EPOCH FROM o.fill_timestamp - o.sent_at) * 1000)::float8 AS ms,
+               o.fill_timestamp
+        FROM orders o JOIN sess ON o.session_id = sess.id
+        WHERE o.status = 'FILLED'
+          AND o.sent_at IS NOT NULL AND o.fill_timestamp IS NOT NULL
+        ORDER BY o.fill_timestamp DESC LIMIT 100
+    ),
+    lat AS (
+        SELECT AVG(ms)                                          AS avg_ms,
+               PERCENTILE_CONT(ARRAY[0.50, 0.95, 0.99])
+                   WITHIN GROUP (ORDER BY ms)                   AS pcts,
+               COUNT(*)                                         AS sample_n,
+               COUNT(*) FILTER (WHERE ms > 200)                 AS spike_count,
+               (ARRAY_AGG(ms ORDER BY fill_timestamp DESC))[1:20] AS history
+        FROM recent WHERE ms > 0
+    ),
+    delta AS (
+        SELECT COALESCE(SUM(net_delta), 0.0)                     AS total_delta,
+               COUNT(*) FILTER (WHERE direction_bias = 'BULL')    AS bull_count,
+               COUNT(*) FILTER (WHERE direction_bias = 'BEAR')    AS bear_count,
+               COUNT(*) FILTER (WHERE direction_bias = 'NEUTRAL') AS neutral_count
+        FROM strategy_states WHERE status = 'running'
+    ),
+    counts AS (
+        SELECT status, COUNT(*) AS n FROM strategy_states GROUP BY status
+    ),
+    pos AS (
+        SELECT COUNT(*)                              AS pos_count,
+               COALESCE(SUM(ABS(p.net_quantity)), 0) AS total_qty,
+               COALESCE(SUM(p.unrealized_pnl), 0)    AS total_unreal
+        FROM positions p JOIN sess ON p.session_id = sess.id
+        WHERE p.net_quantity != 0
+    )
+    SELECT (SELECT to_jsonb(sess)  FROM sess)  AS sess,
+           (SELECT to_jsonb(lat)   FROM lat)   AS lat,
+           (SELECT to_jsonb(delta) FROM delta) AS delta,
+           (SELECT COALESCE(jsonb_object_agg(status, n), '{}'::jsonb) FROM counts) AS counts,
+           (SELECT to_jsonb(pos)   FROM pos)   AS pos
+""").columns(sess=JSONB, lat=JSONB, delta=JSONB, counts=JSONB, pos=JSONB)
+
+
+async def _get_telemetry_aggregates(db: AsyncSession, today: str) -> tuple:
+    """(session, latency, net delta, strategy counts, exposure) for today."""
+    if db.bind.dialect.name == "sqlite":
+        return (
+            await _get_session_row(db, today),
+            await _get_latency(db, today),
+            await _get_net_delta(db),
+            await _get_strategy_counts(db),
+            await _get_exposure_row(db, today),
+        )
+    row = (await db.execute(_TELEMETRY_SQL, {"d": today})).one()
+    return (
+        row.sess,
+        _latency_from_row(row.lat),
+        _net_delta_from_row(row.delta),
+        row.counts,
+        row.pos,
+    )
+
+
+def _latency_from_row(row: dict) -> dict:
+    history = row["history"] or []
+    p50, p95, p99 = row["pcts"] or (0.0, 0.0, 0.0)
+    return {
+        "avg_ms":   fmt_ms(row["avg_ms"]) if row["sample_n"] else 0,
+        "p50_ms":   fmt_ms(p50),
+        "p95_ms":   fmt_ms(p95),
+        "p99_ms":   fmt_ms(p99),
+        "last_ms":  fmt_ms(history[0]) if history else 0,
+        "sample_n": row["sample_n"],
+        "history":  [fmt_ms(v) for v in history],
+        "spike_count": row["spike_count"],
+    }
+
+
+# ── SQLite fallback: one query per aggregate, percentiles in numpy ──────────
+
+_SQL_SESSION = text(
+    "SELECT is_killed, kill_reason, realized_pnl, unrealized_pnl, "
+    "max_daily_loss, max_margin_usage_pct, reconcile_failure_count, "
+    "last_reconcile_at, last_reconcile_status "
+    "FROM trading_sessions WHERE date=:d"
+)
+_SQL_LATENCY = text(
+    "SELECT o.fill_timestamp, o.sent_at "
+    "FROM orders o JOIN trading_sessions s ON o.session_id=s.id "
+    "WHERE s.date=:d AND o.status='FILLED' "
+    "  AND o.sent_at IS NOT NULL AND o.fill_timestamp IS NOT NULL "
+    "ORDER BY o.fill_timestamp DESC LIMIT 100"
+)
+_SQL_COUNTS = text("SELECT status, COUNT(*) as n FROM strategy_states GROUP BY status")
+_SQL_POSITIONS = text(
+    "SELECT "
+    "  COUNT(*) AS pos_count, "
+    "  COALESCE(SUM(ABS(p.net_quantity)), 0) AS total_qty, "
+    "  COALESCE(SUM(p.unrealized_pnl), 0) AS total_unreal "
+    "FROM positions p JOIN trading_sessions s ON p.session_id=s.id "
+    "WHERE s.date=:d AND p.net_quantity != 0"
+)
+
+
+async def _get_session_row(db: AsyncSession, today: str):
+    return (await db.execute(_SQL_SESSION, {"d": today})).mappings().first()
+
+
+async def _get_latency(db: AsyncSession, today: str) -> dict:
+    """Fill latency (sent_at → fill_timestamp) over today's last 100 fills."""
+    lat_rows = (await db.execute(_SQL_LATENCY, {"d": today})).all()
+
+    # One vectorized pass: SQLite hands back ISO strings, numpy parses them
+    # (and datetimes) straight into datetime64 — no per-row fromisoformat.
+    try:
+        fills = np.array([r.fill_timestamp for r in lat_rows], dtype="datetime64[ns]")
+        sents = np.array([r.sent_at for r in lat_rows], dtype="datetime64[ns]")
+        lats_ms = (fills - sents).astype(np.int64) / 1e6
+    except ValueError as e:
+        logger.warning(f"Unparseable fill timestamps in latency sample: {e}")
+        lats_ms = np.empty(0)
+    arr = lats_ms[lats_ms > 0]   # Still newest fill first
+
+    p50, p95, p99 = _percentiles(arr, (0.50, 0.95, 0.99))
+    return {
+        "avg_ms":   fmt_ms(float(arr.mean())) if arr.size else 0,
+        "p50_ms":   fmt_ms(p50),
+        "p95_ms":   fmt_ms(p95),
+        "p99_ms":   fmt_ms(p99),
+        "last_ms":  fmt_ms(float(arr[0])) if arr.size else 0,
+        "sample_n": int(arr.size),
+        "history":  np.round(arr[:20], 1).tolist(),   # fmt_ms, vectorized
+        "spike_count": int(np.count_nonzero(arr > 200)),
+    }
+
+
+async def _get_strategy_counts(db: AsyncSession) -> dict:
+    strat_counts = (await db.execute(_SQL_COUNTS)).fetchall()
+    return {r.status: r.n for r in strat_counts}
+
+
+async def _get_exposure_row(db: AsyncSession, today: str):
+    return (await db.execute(_SQL_POSITIONS, {"d": today})).mappings().first()
+
+
+async def _get_margin(broker, redis_client=None) -> tuple[float, float]:
+    """(used, total) from broker funds, cached in Redis for 10s."""
+    margin_used = 0.0
+    margin_total = 1.0
+    if not broker:
+        return margin_used, margin_total
+    try:
+        # Try to get from Redis cache first
+        cache_key = "tradedeck:margin_data"
+        if redis_client:
+            cached = await redis_client.get(cache_key)
+            if cached:
+                m_data = json.loads(cached)
+                margin_used = m_data.get("used", 0)
+                margin_total = m_data.get("total", 1)
+
+        # If not in cache, fetch from broker
+        if margin_total == 1.0:
+            funds = await broker.get_funds()
+            equity = funds.get("equity", {})
+            margin_used = float(equity.get("used_margin", 0))
+            margin_total = float(equity.get("available_margin", 1))
+
+            if redis_client:
+                await redis_client.set(cache_key, json.dumps({
+                    "used": margin_used,
+                    "total": margin_total
+                }), ex=10) # 10s TTL
+    except Exception as e:
+        logger.warning(f"Failed to fetch live margin: {e}")
+    return margin_used, margin_total
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # ENDPOINTS
 # ─────────────────────────────────────────────────────────────────────────────
 
-import traceback
+# Every open dashboard polls /telemetry every 2s and gets the same payload
+# within a window → the first caller builds it, the rest read the serialized
+# bytes from Redis. The lock keeps one builder per process on expiry.
+TELEMETRY_CACHE_KEY    = "tradedeck:tele:v1"
+TELEMETRY_CACHE_TTL_MS = 1000
+_telemetry_lock = asyncio.Lock()
+
+
+async def _cache_get(redis_client, key: str) -> Optional[str]:   # decode_responses=True
+    if not redis_client:
+        return None
+    try:
+        return await _redis_call(redis_client.get, key)
+    except RedisDegraded:
+        return None
+    except Exception as e:
+        logger.warning(f"Redis cache read failed for {key}: {e}")
+        return None
 
 
 @router.get("/telemetry")
 async def get_telemetry(
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_readonly_session_factory),
     token: dict = Depends(verify_token),
 ):
+    redis = getattr(request.app.state, "redis", None)
+    if not redis:
+        return await _build_telemetry(request, session_factory)
+
+    cached = await _cache_get(redis, TELEMETRY_CACHE_KEY)
+    if cached is None:
+        async with _telemetry_lock:
+            cached = await _cache_get(redis, TELEMETRY_CACHE_KEY)
+            if cached is None:
+                cached = orjson.dumps(await _build_telemetry(request, session_factory))
+                try:
+                    await _redis_call(redis.set, TELEMETRY_CACHE_KEY, cached, px=TELEMETRY_CACHE_TTL_MS)
+                except RedisDegraded:
+                    pass
+                except Exception as e:
+                    logger.warning(f"Redis cache write failed for {TELEMETRY_CACHE_KEY}: {e}")
+    return Response(content=cached, media_type="application/json")
+
+
+async def _build_telemetry(request: Request, session_factory: async_sessionmaker) -> dict:
     try:
         """
         Everything the topbar, risk ribbon, and exposure panel needs.
         Poll every 2 seconds.
 
         All numbers computed server-side. Frontend renders exactly what this returns.
-        """
-        today = date.today().isoformat()
 
-        # ── Session ────────────────────────────────────────────────────────────
-        sess = (await db.execute(
-            text(
-                "SELECT is_killed, kill_reason, realized_pnl, unrealized_pnl, "
-                "max_daily_loss, max_margin_usage_pct, reconcile_failure_count, "
-                "last_reconcile_at, last_reconcile_status "
-                "FROM trading_sessions WHERE date=:d"
-            ),
-            {"d": today}
-        )).fetchone()
-
-        sess_realized = (sess.realized_pnl or 0.0) if sess else 0.0
-        sess_unreal   = (sess.unrealized_pnl or 0.0) if sess else 0.0
-        day_pnl = round(sess_realized + sess_unreal, 2)
-        
-        max_loss = (sess.max_daily_loss or 1) if sess else 1
-        loss_pct = round(abs(min(0.0, day_pnl)) / max_loss * 100, 1)
+        The reads are independent → fired concurrently, so wall time is the
+        slowest query rather than the sum. An AsyncSession cannot multiplex
+        queries → each read opens its own session.
+        """
+        now    = datetime.now(timezone.utc).replace(tzinfo=None)
+        today  = date.today().isoformat()
+        redis  = getattr(request.app.state, "redis", None)
+        broker = getattr(request.app.state, "broker", None)
 
-        # ── Latency — DIALECT AGNOSTIC ────────────────────────────────────────
-        lat_rows = (await db.execute(
-            text(
-                "SELECT o.fill_timestamp, o.sent_at "
-                "FROM orders o JOIN trading_sessions s ON o.session_id=s.id "
-                "WHERE s.date=:d AND o.status='FILLED' "
-                "  AND o.sent_at IS NOT NULL AND o.fill_timestamp IS NOT NULL "
-                "ORDER BY o.fill_timestamp DESC LIMIT 100"
-            ),
-            {"d": today}
-        )).fetchall()
-
-        lats = []
-        for r in lat_rows:
-            try:
-                # Handle both datetime objects and strings (SQLite fallback)
-                fill_ts = r.fill_timestamp
-                sent_ts = r.sent_at
-                if isinstance(fill_ts, str): fill_ts = datetime.fromisoformat(fill_ts)
-                if isinstance(sent_ts, str): sent_ts = datetime.fromisoformat(sent_ts)
-                
-                diff = (fill_ts - sent_ts).total_seconds() * 1000
-                if diff > 0:
-                    lats.append(diff)
-            except Exception:
-                continue
-
-        latency = {
-            "avg_ms":   round(statistics.mean(lats), 1) if lats else 0,
-            "p50_ms":   _percentile(lats, 0.50),
-            "p95_ms":   _percentile(lats, 0.95),
-            "p99_ms":   _percentile(lats, 0.99),
-            "last_ms":  round(lats[0], 1) if lats else 0,
-            "sample_n": len(lats),
-            "history":  [round(v, 1) for v in lats[:20]],
-            "spike_count": sum(1 for v in lats if v > 200),
-        }
+        async def read(fn, *args):
+            async with session_factory() as db:
+                return await fn(db, *args)
+
+        (
+            (sess, latency, delta, counts, pos_agg), feed, cb_states,
+            (margin_used, margin_total),
+        ) = await asyncio.gather(
+            read(_get_telemetry_aggregates, today),
+            read(_get_feed_health, redis, now),
+            BrokerCircuitBreakers.cached_statuses(session_factory),
+            _get_margin(broker, redis),
+        )
 
-        # ── Feed health — real, never hardcoded ────────────────────────────────
-        redis = getattr(request.app.state, "redis", None)
-        feed  = await _get_feed_health(db, redis)
+        sess_realized = (sess["realized_pnl"] or 0.0) if sess else 0.0
+        sess_unreal   = (sess["unrealized_pnl"] or 0.0) if sess else 0.0
+        day_pnl = round(sess_realized + sess_unreal, 2)
 
-        # ── Net delta — real aggregation ──────────────────────────────────────
-        delta = await _get_net_delta(db)
+        max_loss = (sess["max_daily_loss"] or 1) if sess else 1
+        loss_pct = round(abs(min(0.0, day_pnl)) / max_loss * 100, 1)
 
-        # ── Margin (from broker funds, cached in Redis) ───────────────────────
-        margin_used = 0.0
-        margin_total = 1.0
         margin_pct = 0.0
-
-        broker = getattr(request.app.state, "broker", None)
-        if broker:
-            try:
-                # Try to get from Redis cache first
-                cache_key = "tradedeck:margin_data"
-                if redis:
-                    cached = await redis.get(cache_key)
-                    if cached:
-                        m_data = json.loads(cached)
-                        margin_used = m_data.get("used", 0)
-                        margin_total = m_data.get("total", 1)
-                
-                # If not in cache, fetch from broker
-                if margin_total == 1.0:
-                    funds = await broker.get_funds()
-                    equity = funds.get("equity", {})
-                    margin_used = float(equity.get("used_margin", 0))
-                    margin_total = float(equity.get("available_margin", 1))
-                    
-                    if redis:
-                        await redis.set(cache_key, json.dumps({
-                            "used": margin_used,
-                            "total": margin_total
-                        }), ex=10) # 10s TTL
-            except Exception as e:
-                logger.warning(f"Failed to fetch live margin: {e}")
-
         if margin_total > 0:
             margin_pct = round((margin_used / margin_total) * 100, 1)
 
         # ── Reconciliation lag ─────────────────────────────────────────────────
         recon_lag = None
-        lr_ts = _parse_ts(sess.last_reconcile_at) if sess else None
+        lr_ts = _parse_ts(sess["last_reconcile_at"]) if sess else None
         if lr_ts:
             # Ensure lr_ts is naive if now is naive
             if lr_ts.tzinfo:
                 lr_ts = lr_ts.replace(tzinfo=None)
-            recon_lag = round((datetime.now(timezone.utc).replace(tzinfo=None) - lr_ts).total_seconds())
+            recon_lag = round((now - lr_ts).total_seconds())
 
-        # ── Strategy counts ────────────────────────────────────────────────────
-        strat_counts = (await db.execute(
-            text(
-                "SELECT status, COUNT(*) as n FROM strategy_states GROUP BY status"
-            )
-        )).fetchall()
-        counts = {r.status: r.n for r in strat_counts}
-
-        # ── Circuit breakers ───────────────────────────────────────────────────
-        cb_states = await BrokerCircuitBreakers.all_statuses(db)
-
-        # ── Open exposure ──────────────────────────────────────────────────────
-        pos_agg = (await db.execute(
-            text(
-                "SELECT "
-                "  COUNT(*) AS pos_count, "
-                "  COALESCE(SUM(ABS(p.net_quantity)), 0) AS total_qty, "
-                "  COALESCE(SUM(p.unrealized_pnl), 0) AS total_unreal "
-                "FROM positions p JOIN trading_sessions s ON p.session_id=s.id "
-                "WHERE s.date=:d AND p.net_quantity != 0"
-            ),
-            {"d": today}
-        )).fetchone()
-
-        open_lots       = (pos_agg.total_qty // 50) if pos_agg else 0
+        open_lots       = (pos_agg["total_qty"] // 50) if pos_agg else 0
         margin_at_risk  = open_lots * 25000  # Approximate SPAN
 
         return {
-            "ts": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+            "ts": now,
             "session": {
                 "day_pnl":       day_pnl,
                 "loss_pct":      loss_pct,
-                "is_killed":     sess.is_killed if sess else False,
-                "kill_reason":   sess.kill_reason if sess else None,
+                "is_killed":     sess["is_killed"] if sess else False,
+                "kill_reason":   sess["kill_reason"] if sess else None,
                 "counts":        counts,
                 "reconcile": {
-                    "fail_n": sess.reconcile_failure_count if sess else 0,
+                    "fail_n": sess["reconcile_failure_count"] if sess else 0,
                     "last_run": lr_ts.isoformat() if lr_ts else None,
-                    "status": sess.last_reconcile_status if sess else "unknown",
+                    "status": sess["last_reconcile_status"] if sess else "unknown",
                 }
             },
             "latency": latency,
@@ -406,10 +720,10 @@ async def get_telemetry(
                 "pct":       margin_pct,
             },
             "exposure": {
-                "open_positions": pos_agg.pos_count if (pos_agg and pos_agg.pos_count) else 0,
+                "open_positions": pos_agg["pos_count"] if (pos_agg and pos_agg["pos_count"]) else 0,
                 "open_lots":      open_lots,
                 "margin_at_risk": margin_at_risk,
-                "unrealized_pnl": round(pos_agg.total_unreal, 2) if (pos_agg and pos_agg.total_unreal) else 0,
+                "unrealized_pnl": round(pos_agg["total_unreal"], 2) if (pos_agg and pos_agg["total_unreal"]) else 0,
             },
             "reconciliation": {
                 "lag_seconds":   recon_lag,
@@ -417,16 +731,45 @@ async def get_telemetry(
             "circuit_breakers": cb_states,
         }
     except Exception as e:
-        with open("emergency_trace.log", "a") as f:
-            f.write(f"\n--- {datetime.now(timezone.utc).replace(tzinfo=None) } ---\n")
-            f.write(traceback.format_exc())
-            f.write("\n")
+        emergency_logger.exception("telemetry failure")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Rows come back already shaped like the /strategies response: aliased to the
+# UI keys, rounded and HH:MM:SS-formatted in the DB → no per-row Python dict.
+# Only the time formatting differs between dialects.
+_R = "CAST(ROUND(CAST({c} AS NUMERIC), {n}) AS DOUBLE PRECISION)"
+_STRATEGIES_COLUMNS = (
+    "strategy_name AS name, status, control_intent, "
+    f"{_R.format(c='pnl', n=2)} AS pnl, allocated_capital AS alloc, open_qty, "
+    f"{_R.format(c='NULLIF(avg_entry, 0)', n=2)} AS avg_entry, "
+    f"{_R.format(c='NULLIF(ltp, 0)', n=2)} AS ltp, "
+    f"{_R.format(c='win_rate', n=1)} AS win_rate, total_trades AS trades, "
+    f"{_R.format(c='net_delta', n=3)} AS delta, "
+    f"{_R.format(c='drawdown_pct', n=2)} AS drawdown, max_dd_pct AS max_dd, "
+    f"{_R.format(c='risk_pct', n=2)} AS risk_pct, "
+    "direction_bias AS direction, current_signal AS signal, symbol, strategy_type AS type, "
+    "thought_process, stop_loss, target_price, {last_trade} AS last_trade, "
+    "error_message AS error_msg, error_trace, error_count, "
+    "{last_good} AS last_good_trade, restart_count, auto_restart "
+)
+_HHMMSS = {
+    "postgresql": "to_char({c}, 'HH24:MI:SS')",
+    "sqlite":     "strftime('%H:%M:%S', {c})",
+}
+_STRATEGIES_SQL = {
+    dialect: text(
+        "SELECT " + _STRATEGIES_COLUMNS.format(
+            last_trade=fmt.format(c="last_trade_at"), last_good=fmt.format(c="last_good_at"),
+        ) + "FROM strategy_states ORDER BY strategy_name"
+    )
+    for dialect, fmt in _HHMMSS.items()
+}
+
+
 @router.get("/strategies")
 async def get_strategies(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     token: dict = Depends(verify_token),
 ):
     """
@@ -434,112 +777,51 @@ async def get_strategies(
     Executor writes this table every tick. UI reads it here.
     Poll every 2s.
     """
-    result = await db.execute(
-        text(
-            "SELECT strategy_name, status, control_intent, pnl, allocated_capital, "
-            "open_qty, avg_entry, ltp, win_rate, total_trades, net_delta, drawdown_pct, "
-            "max_dd_pct, risk_pct, direction_bias, current_signal, symbol, strategy_type, "
-            "thought_process, stop_loss, target_price, "
-            "error_message, error_trace, error_count, last_good_at, restart_count, "
-            "auto_restart, last_trade_at, updated_at "
-            "FROM strategy_states ORDER BY strategy_name"
-        )
-    )
-    rows = result.fetchall()
-    logger.info(f"[API] Found {len(rows)} rows in strategy_states")
-
-    strategies = []
-    for r in rows:
-        lt_ts = _parse_ts(r.last_trade_at)
-        last_trade_str = lt_ts.strftime("%H:%M:%S") if lt_ts else None
-        
-        lg_ts = _parse_ts(r.last_good_at)
-        last_good_str = lg_ts.strftime("%H:%M:%S") if lg_ts else None
-
-        strategies.append({
-            "name":           r.strategy_name,
-            "status":         r.status,
-            "control_intent": r.control_intent,  # UI can show "pending pause..."
-            "pnl":            round(r.pnl, 2),
-            "alloc":          r.allocated_capital,
-            "open_qty":       r.open_qty,
-            "avg_entry":      round(r.avg_entry, 2) if r.avg_entry else None,
-            "ltp":            round(r.ltp, 2) if r.ltp else None,
-            "win_rate":       round(r.win_rate, 1),
-            "trades":         r.total_trades,
-            "delta":          round(r.net_delta, 3),
-            "drawdown":       round(r.drawdown_pct, 2),
-            "max_dd":         r.max_dd_pct,
-            "risk_pct":       round(r.risk_pct, 2),
-            "direction":      r.direction_bias,
-            "signal":         r.current_signal,
-            "symbol":         r.symbol,
-            "type":           r.strategy_type,
-            "thought_process": r.thought_process,
-            "stop_loss":      r.stop_loss,
-            "target_price":   r.target_price,
-            "last_trade":     last_trade_str,
-            # Error fields
-            "error_msg":      r.error_message,
-            "error_trace":    r.error_trace,
-            "error_count":    r.error_count,
-            "last_good_trade": last_good_str,
-            "restart_count":  r.restart_count,
-            "auto_restart":   r.auto_restart,
-        })
-    
+    sql = _STRATEGIES_SQL.get(db.bind.dialect.name, _STRATEGIES_SQL["postgresql"])
+    strategies = (await db.execute(sql)).mappings().all()
     logger.info(f"[API] Returning {len(strategies)} strategies to UI")
 
     return {
-        "ts":         datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+        "ts":         datetime.now(timezone.utc).replace(tzinfo=None),
         "strategies": strategies,
     }
 
 
+_SQL_RECONCILE = text("SELECT last_reconcile_at, last_reconcile_status FROM trading_sessions WHERE date=:d")
+
+
 @router.get("/infra")
 async def get_infra(
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     token: dict = Depends(verify_token),
 ):
     """
     Live infrastructure metrics. No mocked values.
     Poll every 10 seconds.
     """
-    cpu  = psutil.cpu_percent(interval=0.1)
-    mem  = psutil.virtual_memory()
-    disk = psutil.disk_usage("/")
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if _host_stats["mem"] is None:   # Sampler not started (or not yet run)
+        _sample_mem_disk()
+    cpu  = _host_stats["cpu"] if _host_stats["cpu"] is not None else psutil.cpu_percent(interval=None)
+    mem  = _host_stats["mem"]
+    disk = _host_stats["disk"]
     uptime_s = int(time.time() - _start_ts)
     hours, rem = divmod(uptime_s, 3600)
     mins,  _   = divmod(rem, 60)
 
     pool_stats  = await _get_live_pool_stats()
-    redis       = getattr(request.app.state, "redis", None)
-    redis_stats = await _get_redis_stats(redis)
-
-    # DB active connections
-    db_conn_count = None
-    try:
-        r = await db.execute(
-            text("SELECT count(*) FROM pg_stat_activity WHERE state='active'")
-        )
-        db_conn_count = r.scalar()
-    except Exception:
-        pass
 
     today = date.today().isoformat()
     try:
-        sess = (await db.execute(
-            text("SELECT last_reconcile_at, last_reconcile_status FROM trading_sessions WHERE date=:d"),
-            {"d": today}
-        )).fetchone()
+        sess = (await db.execute(_SQL_RECONCILE, {"d": today})).fetchone()
         
         recon_status = sess.last_reconcile_status if sess else "unknown"
         if sess and sess.last_reconcile_at:
             lr_at = sess.last_reconcile_at
             if lr_at.tzinfo:
                 lr_at = lr_at.replace(tzinfo=None)
-            lag = round((datetime.now(timezone.utc).replace(tzinfo=None) - lr_at).total_seconds())
+            lag = round((now - lr_at).total_seconds())
             recon_last = f"{lag}s ago"
         else:
             recon_last = "—"
@@ -549,10 +831,10 @@ async def get_infra(
 
     # Feed status for topbar/heartbeat
     redis = getattr(request.app.state, "redis", None)
-    feed  = await _get_feed_health(db, redis)
+    feed  = await _get_feed_health(db, redis, now)
 
     return {
-        "ts":      datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+        "ts":      now,
         "process": {
             "uptime_seconds": uptime_s,
             "uptime_human":   f"{hours}h {mins:02d}m",
@@ -560,7 +842,7 @@ async def get_infra(
         },
         "recon_last": recon_last,
         "recon_status": recon_status,
-        "cpu":    {"usage_pct": cpu, "core_count": psutil.cpu_count()},
+        "cpu":    {"usage_pct": cpu, "core_count": _host_stats["cores"]},
         "memory": {
             "total_mb":     round(mem.total / 1024**2),
             "used_mb":      round(mem.used  / 1024**2),
@@ -574,68 +856,76 @@ async def get_infra(
         },
         "database": {
             "pool":             pool_stats,
-            "active_queries":   db_conn_count,
+            "active_queries":   _host_stats["active_queries"],
             "exhausted":        pool_stats["checked_out"] >= pool_stats["size"],
         },
-        "redis": redis_stats,
+        "redis": _host_stats["redis"],
         "ws_heartbeat": feed.get("age_seconds", 0),
         "last_tick": feed.get("last_tick_utc", None),
     }
 
 
+# The summary and the position list come back as two JSON columns from one
+# scan of today's open positions → no Python sum() passes over the rows.
+# Lots are integer-divided (net_quantity is an INTEGER) like the // 50 before.
+_EXPOSURE_ROW = (
+    "{obj}('symbol', symbol, 'net_qty', net_quantity, "
+    "'side', CASE WHEN net_quantity > 0 THEN 'LONG' ELSE 'SHORT' END, "
+    "'avg_price', " + _R.format(c="CASE WHEN net_quantity > 0 THEN avg_buy_price ELSE avg_sell_price END", n=2) + ", "
+    "'ltp', " + _R.format(c="NULLIF(ltp, 0)", n=2) + ", "
+    "'unrealized', " + _R.format(c="unrealized_pnl", n=2) + ")"
+)
+_EXPOSURE_POSITIONS = {
+    "postgresql": "COALESCE(json_agg({row} ORDER BY ABS(unrealized_pnl) DESC), '[]') FROM open_pos",
+    # json_group_array has no ORDER BY → aggregate an ordered subquery
+    "sqlite":     "json_group_array({row}) FROM (SELECT * FROM open_pos ORDER BY ABS(unrealized_pnl) DESC)",
+}
+_EXPOSURE_OBJ = {"postgresql": "json_build_object", "sqlite": "json_object"}
+_SQL_EXPOSURE = {
+    dialect: text(
+        "WITH open_pos AS ("
+        "  SELECT p.symbol, p.net_quantity, p.avg_buy_price, p.avg_sell_price, p.ltp, "
+        "         p.unrealized_pnl, ABS(p.net_quantity) / 50 AS lots, "
+        # Worst case: 10% adverse move on every open position, no SL triggered
+        "         ABS(p.net_quantity) * COALESCE(p.ltp, 0) * 0.10 AS theo_loss "
+        "  FROM positions p JOIN trading_sessions s ON p.session_id=s.id "
+        "  WHERE s.date=:d AND p.net_quantity != 0"
+        ") "
+        f"SELECT (SELECT {obj}("
+        "    'open_positions', COUNT(*), "
+        "    'open_lots',      COALESCE(SUM(lots), 0), "
+        "    'margin_at_risk', COALESCE(SUM(lots), 0) * 25000, "
+        "    'max_theo_loss',  CAST(ROUND(COALESCE(SUM(theo_loss), 0)) AS BIGINT), "
+        "    'net_unrealized', " + _R.format(c="COALESCE(SUM(unrealized_pnl), 0)", n=2) +
+        "  ) FROM open_pos) AS summary, "
+        "(SELECT " + _EXPOSURE_POSITIONS[dialect].format(row=_EXPOSURE_ROW.format(obj=obj)) + ") AS positions"
+    ).columns(summary=JSON, positions=JSON)
+    for dialect, obj in _EXPOSURE_OBJ.items()
+}
+
+
 @router.get("/exposure")
 async def get_exposure(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db_readonly),
     token: dict = Depends(verify_token),
 ):
     """Aggregated cross-strategy exposure. Poll every 5s."""
     try:
         today = date.today().isoformat()
-        delta = await _get_net_delta(db)
-
-        pos_rows = (await db.execute(
-            text(
-                "SELECT p.symbol, p.net_quantity, p.avg_buy_price, p.avg_sell_price, p.ltp, "
-                "p.unrealized_pnl, p.realized_pnl "
-                "FROM positions p JOIN trading_sessions s ON p.session_id=s.id "
-                "WHERE s.date=:d AND p.net_quantity != 0 "
-                "ORDER BY ABS(p.unrealized_pnl) DESC"
-            ),
-            {"d": today}
-        )).fetchall()
-
-        open_lots      = sum(abs(p.net_quantity) // 50 for p in pos_rows)
-        margin_at_risk = open_lots * 25000
-        # Worst case: 10% adverse move on every open position, no SL triggered
-        max_theo_loss  = sum(abs(p.net_quantity) * p.ltp * 0.10 for p in pos_rows if p.ltp)
+        delta = await _get_net_delta(db, getattr(request.app.state, "redis", None))
+
+        sql = _SQL_EXPOSURE.get(db.bind.dialect.name, _SQL_EXPOSURE["postgresql"])
+        row = (await db.execute(sql, {"d": today})).one()
 
         return {
-            "ts": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
-            "summary": {
-                "open_positions":  len(pos_rows),
-                "open_lots":       open_lots,
-                "margin_at_risk":  round(margin_at_risk),
-                "max_theo_loss":   round(max_theo_loss),
-                "net_unrealized":  round(sum(p.unrealized_pnl for p in pos_rows), 2),
-            },
+            "ts": datetime.now(timezone.utc).replace(tzinfo=None),
+            "summary":   row.summary,
             "delta":     delta,
-            "positions": [
-                {
-                    "symbol":    p.symbol,
-                    "net_qty":   p.net_quantity,
-                    "side":      "LONG" if p.net_quantity > 0 else "SHORT",
-                    "avg_price": round(p.avg_buy_price if p.net_quantity > 0 else p.avg_sell_price, 2),
-                    "ltp":       round(p.ltp, 2) if p.ltp else None,
-                    "unrealized": round(p.unrealized_pnl, 2),
-                }
-                for p in pos_rows
-            ],
+            "positions": row.positions,
         }
     except Exception as e:
-        with open("emergency_trace.log", "a") as f:
-            f.write(f"\n--- {datetime.now(timezone.utc).replace(tzinfo=None) } ---\n")
-            f.write(traceback.format_exc())
-            f.write("\n")
+        emergency_logger.exception("exposure failure")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -670,6 +960,9 @@ async def pause_strategy(
         raise HTTPException(status_code=409, detail={"code": e.code, "message": e.message})
 
 
+_SQL_KILLED = text("SELECT is_killed FROM trading_sessions WHERE date=:d")
+
+
 @router.post("/strategies/{strategy_name}/resume")
 async def resume_strategy(
     strategy_name: str,
@@ -683,10 +976,7 @@ async def resume_strategy(
 
     # Extra guard: don't resume if global kill switch is active
     today  = date.today().isoformat()
-    killed = (await db.execute(
-        text("SELECT is_killed FROM trading_sessions WHERE date=:d"),
-        {"d": today}
-    )).scalar()
+    killed = (await db.execute(_SQL_KILLED, {"d": today})).scalar()
     if killed:
         raise HTTPException(
             status_code=409,
@@ -748,6 +1038,9 @@ async def stop_strategy(
         raise HTTPException(status_code=409, detail={"code": e.code, "message": e.message})
 
 
+_SQL_RUNNING = text("SELECT strategy_name FROM strategy_states WHERE status='running'")
+
+
 @router.post("/strategies/pause-all")
 async def pause_all_strategies(
     request: Request,
@@ -756,27 +1049,21 @@ async def pause_all_strategies(
 ):
     """
     Pause all running strategies.
-    Sends intents in parallel, collects results.
+    Writes every intent in one transaction; acks are not awaited.
     Used by Shift+P keyboard shortcut and kill switch companion action.
     """
     actor = token.get("sub", "unknown")
     ip    = request.client.host if request.client else None
 
-    running = (await db.execute(
-        text("SELECT strategy_name FROM strategy_states WHERE status='running'")
-    )).fetchall()
+    running = (await db.execute(_SQL_RUNNING)).fetchall()
 
     if not running:
         return {"success": True, "affected": 0, "message": "No running strategies to pause."}
 
-    # Send all intents in parallel, don't wait for individual acks
-    results = await asyncio.gather(*[
-        _ctrl_svc.send_intent(db, r.strategy_name, "pause", actor, ip, wait_for_ack=False)
-        for r in running
-    ], return_exceptions=True)
-
-    succeeded = sum(1 for r in results if isinstance(r, dict) and r.get("success"))
-    failed    = len(results) - succeeded
+    succeeded = await _ctrl_svc.send_intent_bulk(
+        db, [r.strategy_name for r in running], "pause", actor, ip
+    )
+    failed    = len(running) - succeeded
 
     logger.warning(f"Pause-all: {succeeded} intents sent, {failed} failed. Actor: {actor}")
     return {
@@ -787,25 +1074,25 @@ async def pause_all_strategies(
     }
 
 
+_SQL_CONTROL_LOG = text(
+    "SELECT strategy_name, action, actor, ip_address, from_status, "
+    "acked_at, ack_latency_ms, created_at "
+    "FROM strategy_control_log "
+    "ORDER BY created_at DESC LIMIT :limit"
+)
+
+
 @router.get("/control-log")
 async def get_control_log(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     token: dict = Depends(verify_token),
     limit: int = 50,
 ):
     """Recent strategy control actions. For ops audit view."""
-    rows = (await db.execute(
-        text(
-            "SELECT strategy_name, action, actor, ip_address, from_status, "
-            "acked_at, ack_latency_ms, created_at "
-            "FROM strategy_control_log "
-            "ORDER BY created_at DESC LIMIT :limit"
-        ),
-        {"limit": limit}
-    )).fetchall()
+    rows = (await db.execute(_SQL_CONTROL_LOG, {"limit": limit})).fetchall()
 
     return {
-        "ts":  datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+        "ts":  datetime.now(timezone.utc).replace(tzinfo=None),
         "log": [
             {
                 "strategy":       r.strategy_name,
@@ -815,93 +1102,90 @@ async def get_control_log(
                 "from_status":    r.from_status,
                 "acked":          r.acked_at is not None,
                 "ack_latency_ms": r.ack_latency_ms,
-                "time":           r.created_at.isoformat(),
+                "time":           r.created_at,
             }
             for r in rows
         ]
     }
+
+
+# Like /strategies: rows come back keyed and formatted as the UI expects.
+_SQL_ORDERS = {
+    dialect: text(
+        f"SELECT o.id, {fmt.format(c='o.created_at')} AS time, o.status AS event, "
+        "o.symbol AS sym, COALESCE(s.strategy_name, 'Unknown') AS strat, o.side, "
+        "o.quantity AS qty, COALESCE(o.avg_fill_price, 0.0) AS price, "
+        "LOWER(CAST(o.status AS TEXT)) AS status, a.reject_reason AS reason "
+        "FROM orders o "
+        "LEFT JOIN orders_audit a ON a.order_id = o.id "
+        "LEFT JOIN strategy_states s ON o.symbol = s.symbol "
+        "ORDER BY o.created_at DESC LIMIT :limit"
+    )
+    for dialect, fmt in _HHMMSS.items()
+}
+
+
 @router.get("/orders")
 async def get_orders(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     token: dict = Depends(verify_token),
     limit: int = 50,
 ):
     """Recent order events. Poll every 5s."""
-    rows = (await db.execute(
-        text(
-            "SELECT o.id, o.created_at, o.status, o.symbol, o.side, o.quantity, "
-            "o.avg_fill_price, o.reject_reason, o.broker_order_id, s.strategy_name "
-            "FROM orders o "
-            "LEFT JOIN strategy_states s ON o.symbol = s.symbol "
-            "ORDER BY o.created_at DESC LIMIT :limit"
-        ),
-        {"limit": limit}
-    )).fetchall()
+    sql = _SQL_ORDERS.get(db.bind.dialect.name, _SQL_ORDERS["postgresql"])
+    rows = (await db.execute(sql, {"limit": limit})).mappings().all()
 
     return {
-        "ts": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
-        "orders": [
-            {
-                "id":     r.id,
-                "time":   _parse_ts(r.created_at).strftime("%H:%M:%S") if _parse_ts(r.created_at) else str(r.created_at),
-                "event":  r.status,
-                "sym":    r.symbol,
-                "strat":  r.strategy_name or "Unknown",
-                "side":   r.side,
-                "qty":    r.quantity,
-                "price":  r.avg_fill_price or 0.0,
-                "status": r.status.lower(),
-                "reason": r.reject_reason,
-            }
-            for r in rows
-        ]
+        "ts": datetime.now(timezone.utc).replace(tzinfo=None),
+        "orders": rows,
     }
 
 
+# Each side is limited before the UNION so both are a backward walk of their
+# created_at index (idx_audit_time / idx_scl_time_covering) that stops after
+# :limit rows; only 2 x :limit rows reach the final sort. Subqueries rather
+# than parenthesised SELECTs so SQLite accepts it too.
+# The message is pulled out of the JSON payload in the DB, so rows come back
+# in the response shape like /orders.
+_LOG_MESSAGE = {
+    "postgresql": "payload->>'message'",
+    "sqlite":     "CASE WHEN json_valid(payload) THEN json_extract(payload, '$.message') END",
+}
+_SQL_LOGS = {
+    dialect: text(
+        "SELECT ROW_NUMBER() OVER (ORDER BY created_at DESC) - 1 AS id, "
+        f"{_HHMMSS[dialect].format(c='created_at')} AS time, level, msg, module "
+        "FROM ("
+        "  SELECT * FROM ("
+        f"    SELECT created_at, event_type AS level, COALESCE({msg}, 'No message') AS msg, "
+        "           COALESCE(entity_type, 'system') AS module "
+        "    FROM audit_logs ORDER BY created_at DESC LIMIT :limit"
+        "  ) AS a "
+        "  UNION ALL "
+        "  SELECT * FROM ("
+        "    SELECT created_at, 'CONTROL' AS level, 'Strategy Control Event' AS msg, "
+        "           'control_svc' AS module "
+        "    FROM strategy_control_log ORDER BY created_at DESC LIMIT :limit"
+        "  ) AS c"
+        ") AS u "
+        "ORDER BY created_at DESC LIMIT :limit"
+    )
+    for dialect, msg in _LOG_MESSAGE.items()
+}
+
+
 @router.get("/logs")
 async def get_logs(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     token: dict = Depends(verify_token),
     limit: int = 100,
 ):
     """Combined system logs. Poll every 10s."""
     # This combines audit logs and control logs for a 'System Logs' view
-    rows = (await db.execute(
-        text(
-            "SELECT created_at, event_type as level, payload, entity_type as module "
-            "FROM audit_logs "
-            "UNION ALL "
-            "SELECT created_at, 'CONTROL' as level, NULL as payload, 'control_svc' as module "
-            "FROM strategy_control_log "
-            "ORDER BY created_at DESC LIMIT :limit"
-        ),
-        {"limit": limit}
-    )).fetchall()
-
-    logs = []
-    for i, r in enumerate(rows):
-        msg = "No message"
-        if r.payload:
-            # Handle both dict (Postgres) and string (SQLite)
-            p = r.payload
-            if isinstance(p, str): 
-                try: p = json.loads(p)
-                except: p = {}
-            msg = p.get("message", "No message")
-        elif r.level == 'CONTROL':
-            # For control logs, we might need a separate query or just a placeholder
-            # Since we lost the info in the UNION, let's keep it simple for now
-            msg = "Strategy Control Event"
-
-        logs.append({
-            "id":     i,
-            "time":   _parse_ts(r.created_at).strftime("%H:%M:%S") if _parse_ts(r.created_at) else str(r.created_at),
-            "level":  r.level,
-            "msg":    msg,
-            "module": r.module or "system",
-        })
+    sql  = _SQL_LOGS.get(db.bind.dialect.name, _SQL_LOGS["postgresql"])
+    rows = (await db.execute(sql, {"limit": limit})).mappings().all()
 
     return {
-        "ts": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
-        "logs": logs
+        "ts": datetime.now(timezone.utc).replace(tzinfo=None),
+        "logs": rows,
     }
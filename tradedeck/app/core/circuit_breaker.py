@@ -25,15 +25,21 @@ Usage:
             raise BrokerError("CIRCUIT_OPEN", "Order service temporarily unavailable")
         result = await broker.place_order(...)
 """
+import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
+from functools import cache
 from typing import AsyncIterator, Optional
 
-from sqlalchemy import text, update, select
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import case, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.database import async_session
+from app.core.observability import update_circuit_breaker
 from app.models.db import CircuitBreakerState
 
 logger = logging.getLogger(__name__)
@@ -43,6 +49,63 @@ DEFAULT_FAILURE_THRESHOLD = 5      # Trips OPEN after 5 consecutive failures
 DEFAULT_COOLDOWN_SECONDS  = 60     # Stay OPEN for 60 seconds
 DEFAULT_SUCCESS_THRESHOLD = 2      # HALF_OPEN → CLOSED after 2 successes
 
+# Snapshot of BrokerCircuitBreakers.all_statuses() for health probes.
+# Transitions in this process bump "gen" → next read refreshes immediately.
+STATUS_CACHE_TTL_S = 3.0
+_status_cache: dict = {"ts": 0.0, "gen": 0, "data": []}
+_status_lock = asyncio.Lock()
+
+
+# In-process mirror: service → state, written whenever this process reads or
+# transitions a breaker. Readiness reads it with zero I/O. Another worker's
+# transitions only arrive through a DB read → resynced at most STATE_SYNC_S old.
+STATE_SYNC_S = 30.0
+_state_snapshot: dict[str, str] = {}
+_snapshot_sync: dict = {"ts": 0.0}
+
+
+# Hot-path state: call() reads the breaker from this process-local snapshot
+# and only goes to the DB once it is CB_CACHE_TTL_S old. Failures are one
+# atomic UPDATE that increments and decides the trip in SQL (see
+# _record_failure); other transitions are a compare-and-set on the previous
+# state, written in the caller's transaction; success-side counter changes
+# are kept as deltas and applied by a background flush that never touches
+# state/opened_at/next_attempt_at.
+CB_CACHE_TTL_S   = 1.0
+CB_FLUSH_DELAY_S = 0.5
+
+
+class _CBSnapshot:
+    """Detached copy of a circuit_breaker_states row."""
+
+    def __init__(self, row: CircuitBreakerState):
+        self.state           = row.state
+        self.failure_count   = row.failure_count or 0
+        self.success_count   = row.success_count or 0
+        self.last_failure_at = row.last_failure_at
+        self.opened_at       = row.opened_at
+        self.next_attempt_at = row.next_attempt_at
+        self.loaded_at       = time.monotonic()
+        # Counter changes not yet in the DB, relative to the row as it was
+        # in `state`; dropped if the row has left that state by flush time
+        self.failure_delta   = 0
+        self.success_delta   = 0
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.failure_delta or self.success_delta)
+
+
+_cb_cache: dict[str, _CBSnapshot] = {}
+
+# Dialect-specific INSERT … ON CONFLICT for _get_or_create_state
+_UPSERT = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def invalidate_status_cache() -> None:
+    _status_cache["ts"]  = 0.0
+    _status_cache["gen"] += 1
+
 
 class CircuitBreakerOpen(Exception):
     """Raised when a call is attempted while circuit is OPEN."""
@@ -65,54 +128,158 @@ class CircuitBreaker:
         self.failure_threshold = failure_threshold
         self.cooldown_seconds  = cooldown_seconds
         self.success_threshold = success_threshold
+        self._flush_task: Optional[asyncio.Task] = None
 
-    async def _get_or_create_state(self, db: AsyncSession) -> CircuitBreakerState:
-        try:
-            result = await db.execute(
-                text("SELECT id FROM circuit_breaker_states WHERE service_name = :name"),
-                {"name": self.service_name}
-            )
-            row = result.fetchone()
-            if row:
-                state = await db.get(CircuitBreakerState, row.id)
-                if state:
-                    return state
-        except Exception as e:
-            logger.error(f"CircuitBreaker DB error for {self.service_name}: {e}")
+    def _mirror(self, state) -> None:
+        _state_snapshot[self.service_name] = state.state
+        update_circuit_breaker(self.service_name, state.state)
 
-        # Create initial CLOSED state if not found
-        state = CircuitBreakerState(
+    async def _get_or_create_state(self, db: AsyncSession) -> CircuitBreakerState:
+        """
+        One round trip: INSERT the CLOSED default, or on conflict with
+        uq_cb_service touch the existing row so RETURNING hands it back.
+        """
+        insert = _UPSERT.get(db.bind.dialect.name, pg_insert)
+        stmt = insert(CircuitBreakerState).values(
             service_name=self.service_name,
             state="CLOSED",
             failure_count=0,
-            success_count=0
+            success_count=0,
         )
-        db.add(state)
-        try:
-            await db.flush()
-            return state
-        except IntegrityError:
-            await db.rollback()
-            # Fetch it again since a concurrent worker created it
-            result = await db.execute(
-                text("SELECT id FROM circuit_breaker_states WHERE service_name = :name"),
-                {"name": self.service_name}
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["service_name"],
+            set_={"service_name": stmt.excluded.service_name},
+        ).returning(CircuitBreakerState)
+        return (await db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        )).one()
+
+    async def _snapshot(self, db: AsyncSession) -> _CBSnapshot:
+        """Cached state; re-read from the DB once stale unless unflushed changes are held."""
+        snap = _cb_cache.get(self.service_name)
+        if snap and (snap.dirty or time.monotonic() - snap.loaded_at < CB_CACHE_TTL_S):
+            return snap
+        snap = _CBSnapshot(await self._get_or_create_state(db))
+        _cb_cache[self.service_name] = snap
+        return snap
+
+    async def _record_failure(self, db: AsyncSession, snap: _CBSnapshot, now: datetime) -> _CBSnapshot:
+        """
+        failure_count + 1 and the trip decision in one statement, against the
+        row as it is now: two workers failing concurrently both count, and
+        whichever crosses the threshold opens the breaker. RETURNING refreshes
+        the snapshot, so no read precedes or follows the write.
+        """
+        cb = CircuitBreakerState
+        if snap.dirty:
+            # Pending success-side deltas (e.g. a reset to 0) go first
+            await self._apply_deltas(db, snap, now)
+        trips = (cb.state == "HALF_OPEN") | (
+            (cb.state == "CLOSED") & (cb.failure_count + 1 >= self.failure_threshold)
+        )
+        row = (await db.execute(
+            update(cb)
+            .where(cb.service_name == self.service_name)
+            .values(
+                failure_count=cb.failure_count + 1,
+                last_failure_at=now,
+                state=case((trips, "OPEN"), else_=cb.state),
+                opened_at=case((trips, now), else_=cb.opened_at),
+                next_attempt_at=case(
+                    (trips, now + timedelta(seconds=self.cooldown_seconds)),
+                    else_=cb.next_attempt_at,
+                ),
+                success_count=case((trips, 0), else_=cb.success_count),
+                updated_at=now,
+            )
+            .returning(
+                cb.state, cb.failure_count, cb.success_count,
+                cb.last_failure_at, cb.opened_at, cb.next_attempt_at,
+            )
+            .execution_options(synchronize_session=False)
+        )).one()
+        fresh = _CBSnapshot(row)
+        _cb_cache[self.service_name] = fresh
+        return fresh
+
+    async def _transition(
+        self, db: AsyncSession, snap: _CBSnapshot, from_state: str, now: datetime
+    ) -> bool:
+        """
+        Write snap's state only if the row is still in from_state. False →
+        another worker moved the breaker first; its write stands and the
+        snapshot is dropped so the next call re-reads the row.
+        """
+        cb = CircuitBreakerState
+        result = await db.execute(
+            update(cb)
+            .where(cb.service_name == self.service_name, cb.state == from_state)
+            .values(
+                state=snap.state,
+                failure_count=snap.failure_count,
+                success_count=snap.success_count,
+                opened_at=snap.opened_at,
+                next_attempt_at=snap.next_attempt_at,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        snap.failure_delta = snap.success_delta = 0
+        if result.rowcount == 0:
+            _cb_cache.pop(self.service_name, None)
+            return False
+        return True
+
+    async def _apply_deltas(self, db: AsyncSession, snap: _CBSnapshot, now: datetime) -> None:
+        """
+        Add the snapshot's pending counter deltas to the row, only while it is
+        still in the state they were counted in. Relative, so increments from
+        other workers are kept; state/opened_at/next_attempt_at are left to
+        _record_failure and _transition.
+        """
+        cb = CircuitBreakerState
+        df, ds = snap.failure_delta, snap.success_delta
+        await db.execute(
+            update(cb)
+            .where(cb.service_name == self.service_name, cb.state == snap.state)
+            .values(
+                failure_count=case(
+                    (cb.failure_count + df < 0, 0), else_=cb.failure_count + df
+                ),
+                success_count=cb.success_count + ds,
+                updated_at=now,
             )
-            row = result.fetchone()
-            if row:
-                fetched = await db.get(CircuitBreakerState, row.id)
-                if fetched:
-                    return fetched
-                    
-            # Fallback to a detached object to avoid NoneType errors
-            # if the concurrent transaction hasn't committed yet
-            return CircuitBreakerState(
-                service_name=self.service_name,
-                state="CLOSED",
-                failure_count=0,
-                success_count=0
+            .execution_options(synchronize_session=False)
+        )
+        # Subtract rather than zero: changes made while the UPDATE was in flight stay pending
+        snap.failure_delta -= df
+        snap.success_delta -= ds
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(
+                self._flush_counters(), name=f"cb_flush:{self.service_name}"
             )
 
+    async def _flush_counters(self) -> None:
+        # Late start → every counter change in the window goes out in one UPDATE
+        await asyncio.sleep(CB_FLUSH_DELAY_S)
+        snap = _cb_cache.get(self.service_name)
+        if not snap or not snap.dirty:
+            return
+        df, ds = snap.failure_delta, snap.success_delta
+        try:
+            async with async_session() as db:
+                await self._apply_deltas(db, snap, datetime.now(timezone.utc).replace(tzinfo=None))
+                await db.commit()
+        except Exception as e:
+            # Not committed → put the deltas back for the next attempt
+            snap.failure_delta += df
+            snap.success_delta += ds
+            logger.warning(f"Circuit {self.service_name}: counter flush failed: {e}")
+        if snap.dirty and _cb_cache.get(self.service_name) is snap:
+            self._schedule_flush()
+
     @asynccontextmanager
     async def call(self, db: AsyncSession) -> AsyncIterator[bool]:
         """
@@ -125,7 +292,8 @@ class CircuitBreaker:
             result = await broker.something()
         # report success/failure automatically
         """
-        state = await self._get_or_create_state(db)
+        state = await self._snapshot(db)
+        self._mirror(state)
         now = datetime.now(timezone.utc).replace(tzinfo=None)
         allowed = False
         success = False
@@ -142,7 +310,9 @@ class CircuitBreaker:
                     logger.info(f"Circuit {self.service_name}: OPEN → HALF_OPEN (cooldown expired)")
                     state.state = "HALF_OPEN"
                     state.success_count = 0
-                    await db.flush()
+                    await self._transition(db, state, "OPEN", now)
+                    self._mirror(state)
+                    invalidate_status_cache()
                     allowed = True
                     yield True
                     success = True
@@ -166,53 +336,67 @@ class CircuitBreaker:
     async def _record_outcome(
         self,
         db: AsyncSession,
-        state: CircuitBreakerState,
+        state: _CBSnapshot,
         success: bool,
         now: datetime,
     ) -> None:
-        if success:
-            if state.state == "HALF_OPEN":
-                state.success_count = (state.success_count or 0) + 1
-                if state.success_count >= self.success_threshold:
-                    # Recovered
-                    logger.info(f"Circuit {self.service_name}: HALF_OPEN → CLOSED (recovered)")
-                    state.state = "CLOSED"
-                    state.failure_count = 0
-                    state.success_count = 0
-                    state.opened_at = None
-                    state.next_attempt_at = None
-            elif state.state == "CLOSED":
-                # Reset failure count on success
-                if (state.failure_count or 0) > 0:
-                    state.failure_count = 0
-        else:
-            state.failure_count = (state.failure_count or 0) + 1
-            state.last_failure_at = now
-
-            if state.state == "HALF_OPEN":
-                # Probe failed — reopen
-                logger.warning(f"Circuit {self.service_name}: HALF_OPEN → OPEN (probe failed)")
-                state.state = "OPEN"
-                state.opened_at = now
-                state.next_attempt_at = now + timedelta(seconds=self.cooldown_seconds)
-                state.success_count = 0
+        prev_state = state.state
+        if not success:
+            state = await self._record_failure(db, state, now)
+            if state.state != prev_state:
+                if prev_state == "HALF_OPEN":
+                    logger.warning(f"Circuit {self.service_name}: HALF_OPEN → OPEN (probe failed)")
+                else:
+                    logger.error(
+                        f"Circuit {self.service_name}: {prev_state} → {state.state} "
+                        f"({state.failure_count} failures >= threshold {self.failure_threshold})"
+                    )
+                self._mirror(state)
+                invalidate_status_cache()
+            return
 
-            elif state.state == "CLOSED" and state.failure_count >= self.failure_threshold:
-                # Trip the breaker
-                logger.error(
-                    f"Circuit {self.service_name}: CLOSED → OPEN "
-                    f"({state.failure_count} failures >= threshold {self.failure_threshold})"
-                )
-                state.state = "OPEN"
-                state.opened_at = now
-                state.next_attempt_at = now + timedelta(seconds=self.cooldown_seconds)
+        prev_counts = (state.failure_count, state.success_count)
+        if state.state == "HALF_OPEN":
+            state.success_count = (state.success_count or 0) + 1
+            if state.success_count >= self.success_threshold:
+                # Recovered
+                logger.info(f"Circuit {self.service_name}: HALF_OPEN → CLOSED (recovered)")
+                state.state = "CLOSED"
+                state.failure_count = 0
+                state.success_count = 0
+                state.opened_at = None
+                state.next_attempt_at = None
+        elif state.state == "CLOSED":
+            # Reset failure count on success
+            if (state.failure_count or 0) > 0:
+                state.failure_count = 0
 
-        state.updated_at = now
-        await db.flush()
+        if state.state != prev_state:
+            # Transitions must survive a restart → written in the caller's transaction
+            if await self._transition(db, state, prev_state, now):
+                self._mirror(state)
+            invalidate_status_cache()
+        elif (state.failure_count, state.success_count) != prev_counts:
+            state.failure_delta += state.failure_count - prev_counts[0]
+            state.success_delta += state.success_count - prev_counts[1]
+            self._schedule_flush()
 
     async def get_status(self, db: AsyncSession) -> dict:
         """Return current circuit breaker status for health endpoint."""
-        state = await self._get_or_create_state(db)
+        return self.status_from_row(await self._get_or_create_state(db))
+
+    def status_from_row(self, state) -> dict:
+        """
+        Status dict from a circuit_breaker_states row (or snapshot); None → a
+        breaker that has never been used, i.e. CLOSED with no failures.
+        """
+        if state is None:
+            _state_snapshot[self.service_name] = "CLOSED"
+            return {
+                "service": self.service_name, "state": "CLOSED", "failure_count": 0,
+                "last_failure_at": None, "since_utc": None, "next_attempt_at": None,
+            }
+        self._mirror(state)
         return {
             "service":        self.service_name,
             "state":          state.state,
@@ -228,38 +412,99 @@ class CircuitBreaker:
 # ─────────────────────────────────────────────────────────────
 
 class BrokerCircuitBreakers:
-    """Registry of circuit breakers for each Fyers API endpoint group."""
-
-    orders = CircuitBreaker(
-        service_name="fyers_orders",
-        failure_threshold=3,    # Trip faster for order placement
-        cooldown_seconds=30,    # 30s cooldown for orders (market moves fast)
-        success_threshold=2,
-    )
-    quotes = CircuitBreaker(
-        service_name="fyers_quotes",
-        failure_threshold=5,
-        cooldown_seconds=60,
-        success_threshold=3,
-    )
-    funds = CircuitBreaker(
-        service_name="fyers_funds",
-        failure_threshold=5,
-        cooldown_seconds=60,
-        success_threshold=2,
-    )
-    websocket = CircuitBreaker(
-        service_name="fyers_websocket",
-        failure_threshold=3,
-        cooldown_seconds=120,
-        success_threshold=1,
-    )
+    """
+    Registry of circuit breakers for each Fyers API endpoint group.
+    Each breaker is built on first use and then reused (process singleton).
+    """
+
+    @classmethod
+    @cache
+    def orders(cls) -> CircuitBreaker:
+        return CircuitBreaker(
+            service_name="fyers_orders",
+            failure_threshold=3,    # Trip faster for order placement
+            cooldown_seconds=30,    # 30s cooldown for orders (market moves fast)
+            success_threshold=2,
+        )
+
+    @classmethod
+    @cache
+    def quotes(cls) -> CircuitBreaker:
+        return CircuitBreaker(
+            service_name="fyers_quotes",
+            failure_threshold=5,
+            cooldown_seconds=60,
+            success_threshold=3,
+        )
+
+    @classmethod
+    @cache
+    def funds(cls) -> CircuitBreaker:
+        return CircuitBreaker(
+            service_name="fyers_funds",
+            failure_threshold=5,
+            cooldown_seconds=60,
+            success_threshold=2,
+        )
+
+    @classmethod
+    @cache
+    def websocket(cls) -> CircuitBreaker:
+        return CircuitBreaker(
+            service_name="fyers_websocket",
+            failure_threshold=3,
+            cooldown_seconds=120,
+            success_threshold=1,
+        )
+
+    @classmethod
+    def all(cls) -> tuple[CircuitBreaker, ...]:
+        return (cls.orders(), cls.quotes(), cls.funds(), cls.websocket())
 
     @classmethod
     async def all_statuses(cls, db: AsyncSession) -> list:
-        return [
-            await cls.orders.get_status(db),
-            await cls.quotes.get_status(db),
-            await cls.funds.get_status(db),
-            await cls.websocket.get_status(db),
-        ]
+        """Every breaker's status from one SELECT … WHERE service_name IN (…)."""
+        breakers = cls.all()
+        rows = (await db.scalars(
+            select(CircuitBreakerState).where(
+                CircuitBreakerState.service_name.in_([cb.service_name for cb in breakers])
+            )
+        )).all()
+        by_name = {row.service_name: row for row in rows}
+        for cb in breakers:
+            # Counter changes not flushed yet are newer than the row
+            snap = _cb_cache.get(cb.service_name)
+            if snap and snap.dirty:
+                by_name[cb.service_name] = snap
+        return [cb.status_from_row(by_name.get(cb.service_name)) for cb in breakers]
+
+    @classmethod
+    async def cached_statuses(cls, session_factory: async_sessionmaker) -> list:
+        """
+        all_statuses() served from a STATUS_CACHE_TTL_S snapshot.
+        Breaker state changes far less often than probes poll; one caller
+        refreshes on expiry (single-flight), the rest reuse its result.
+        """
+        if time.monotonic() - _status_cache["ts"] < STATUS_CACHE_TTL_S:
+            return _status_cache["data"]
+        async with _status_lock:
+            if time.monotonic() - _status_cache["ts"] < STATUS_CACHE_TTL_S:
+                return _status_cache["data"]
+            gen = _status_cache["gen"]
+            async with session_factory() as db:
+                data = await cls.all_statuses(db)
+            _snapshot_sync["ts"] = time.monotonic()   # all_statuses() refreshed the mirror
+            # A transition during the refresh invalidated this snapshot — don't cache it
+            if _status_cache["gen"] == gen:
+                _status_cache.update(ts=time.monotonic(), data=data)
+            return data
+
+    @classmethod
+    def snapshot(cls) -> dict[str, str]:
+        """service → state as last seen by this process. No I/O."""
+        return _state_snapshot
+
+    @classmethod
+    def snapshot_stale(cls) -> bool:
+        """True when the mirror is due a DB resync (see STATE_SYNC_S)."""
+        return time.monotonic() - _snapshot_sync["ts"] > STATE_SYNC_S
@@ -1,6 +1,7 @@
 import os
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 from datetime import timezone
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -26,6 +27,15 @@ class Settings(BaseSettings):
     DB_HOST: str = "localhost"
     DB_PORT: int = 5432
     DB_NAME: str = "tradedeck"
+    # Async Postgres driver: "asyncpg" (default, binary protocol) or "psycopg" (psycopg3 fallback)
+    DB_DRIVER: Literal["asyncpg", "psycopg"] = "asyncpg"
+    # Alembic at startup: "off" (run out-of-band) | "sync" (block startup) | "async" (background task)
+    MIGRATION_MODE: str = "off"
+    # Connection pool (core/database.py)
+    DB_POOL_SIZE: int = 20          # Persistent connections, pre-warmed at startup
+    DB_MAX_OVERFLOW: int = 10       # Temporary connections beyond the pool under bursts
+    DB_POOL_TIMEOUT_S: int = 5      # Fail fast instead of queueing order placement for 30s
+    DB_POOL_RECYCLE_S: int = 1800   # Replace connections before server-side idle timeouts
 
     # ── API Keys & Secrets ───────────────────────────────────────────────────
     FYERS_APP_ID: Optional[str] = None
@@ -46,15 +56,15 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: Optional[str] = None
 
     # ── Computed Properties ──────────────────────────────────────────────────
-    @property
+    @cached_property
     def ASYNC_DATABASE_URL(self) -> str:
-        """Derive the async SQLAlchemy URL."""
+        """Derive the async SQLAlchemy URL (once per Settings instance)."""
         # 1. Use DATABASE_URL if explicitly provided
         if self.DATABASE_URL:
             url = self.DATABASE_URL
         # 2. Try to construct Postgres URL if DB_PASSWORD is provided
         elif self.DB_PASSWORD:
-            url = f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+            url = f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         # 3. Final fallback to SQLite
         else:
             # On AWS/Render/Docker, we often need a writable path like /tmp for ephemeral SQLite
@@ -66,10 +76,11 @@ class Settings(BaseSettings):
                 url = "sqlite+aiosqlite:///tradedeck_local.db"
         
         # Cloud compatibility: Handle 'postgres://' (common in Render/Heroku)
+        # and pin the async driver selected by DB_DRIVER.
         if url.startswith("postgres://"):
-            url = url.replace("postgres://", "postgresql+asyncpg://", 1)
-        elif url.startswith("postgresql://") and "+asyncpg" not in url:
-            url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+            url = url.replace("postgres://", f"postgresql+{self.DB_DRIVER}://", 1)
+        elif url.startswith("postgresql://"):
+            url = url.replace("postgresql://", f"postgresql+{self.DB_DRIVER}://", 1)
             
         return url
 
@@ -1,26 +1,75 @@
 """
 Database Configuration — Async SQLAlchemy engine and session management.
 """
-from typing import AsyncGenerator
+import asyncio
+import logging
+import time
+from typing import AsyncGenerator, Optional
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.observability import record_pool_checkout, set_pool_checked_out
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = settings.DB_POOL_SIZE
+
+DB_HEARTBEAT_S = 60     # Background SELECT 1 cadence per idle connection (see db_heartbeat_loop)
+
+# SQLite fallback: one writer at a time anyway; a few readers alongside (WAL)
+SQLITE_POOL_SIZE = 10
 
 connect_args = {}
+# Async engines require the asyncio-adapted pool, not the sync QueuePool
+pool_args = {"poolclass": AsyncAdaptedQueuePool}
 if settings.ASYNC_DATABASE_URL.startswith("sqlite"):
     connect_args["timeout"] = 15
+    # Pooled connections keep the file (and its WAL -shm mapping) open for the
+    # process lifetime instead of re-opening it per session; no overflow,
+    # since overflow connections are closed on check-in
+    pool_args.update(pool_size=SQLITE_POOL_SIZE, max_overflow=0, pool_recycle=-1)
+else:
+    pool_args.update(
+        pool_size=POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE_S,
+    )
+    if "+asyncpg" in settings.ASYNC_DATABASE_URL:
+        # Short OLTP queries never benefit from JIT; it only adds planning latency
+        # application_name tags our sessions in pg_stat_activity
+        connect_args["server_settings"] = {"jit": "off", "application_name": "tradedeck"}
+        # Polled endpoints reuse a fixed set of module-level text() statements;
+        # keep all of them prepared per connection (defaults are 100)
+        connect_args["prepared_statement_cache_size"] = 512
+        connect_args["statement_cache_size"] = 512
 
 # Global Engine
 engine = create_async_engine(
     settings.ASYNC_DATABASE_URL,
     echo=False,
-    pool_size=20,           # Increase from default 5
-    max_overflow=10,        # Allow 10 extra temporary connections
-    pool_timeout=30,        # Wait up to 30s for a connection
-    pool_pre_ping=True,
-    connect_args=connect_args
+    pool_timeout=settings.DB_POOL_TIMEOUT_S,
+    # No SELECT 1 on every checkout: db_heartbeat_loop probes idle connections
+    # in the background and pool_recycle retires old ones
+    pool_pre_ping=False,
+    connect_args=connect_args,
+    **pool_args,
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, record) -> None:
+        # WAL lets the feed, reconciler and executor read while one of them
+        # writes; NORMAL is durable in WAL up to the last checkpoint.
+        # Lock waits are already bounded by connect_args["timeout"].
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-20000")   # ~20 MB page cache per connection
+        cursor.close()
+
 # Session Factory
 async_session = async_sessionmaker(
     engine,
@@ -41,3 +90,113 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+def get_session_factory() -> async_sessionmaker:
+    """
+    Dependency for routes that fan out independent queries concurrently.
+    An AsyncSession cannot run two queries at once — each task opens its own.
+    """
+    return async_session
+
+
+# Read paths: same pool, AUTOCOMMIT → no BEGIN before the first statement and
+# no COMMIT/ROLLBACK after the last. Each statement sees its own snapshot.
+readonly_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+readonly_session = async_sessionmaker(
+    readonly_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
+async def get_db_readonly() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for GET routes that only read; never commits."""
+    async with readonly_session() as session:
+        yield session
+
+
+def get_readonly_session_factory() -> async_sessionmaker:
+    """get_session_factory() for read-only fan-out (see readonly_session)."""
+    return readonly_session
+
+
+async def warm_pool(connections: int = POOL_SIZE) -> None:
+    """
+    Open `connections` pooled connections up front.
+
+    SQLAlchemy has no pool min_size: connections are opened lazily on first
+    checkout, so the first burst of requests after boot pays TCP + auth +
+    asyncpg type introspection each. Checking out N connections at once
+    forces the pool to create and then retain them.
+    """
+    await asyncio.gather(*(_select_one() for _ in range(connections)), return_exceptions=True)
+
+
+async def _select_one() -> None:
+    async with engine.connect() as conn:
+        await conn.scalar(text("SELECT 1"))
+
+
+# monotonic time of the last successful heartbeat, last error (None when healthy)
+_heartbeat: dict = {"last_ok": None, "error": None}
+
+
+def get_db_heartbeat() -> dict:
+    return dict(_heartbeat)
+
+
+async def db_heartbeat_loop(interval: float = DB_HEARTBEAT_S) -> None:
+    """
+    SELECT 1 on every idle pooled connection per interval, off the request path.
+
+    Replaces pool_pre_ping: checking out all idle connections at once touches
+    each of them, and one that fails the probe is invalidated by the pool
+    before a request can draw it. Readiness probes consult the timestamp
+    instead of querying themselves.
+    """
+    while True:
+        pool = engine.pool
+        idle = pool.checkedin() if hasattr(pool, "checkedin") else 0
+        results = await asyncio.gather(
+            *(_select_one() for _ in range(max(idle, 1))), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if len(errors) < len(results):
+            _heartbeat["last_ok"] = time.monotonic()
+        _heartbeat["error"] = str(errors[-1]) if errors else None
+        if errors:
+            logger.warning(f"[DB] ⚠️ Heartbeat failed on {len(errors)}/{len(results)} connections: {errors[-1]}")
+        await asyncio.sleep(interval)
+
+
+# Checked-out count kept by pool events, so /infra, readiness and /metrics
+# read a plain int instead of asking the pool on every poll.
+_pool_stats = {"checked_out": 0}
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_pool_checkout(dbapi_conn, record, proxy) -> None:
+    _pool_stats["checked_out"] += 1
+    set_pool_checked_out(_pool_stats["checked_out"])
+    record_pool_checkout()
+
+
+@event.listens_for(engine.sync_engine, "checkin")
+def _on_pool_checkin(dbapi_conn, record) -> None:
+    _pool_stats["checked_out"] = max(_pool_stats["checked_out"] - 1, 0)
+    set_pool_checked_out(_pool_stats["checked_out"])
+
+
+def pool_checked_out() -> int:
+    return _pool_stats["checked_out"]
+
+
+def pool_free_connections() -> Optional[int]:
+    """Idle pooled connections (size - checked out); None if the pool has no fixed size."""
+    pool = engine.pool
+    if not hasattr(pool, "size"):
+        return None
+    return max(pool.size() - _pool_stats["checked_out"], 0)
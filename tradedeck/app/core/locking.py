@@ -23,6 +23,7 @@ import asyncio
 import hashlib
 import logging
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import AsyncIterator, Optional
 
 from sqlalchemy import text
@@ -35,6 +36,9 @@ logger = logging.getLogger(__name__)
 _ADVISORY_LOCK_NAMESPACE = 0x5452414445434B  # "TRADECK" in hex
 
 
+# One session per trading day → the same few keys are hashed on every order.
+# Memoized so SHA-256 runs once per session / (session, symbol) per process.
+@lru_cache(maxsize=4096)
 def _session_to_lock_key(session_id: str) -> int:
     """
     Convert a UUID session_id to a stable int64 for pg_advisory_lock.
@@ -46,6 +50,32 @@ def _session_to_lock_key(session_id: str) -> int:
     return raw
 
 
+@lru_cache(maxsize=4096)
+def _pair_to_lock_key(session_id: str, symbol: str) -> int:
+    return _session_to_lock_key(f"{session_id}:{symbol}")
+
+
+_SQL_TRY_XACT_LOCK = text("SELECT pg_try_advisory_xact_lock(:key)")
+
+
+async def _try_xact_lock(db: AsyncSession, lock_key: int) -> bool:
+    """
+    pg_try_advisory_xact_lock(lock_key) in the session's transaction.
+
+    On asyncpg, fetchval() on the driver connection skips SQLAlchemy's
+    compile-cache lookup, bind processing and result wrapping for what is a
+    single bool. Only while the driver already has the transaction open: the
+    SQLAlchemy adapter issues BEGIN lazily with its first statement, and an
+    xact lock taken outside a transaction is released as soon as it returns.
+    """
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    driver = raw.driver_connection
+    if hasattr(driver, "fetchval") and driver.is_in_transaction():
+        return await driver.fetchval("SELECT pg_try_advisory_xact_lock($1)", lock_key)
+    return (await conn.execute(_SQL_TRY_XACT_LOCK, {"key": lock_key})).scalar()
+
+
 @asynccontextmanager
 async def acquire_risk_lock(
     db: AsyncSession,
@@ -68,30 +98,26 @@ async def acquire_risk_lock(
     Args:
         db: The current async SQLAlchemy session (must be in an active transaction)
         session_id: The trading session UUID
-        timeout_ms: How long to wait for lock before giving up (default 5s)
+        timeout_ms: Unused — pg_try_advisory_xact_lock never waits, so
+            lock_timeout does not apply. Kept for callers.
 
     Yields:
         True if lock acquired, False if timeout (you should reject the order)
     """
-    lock_key = _session_to_lock_key(session_id)
-
     if db.bind.dialect.name == "sqlite":
         # SQLite does not support pg_try_advisory_xact_lock. For single-process
         # deployments, relying on SQLite's DB lock and SELECT FOR UPDATE is sufficient.
         yield True
         return
 
-    # PostgreSQL specific logic
-    await db.execute(text(f"SET LOCAL lock_timeout = '{timeout_ms}ms'"))
+    lock_key = _session_to_lock_key(session_id)
 
+    # PostgreSQL specific logic
     try:
-        # pg_try_advisory_xact_lock: non-blocking, returns bool
-        # pg_advisory_xact_lock: blocking (respects lock_timeout)
-        result = await db.execute(
-            text("SELECT pg_try_advisory_xact_lock(:key)"),
-            {"key": lock_key}
-        )
-        acquired = result.scalar()
+        # pg_try_advisory_xact_lock: non-blocking, returns bool → one round trip.
+        # (Only the blocking pg_advisory_xact_lock honours lock_timeout; if that
+        # is ever needed, set it in the same statement via set_config(..., true).)
+        acquired = await _try_xact_lock(db, lock_key)
 
         if acquired:
             logger.debug(f"Advisory lock acquired for session {session_id} (key={lock_key})")
@@ -123,22 +149,14 @@ async def acquire_position_lock(
     Separate from the risk lock — allows concurrent orders on different symbols
     while serializing updates to the same symbol's position.
     """
-    combined = f"{session_id}:{symbol}"
-    lock_key = _session_to_lock_key(combined)
-
     if db.bind.dialect.name == "sqlite":
         yield True
         return
 
-    await db.execute(text(f"SET LOCAL lock_timeout = '{timeout_ms}ms'"))
+    lock_key = _pair_to_lock_key(session_id, symbol)
 
     try:
-        result = await db.execute(
-            text("SELECT pg_try_advisory_xact_lock(:key)"),
-            {"key": lock_key}
-        )
-        acquired = result.scalar()
-        yield acquired
+        yield await _try_xact_lock(db, lock_key)
     except Exception as e:
         logger.error(f"Position lock error for {symbol}: {e}")
         yield False
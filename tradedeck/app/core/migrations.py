@@ -0,0 +1,71 @@
+"""
+Schema Migrations — run Alembic from inside the app process.
+
+Modes (settings.MIGRATION_MODE):
+  off   → Do nothing. Migrations are run out-of-band (`alembic upgrade head`).
+  sync  → Upgrade before the app accepts traffic (blocks startup).
+  async → Schedule the upgrade as a background task. Health endpoints serve
+          immediately; /health/migrations reports progress.
+
+Alembic's env.py calls asyncio.run() itself, so the upgrade always runs in a
+worker thread (it cannot nest inside the app's running loop).
+
+Why a process-wide lock:
+  alembic.context is a module-level proxy. Two upgrades in the same process
+  (e.g. lifespan + a manual trigger) would overwrite each other's
+  context._proxy mid-run and corrupt both.
+  Across processes (several workers booting at once) alembic/env.py holds a
+  Postgres advisory lock for the duration of the upgrade.
+"""
+import asyncio
+import logging
+import threading
+
+from app.core.config import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+# pending | running | done | failed
+_state: dict = {"status": "pending", "error": None}
+_upgrade_lock = threading.Lock()
+
+
+def get_migration_state() -> dict:
+    return dict(_state)
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    cfg = Config()
+    cfg.set_main_option("script_location", str(BASE_DIR / "alembic"))
+    return cfg
+
+
+def run_migrations(revision: str = "head") -> None:
+    """Blocking Alembic upgrade. Serialized per process."""
+    from alembic import command
+
+    with _upgrade_lock:
+        _state.update(status="running", error=None)
+        try:
+            command.upgrade(_alembic_config(), revision)
+        except Exception as e:
+            _state.update(status="failed", error=str(e))
+            logger.error(f"[MIGRATIONS] 🛑 Upgrade to {revision} failed: {e}")
+            raise
+        _state.update(status="done", error=None)
+        logger.info(f"[MIGRATIONS] ✅ Schema upgraded to {revision}")
+
+
+async def run_migrations_async(revision: str = "head") -> None:
+    """Run the upgrade in a worker thread without blocking the event loop."""
+    try:
+        await asyncio.to_thread(run_migrations, revision)
+    except Exception:
+        # Already recorded in _state and logged — a background task must not crash the app
+        pass
+
+
+def start_background_migrations(revision: str = "head") -> asyncio.Task:
+    return asyncio.create_task(run_migrations_async(revision), name="alembic_upgrade")
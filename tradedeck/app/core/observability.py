@@ -6,27 +6,42 @@ Why JSON logs:
   - Every log entry is a structured event, not a string to grep
   - Request ID threaded through all logs for trace correlation
 """
-import json
 import logging
 import sys
 import time
 import uuid
 from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Tuple
+
+import orjson
 
 # Thread-local request context
-_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
-_user_id:    ContextVar[Optional[str]] = ContextVar("user_id",    default=None)
+# (request_id, user_id) in one var: the formatter does a single .get() per record
+_request_ctx: ContextVar[Tuple[Optional[str], Optional[str]]] = ContextVar(
+    "request_ctx", default=(None, None)
+)
 
 
 def set_request_context(request_id: str, user_id: str = None):
-    _request_id.set(request_id)
-    _user_id.set(user_id)
+    _request_ctx.set((request_id, user_id))
 
 
 def get_request_id() -> Optional[str]:
-    return _request_id.get()
+    return _request_ctx.get()[0]
+
+
+# Attributes every LogRecord has; anything else came in via extra={...}
+_STD_LOGRECORD_FIELDS = frozenset({
+    "name", "msg", "args", "levelname", "levelno", "pathname",
+    "filename", "module", "exc_info", "exc_text", "stack_info",
+    "lineno", "funcName", "created", "msecs", "relativeCreated",
+    "thread", "threadName", "processName", "process", "message",
+    "taskName",
+})
+
+# Attribute count of a record created without extra= → larger means extras to walk
+_BASE_RECORD_LEN = len(logging.LogRecord("", 0, "", 0, "", None, None).__dict__)
 
 
 class JSONFormatter(logging.Formatter):
@@ -42,7 +57,8 @@ class JSONFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         entry = {
-            "ts":         datetime.now(timezone.utc).isoformat() + "Z",
+            # record.created is when the event was logged; orjson renders the ISO string
+            "ts":         datetime.fromtimestamp(record.created, timezone.utc),
             "level":      self.LEVEL_MAP.get(record.levelname, record.levelname.lower()),
             "logger":     record.name,
             "msg":        record.getMessage(),
@@ -52,10 +68,9 @@ class JSONFormatter(logging.Formatter):
         }
 
         # Inject request context if available
-        req_id = _request_id.get()
+        req_id, usr_id = _request_ctx.get()
         if req_id:
             entry["request_id"] = req_id
-        usr_id = _user_id.get()
         if usr_id:
             entry["user_id"] = usr_id
 
@@ -64,17 +79,14 @@ class JSONFormatter(logging.Formatter):
             entry["exception"] = self.formatException(record.exc_info)
 
         # Include any extra fields passed via logger.info(..., extra={...})
-        for key, val in record.__dict__.items():
-            if key not in {
-                "name", "msg", "args", "levelname", "levelno", "pathname",
-                "filename", "module", "exc_info", "exc_text", "stack_info",
-                "lineno", "funcName", "created", "msecs", "relativeCreated",
-                "thread", "threadName", "processName", "process", "message",
-                "taskName",
-            } and not key.startswith("_"):
-                entry[key] = val
+        if len(record.__dict__) > _BASE_RECORD_LEN:
+            extras = record.__dict__.keys() - _STD_LOGRECORD_FIELDS
+            for key in extras:
+                if not key.startswith("_"):
+                    entry[key] = record.__dict__[key]
 
-        return json.dumps(entry, default=str)
+        # datetime/UUID extras serialize natively (naive = UTC here); default=str covers the rest
+        return orjson.dumps(entry, default=str, option=orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC).decode()
 
 
 def configure_logging(level: str = "INFO") -> None:
@@ -143,6 +155,12 @@ if PROMETHEUS_AVAILABLE:
         registry=REGISTRY,
     )
 
+    session_realized_pnl = Gauge(
+        "tradedeck_session_realized_pnl_rupees",
+        "Realized P&L of today's trading session in rupees",
+        registry=REGISTRY,
+    )
+
     # ── Risk metrics ──────────────────────────────────────────
     risk_rejections = Counter(
         "tradedeck_risk_rejections_total",
@@ -174,7 +192,7 @@ if PROMETHEUS_AVAILABLE:
         "tradedeck_http_request_duration_seconds",
         "HTTP request duration",
         ["method", "path", "status_code"],
-        buckets=[.005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0],
+        buckets=[.005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0],
         registry=REGISTRY,
     )
 
@@ -209,13 +227,65 @@ if PROMETHEUS_AVAILABLE:
 
     CB_STATE_MAP = {"CLOSED": 0, "HALF_OPEN": 1, "OPEN": 2}
 
+    # Children bound once for the fixed BrokerCircuitBreakers services
+    _CB_GAUGES = {
+        svc: circuit_breaker_state.labels(service=svc)
+        for svc in ("fyers_orders", "fyers_quotes", "fyers_funds", "fyers_websocket")
+    }
+
+    # ── DB pool ───────────────────────────────────────────────
+    db_pool_checked_out = Gauge(
+        "tradedeck_db_pool_checked_out",
+        "Pooled DB connections currently checked out",
+        registry=REGISTRY,
+    )
+
+    db_pool_checkouts = Counter(
+        "tradedeck_db_pool_checkouts_total",
+        "DB connection checkouts from the pool",
+        registry=REGISTRY,
+    )
+
+    db_pool_size = Gauge(
+        "tradedeck_db_pool_size",
+        "Configured DB pool size",
+        registry=REGISTRY,
+    )
+
+    db_pool_overflow = Gauge(
+        "tradedeck_db_pool_overflow",
+        "DB connections open beyond the pool size (negative while below it)",
+        registry=REGISTRY,
+    )
+
+    # ── Redis ─────────────────────────────────────────────────
+    redis_memory_bytes = Gauge(
+        "tradedeck_redis_memory_bytes",
+        "Redis used_memory from INFO memory",
+        registry=REGISTRY,
+    )
+
+    # Bound children by label tuple. Label values are bounded (enum values,
+    # route templates, status codes), so these stay small; a hit is one dict
+    # lookup instead of .labels(**kwargs) validating and hashing every call.
+    _ORDER_CHILDREN:     dict = {}
+    _REJECTION_CHILDREN: dict = {}
+    _HTTP_CHILDREN:      dict = {}
+
     def record_order(status: str, side: str, product_type: str):
         if PROMETHEUS_AVAILABLE:
-            orders_total.labels(status=status, side=side, product_type=product_type).inc()
+            key = (status, side, product_type)
+            child = _ORDER_CHILDREN.get(key)
+            if child is None:
+                child = _ORDER_CHILDREN[key] = orders_total.labels(*key)
+            child.inc()
 
     def record_risk_rejection(code: str):
         if PROMETHEUS_AVAILABLE:
-            risk_rejections.labels(code=code).inc()
+            child = _REJECTION_CHILDREN.get(code)
+            if child is None:
+                child = _REJECTION_CHILDREN[code] = risk_rejections.labels(code)
+            child.inc()
 
     def update_session_metrics(pnl: float, margin_pct: float, pos_count: int, is_killed: bool):
         if PROMETHEUS_AVAILABLE:
@@ -226,7 +296,41 @@ if PROMETHEUS_AVAILABLE:
 
     def update_circuit_breaker(service: str, state: str):
         if PROMETHEUS_AVAILABLE:
-            circuit_breaker_state.labels(service=service).set(CB_STATE_MAP.get(state, 0))
+            gauge = _CB_GAUGES.get(service) or circuit_breaker_state.labels(service=service)
+            gauge.set(CB_STATE_MAP.get(state, 0))
+
+    def set_realized_pnl(pnl: float):
+        if PROMETHEUS_AVAILABLE:
+            session_realized_pnl.set(pnl)
+
+    def set_reconcile_failures(count: int):
+        if PROMETHEUS_AVAILABLE:
+            reconciliation_failures.set(count)
+
+    def set_pool_checked_out(count: int):
+        if PROMETHEUS_AVAILABLE:
+            db_pool_checked_out.set(count)
+
+    def record_pool_checkout():
+        if PROMETHEUS_AVAILABLE:
+            db_pool_checkouts.inc()
+
+    def set_pool_size(size: int, overflow: int):
+        if PROMETHEUS_AVAILABLE:
+            db_pool_size.set(size)
+            db_pool_overflow.set(overflow)
+
+    def set_redis_memory(used_bytes: int):
+        if PROMETHEUS_AVAILABLE:
+            redis_memory_bytes.set(used_bytes)
+
+    def observe_http_request(method: str, path: str, status_code: int, seconds: float):
+        if PROMETHEUS_AVAILABLE:
+            key = (method, path, status_code)
+            child = _HTTP_CHILDREN.get(key)
+            if child is None:
+                child = _HTTP_CHILDREN[key] = http_request_duration.labels(method, path, str(status_code))
+            child.observe(seconds)
 
     def get_metrics_output() -> bytes:
         if PROMETHEUS_AVAILABLE:
@@ -239,5 +343,12 @@ else:
     def record_risk_rejection(*a, **k): pass
     def update_session_metrics(*a, **k): pass
     def update_circuit_breaker(*a, **k): pass
+    def set_realized_pnl(*a, **k): pass
+    def set_reconcile_failures(*a, **k): pass
+    def set_pool_checked_out(*a, **k): pass
+    def record_pool_checkout(*a, **k): pass
+    def set_pool_size(*a, **k): pass
+    def set_redis_memory(*a, **k): pass
+    def observe_http_request(*a, **k): pass
     def get_metrics_output() -> bytes:
         return b"# prometheus_client not installed\n"
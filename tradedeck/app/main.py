@@ -1,5 +1,6 @@
+import asyncio
 import logging
-import uuid
+import time
 import redis.asyncio as redis
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
@@ -8,9 +9,10 @@ from fastapi.responses import Response
 from sqlalchemy import text, select
 
 from app.api.routes import health
-from app.models.db import Base
-from app.core.database import async_session, engine
-from app.core.observability import configure_logging, get_metrics_output
+from app.models.db import Base, gen_uuid
+from app.core.database import async_session, engine, warm_pool, db_heartbeat_loop
+from app.core.observability import configure_logging, get_metrics_output, observe_http_request
+from app.core.migrations import run_migrations, start_background_migrations
 from app.services.broker_service import BrokerService
 from app.services.risk_engine import RiskEngine
 from app.workers.reconciliation import ReconciliationWorker
@@ -31,6 +33,21 @@ from app.core.config import settings
 configure_logging()
 logger = logging.getLogger(__name__)
 
+_SQL_STARTUP_AUDIT = text("INSERT INTO audit_logs (id, event_type, created_at) VALUES (:i, :e, :ts)")
+
+
+async def _record_startup_audit() -> None:
+    """Background task: the audit row does not gate serving traffic."""
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(
+                _SQL_STARTUP_AUDIT,
+                {"i": gen_uuid(), "e": "SYSTEM_STARTUP", "ts": datetime.now(timezone.utc).replace(tzinfo=None)}
+            )
+        logger.info("[SYSTEM] 📝 Startup audit log recorded.")
+    except Exception as e:
+        logger.warning(f"[SYSTEM] ⚠️ Could not record startup audit log: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 1. Ensure tables exist (especially important for local SQLite on Render)
@@ -58,11 +75,27 @@ async def lifespan(app: FastAPI):
             except sqlalchemy.exc.OperationalError as e:
                 if "already exists" in str(e):
                     logger.debug("[SYSTEM] ℹ️ Tables already exist.")
-                elif "database is locked" in str(e):
-                    logger.warning("[SYSTEM] ⚠️ Database locked during create_all.")
                 else:
                     logger.error(f"[SYSTEM] 🛑 Unexpected SQLite error: {e}")
                     raise
+    elif settings.MIGRATION_MODE == "sync":
+        logger.info("[SYSTEM] 🛠️ Applying Alembic migrations before startup...")
+        await asyncio.to_thread(run_migrations)
+    elif settings.MIGRATION_MODE == "async":
+        # Serve health probes immediately; /health/migrations reports progress
+        logger.info("[SYSTEM] 🛠️ Applying Alembic migrations in background...")
+        app.state.migration_task = start_background_migrations()
+
+    if "sqlite" not in engine.url.drivername:
+        await warm_pool()
+        logger.info(f"[SYSTEM] 🔌 DB pool pre-warmed ({engine.pool.checkedin()} connections)")
+
+    # Readiness reads this heartbeat instead of querying on every probe
+    app.state.db_heartbeat = asyncio.create_task(db_heartbeat_loop(), name="db_heartbeat")
+    # /health/ready serves the snapshot this task keeps fresh
+    app.state.readiness_refresher = asyncio.create_task(
+        health.readiness_refresh_loop(), name="readiness_refresh"
+    )
 
     # 2. Ensure TradingSession for today exists
     from datetime import date
@@ -76,7 +109,7 @@ async def lifespan(app: FastAPI):
                 logger.info(f"[SYSTEM] 📅 Creating new TradingSession for {today}")
                 new_session = TradingSession(
                     date=today,
-                    id=str(uuid.uuid4()),
+                    id=gen_uuid(),
                     max_daily_loss=10000.0,
                     max_position_size=100,
                     max_open_orders=20,
@@ -89,16 +122,8 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"[SYSTEM] 🛑 Failed to ensure TradingSession: {e}")
 
-    # 3. Record system startup in audit logs
-    try:
-        async with engine.begin() as conn:
-            await conn.execute(
-                text("INSERT INTO audit_logs (id, event_type, created_at) VALUES (:i, :e, :ts)"),
-                {"i": str(uuid.uuid4()), "e": "SYSTEM_STARTUP", "ts": datetime.now(timezone.utc).replace(tzinfo=None)}
-            )
-        logger.info("[SYSTEM] 📝 Startup audit log recorded.")
-    except Exception as e:
-        logger.warning(f"[SYSTEM] ⚠️ Could not record startup audit log: {e}")
+    # 3. Record system startup in audit logs (off the startup path)
+    app.state.startup_audit = asyncio.create_task(_record_startup_audit(), name="startup_audit")
     
     # 4. Ensure Feed Heartbeat row exists
     try:
@@ -123,7 +148,8 @@ async def lifespan(app: FastAPI):
                 settings.REDIS_URL,
                 password=settings.REDIS_PASSWORD,
                 encoding="utf-8",
-                decode_responses=True
+                decode_responses=True,
+                health_check_interval=30,   # Re-check idle connections before reuse → dead sockets fail fast
             )
             await redis_client.ping()
             app.state.redis = redis_client
@@ -135,6 +161,13 @@ async def lifespan(app: FastAPI):
         logger.warning(f"[SYSTEM] ⚠️ Could not connect to Redis: {e}")
         app.state.redis = None
 
+    observability.start_emergency_listener()
+
+    # /observe/infra and the /metrics infra gauges read from this sampler
+    app.state.infra_stats = asyncio.create_task(
+        observability.infra_stats_loop(app.state.redis), name="infra_stats"
+    )
+
     # Initialize services
     notifier = NotificationService(settings.TELEGRAM_BOT_TOKEN, settings.TELEGRAM_CHAT_ID)
     mongo = MongoDBService(settings.MONGO_URI)
@@ -180,6 +213,9 @@ async def lifespan(app: FastAPI):
     yield
     
     # Cleanup
+    app.state.db_heartbeat.cancel()
+    app.state.readiness_refresher.cancel()
+    app.state.infra_stats.cancel()
     await tg_worker.stop()
     await mongo.close()
     if getattr(app.state, "redis", None):
@@ -187,6 +223,8 @@ async def lifespan(app: FastAPI):
     await feed.stop()
     await executor.stop()
     await reconciler.stop()
+    await broker.aclose()
+    observability.stop_emergency_listener()
     logger.info("[SYSTEM] 🛑 Bot components shut down.")
 
 app = FastAPI(
@@ -235,6 +273,18 @@ async def global_exception_handler(request: FastAPIRequest, exc: Exception):
         }
     )
 
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Route template, not the raw URL → one series per endpoint
+    route = request.scope.get("route")
+    observe_http_request(
+        request.method, getattr(route, "path", "unmatched"),
+        response.status_code, time.perf_counter() - start,
+    )
+    return response
+
 @app.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint."""
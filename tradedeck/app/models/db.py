@@ -7,8 +7,11 @@ Design principles:
   - Idempotency key has UNIQUE constraint at DB level (not just app level)
   - broker_order_id indexed for reconciliation lookups
   - All timestamps in UTC
-  - JSONB for status_history (indexed, queryable)
+  - Order status history is append-only rows (OrderStatusEvent), one INSERT per transition
+  - Order rows stay narrow — cold history/rejection columns live in OrderAudit
 """
+import os
+import time
 import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
@@ -19,12 +22,50 @@ from sqlalchemy import (
     UUID as GenericUUID, JSON
 )
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, relationship
 from sqlalchemy.sql import func
+from sqlalchemy.sql.functions import FunctionElement
 
 
 def gen_uuid() -> str:
-    return str(uuid.uuid4())
+    """
+    UUIDv7 (RFC 9562): 48-bit Unix ms timestamp, version, 74 random bits.
+    Ids sort by creation time, so PK/FK btree inserts land on the rightmost
+    leaf pages instead of scattering across the whole index like uuid4.
+    """
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    return str(uuid.UUID(int=(
+        (ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76                     # version
+        | (rand >> 68) << 64            # rand_a, 12 bits
+        | 0b10 << 62                    # RFC 4122 variant
+        | rand & ((1 << 62) - 1)        # rand_b, 62 bits
+    )))
+
+
+class clock_now(FunctionElement):
+    """
+    Wall-clock time at evaluation.
+    Postgres: clock_timestamp() (advances within a transaction, unlike NOW()).
+    SQLite:   CURRENT_TIMESTAMP.
+    Used as onupdate for updated_at — replaces the per-row plpgsql trigger —
+    and as the insert default on append-only tables, so rows written in one
+    transaction still get distinct, ordered timestamps.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(clock_now)
+def _clock_now_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(clock_now, "postgresql")
+def _clock_now_postgresql(element, compiler, **kw):
+    return "clock_timestamp()"
 
 
 class Base(DeclarativeBase):
@@ -83,6 +124,11 @@ class ReconcileStatus(str, PyEnum):
     PENDING   = "PENDING"
 
 
+# Strategy lifecycle vocabularies — native ENUMs on Postgres (migration 0011)
+STRATEGY_STATUSES = ("running", "paused", "error", "stopped", "starting", "stopping")
+CONTROL_INTENTS   = ("pause", "resume", "stop", "start")
+
+
 # ─────────────────────────────────────────────────────────────
 # TRADING SESSION
 # One row per trading day. The authoritative risk + kill state.
@@ -121,7 +167,7 @@ class TradingSession(Base):
     last_reconcile_status     = Column(String(20), default="PENDING")
 
     created_at = Column(DateTime(timezone=False), default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=False), default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=False), default=func.now(), onupdate=clock_now(), nullable=False)
 
     orders     = relationship("Order",     back_populates="session", lazy="dynamic")
     positions  = relationship("Position",  back_populates="session", lazy="dynamic")
@@ -160,32 +206,27 @@ class Order(Base):
     # State machine — current status
     status           = Column(Enum(OrderStatus), nullable=False, default=OrderStatus.CREATED)
 
-    # Full state history as JSONB — queryable, e.g. find all orders that hit RISK_REJECTED
-    # Format: [{"status": "CREATED", "time": "ISO", "actor": "user", "reason": "..."}]
-    status_history   = Column(JSON, default=list, nullable=False)
-
     # Broker integration
     broker_order_id  = Column(String(100), nullable=True)
     filled_quantity  = Column(Integer, default=0, nullable=False)
     avg_fill_price   = Column(Float,   nullable=True)
     fill_timestamp   = Column(DateTime(timezone=False), nullable=True)
 
-    # Risk snapshot at approval time — immutable record of what was checked
-    risk_snapshot    = Column(JSON, nullable=True)
     margin_blocked   = Column(Float, nullable=True)
 
-    # Rejection details
-    reject_reason    = Column(Text, nullable=True)
-    broker_reject_code = Column(String(50), nullable=True)
-
     # Timestamps
     created_at = Column(DateTime(timezone=False), default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=False), default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=False), default=func.now(), onupdate=clock_now(), nullable=False)
     sent_at    = Column(DateTime(timezone=False), nullable=True)
     acked_at   = Column(DateTime(timezone=False), nullable=True)
 
     session     = relationship("TradingSession", back_populates="orders")
     pnl_records = relationship("PnLRecord", back_populates="order")
+    # Cold columns (migration 0013). Never lazy-loaded: pass audit=OrderAudit(...)
+    # when constructing an order and write through order.audit; for loaded
+    # orders, selectinload(Order.audit) or write orders_audit directly.
+    audit       = relationship("OrderAudit", back_populates="order", uselist=False,
+                               lazy="raise", cascade="all, delete-orphan")
 
     __table_args__ = (
         # THE critical constraint — DB enforces uniqueness, not just application code
@@ -200,6 +241,46 @@ class Order(Base):
         # Partial index for active orders only — fast lookup for reconciliation
         Index("idx_order_active", "session_id", "status",
               postgresql_where="status NOT IN ('FILLED','CANCELLED','REJECTED','EXPIRED','RISK_REJECTED')"),
+        # Telemetry fill-latency read — index-only, newest fills first (0019)
+        Index("idx_order_latency", "session_id", fill_timestamp.desc(),
+              postgresql_include=["sent_at"],
+              postgresql_where="status = 'FILLED' AND sent_at IS NOT NULL AND fill_timestamp IS NOT NULL"),
+    )
+
+
+class OrderAudit(Base):
+    """1:1 sidecar of orders holding the wide, rarely-read columns."""
+    __tablename__ = "orders_audit"
+
+    order_id         = Column(GenericUUID(as_uuid=False), ForeignKey("orders.id", ondelete="CASCADE"), primary_key=True)
+
+    # Risk snapshot at approval time — immutable record of what was checked
+    risk_snapshot    = Column(JSON, nullable=True)
+
+    # Rejection details
+    reject_reason    = Column(Text, nullable=True)
+    broker_reject_code = Column(String(50), nullable=True)
+
+    order = relationship("Order", back_populates="audit")
+
+
+class OrderStatusEvent(Base):
+    """
+    One row per order status transition — append-only.
+    Replaces the status_history JSON array: a transition is a single small
+    INSERT instead of a read-modify-rewrite of the whole (TOASTed) document.
+    """
+    __tablename__ = "order_status_history"
+
+    id       = Column(Integer, primary_key=True, autoincrement=True)
+    order_id = Column(GenericUUID(as_uuid=False), ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
+    status   = Column(Enum(OrderStatus), nullable=False)
+    actor    = Column(String(50), nullable=True)
+    reason   = Column(Text, nullable=True)
+    at       = Column(DateTime(timezone=False), default=clock_now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_osh_order_time", "order_id", "at"),
     )
 
 
@@ -232,7 +313,7 @@ class Position(Base):
     last_reconciled_at  = Column(DateTime(timezone=False), nullable=True)
 
     created_at = Column(DateTime(timezone=False), default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=False), default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=False), default=func.now(), onupdate=clock_now(), nullable=False)
 
     session = relationship("TradingSession", back_populates="positions")
 
@@ -240,7 +321,9 @@ class Position(Base):
         UniqueConstraint("session_id", "symbol", "product_type", name="uq_position_session_symbol_product"),
         Index("idx_position_session",    "session_id"),
         Index("idx_position_symbol",     "symbol"),
-        Index("idx_position_active",     "session_id", "net_quantity",
+        # Open-exposure aggregates — index-only (0019)
+        Index("idx_position_open_covering", "session_id",
+              postgresql_include=["net_quantity", "unrealized_pnl", "ltp"],
               postgresql_where="net_quantity != 0"),
     )
 
@@ -257,19 +340,21 @@ class PnLRecord(Base):
     symbol      = Column(String(100), nullable=False)
     pnl_type    = Column(String(20),  nullable=False)   # REALIZED | UNREALIZED
     amount      = Column(Float,       nullable=False)
-    recorded_at = Column(DateTime(timezone=False), default=func.now(), nullable=False)
+    recorded_at = Column(DateTime(timezone=False), default=clock_now(), nullable=False)
 
     order = relationship("Order", back_populates="pnl_records")
 
     __table_args__ = (
         Index("idx_pnl_order",   "order_id"),
-        Index("idx_pnl_time",    "recorded_at"),
+        Index("idx_pnl_time_brin", "recorded_at",
+              postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
     )
 
 
 # ─────────────────────────────────────────────────────────────
 # AUDIT LOG — append-only, tamper-evident
 # DB trigger in migration prevents UPDATE/DELETE on this table.
+# Postgres: range-partitioned monthly on created_at (0008), PK (id, created_at).
 # ─────────────────────────────────────────────────────────────
 
 class AuditLog(Base):
@@ -283,7 +368,7 @@ class AuditLog(Base):
     actor       = Column(String(100), nullable=True)
     ip_address  = Column(String(45),  nullable=True)
     payload     = Column(JSON, nullable=True)
-    created_at  = Column(DateTime(timezone=False), default=func.now(), nullable=False)
+    created_at  = Column(DateTime(timezone=False), default=clock_now(), nullable=False)
 
     session = relationship("TradingSession", back_populates="audit_logs")
 
@@ -314,11 +399,10 @@ class CircuitBreakerState(Base):
     last_failure_at = Column(DateTime(timezone=False), nullable=True)
     opened_at      = Column(DateTime(timezone=False), nullable=True)
     next_attempt_at = Column(DateTime(timezone=False), nullable=True)
-    updated_at     = Column(DateTime(timezone=False), default=func.now(), onupdate=func.now())
+    updated_at     = Column(DateTime(timezone=False), default=func.now(), onupdate=clock_now())
 
     __table_args__ = (
         UniqueConstraint("service_name", name="uq_cb_service"),
-        Index("idx_cb_service", "service_name"),
     )
 
 
@@ -330,7 +414,7 @@ class ReconciliationLog(Base):
     __tablename__ = "reconciliation_logs"
 
     id                  = Column(GenericUUID(as_uuid=False), primary_key=True, default=gen_uuid)
-    run_at              = Column(DateTime(timezone=False), default=func.now(), nullable=False)
+    run_at              = Column(DateTime(timezone=False), default=clock_now(), nullable=False)
     status              = Column(String(20), nullable=False)   # OK | MISMATCH | FAILED
     positions_checked   = Column(Integer, default=0)
     orders_checked      = Column(Integer, default=0)
@@ -340,7 +424,9 @@ class ReconciliationLog(Base):
     duration_ms         = Column(Integer, nullable=True)
 
     __table_args__ = (
-        Index("idx_recon_time", "run_at"),
+        # Insert-ordered, range-filtered only → BRIN (migration 0017)
+        Index("idx_recon_time_brin", "run_at",
+              postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
     )
 # ─────────────────────────────────────────────────────────────
 # STRATEGY STATE — authoritative source of truth
@@ -353,8 +439,8 @@ class StrategyState(Base):
     strategy_name   = Column(String(100), nullable=False, unique=True)
     session_id      = Column(GenericUUID(as_uuid=False), nullable=True)
 
-    status          = Column(String(20), nullable=False, default="stopped")
-    control_intent  = Column(String(20), nullable=True)
+    status          = Column(Enum(*STRATEGY_STATUSES, name="strategy_status"), nullable=False, default="stopped")
+    control_intent  = Column(Enum(*CONTROL_INTENTS, name="control_intent"), nullable=True)
 
     intent_set_at   = Column(DateTime, nullable=True)
     intent_acked_at = Column(DateTime, nullable=True)
@@ -395,7 +481,7 @@ class StrategyState(Base):
     last_tick_at    = Column(DateTime, nullable=True)
     started_at      = Column(DateTime, nullable=True)
     created_at      = Column(DateTime, default=func.now(), nullable=False)
-    updated_at      = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at      = Column(DateTime, default=func.now(), onupdate=clock_now(), nullable=False)
 
     __table_args__ = (
         Index("idx_ss_status", "status"),
@@ -405,10 +491,12 @@ class StrategyState(Base):
 
 class StrategyControlLog(Base):
     __tablename__ = "strategy_control_log"
+    # Postgres only (migrations 0008/0018): range-partitioned on created_at,
+    # PK is (shard_id, created_at, id) with shard_id generated from strategy_name.
 
     id            = Column(Integer, primary_key=True, autoincrement=True)
     strategy_name = Column(String(100), nullable=False)
-    action        = Column(String(20), nullable=False)
+    action        = Column(Enum(*CONTROL_INTENTS, name="control_intent"), nullable=False)
     actor         = Column(String(100), nullable=False)
     ip_address    = Column(String(45), nullable=True)
     from_status   = Column(String(20), nullable=True)
@@ -416,11 +504,15 @@ class StrategyControlLog(Base):
     acked_at      = Column(DateTime, nullable=True)
     ack_latency_ms = Column(Integer, nullable=True)
     notes         = Column(Text, nullable=True)
-    created_at    = Column(DateTime, default=func.now(), nullable=False)
+    # server_default too: raw INSERTs in strategy_control omit created_at
+    created_at    = Column(DateTime, default=clock_now(), server_default=clock_now(), nullable=False)
 
     __table_args__ = (
-        Index("idx_scl_strategy", "strategy_name"),
-        Index("idx_scl_time", "created_at"),
+        # Per-strategy "latest action" lookups — one ordered index scan
+        Index("idx_scl_strategy_time", strategy_name, created_at.desc()),
+        # Covering index → index-only scan for "latest N actions" reads
+        Index("idx_scl_time_covering", "created_at",
+              postgresql_include=["strategy_name", "action", "actor", "acked_at"]),
     )
 
 
@@ -433,4 +525,4 @@ class FeedHeartbeat(Base):
     last_tick_at = Column(DateTime, nullable=False)
     symbols_count = Column(Integer, default=0)
     is_connected = Column(Boolean, default=False)
-    updated_at   = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at   = Column(DateTime, default=func.now(), onupdate=clock_now())
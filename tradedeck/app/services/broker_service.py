@@ -5,8 +5,10 @@ import hashlib
 import httpx
 import base64
 import pyotp
+from contextlib import asynccontextmanager
+from operator import itemgetter
 from fyers_apiv3 import fyersModel
-from typing import TYPE_CHECKING, Dict, Any, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Any, Optional
 
 if TYPE_CHECKING:
     from app.services.mongodb_service import MongoDBService
@@ -15,6 +17,17 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Fyers orderbook status codes
+_ORDER_STATUS_MAP = {1: "CANCELLED", 2: "FILLED", 4: "TRANSIT", 5: "REJECTED", 6: "PENDING"}
+
+# Field extractors for the per-row parsing in get_orders / get_positions:
+# one C-level call per row instead of a subscript per field
+_ORDER_FIELDS    = itemgetter("id", "status", "filledQty", "tradedPrice")
+_POSITION_FIELDS = itemgetter("symbol", "netQty", "ltp", "unrealizedProfit")
+
+# Main balance row of the funds payload; titles vary by account type, in priority order
+_FUNDS_TITLES = ("Total Balance", "Available Balance", "Net Balance", "Available Margin")
+
 class BrokerError(Exception):
     def __init__(self, code: str, message: str):
         self.code = code
@@ -44,6 +57,22 @@ class BrokerService:
         # We don't initialize client here because we need to sync from DB first
         self.client = None
 
+        # One pooled HTTP client for the direct Fyers auth endpoints: keep-alive
+        # connections instead of a fresh TCP + TLS handshake per call
+        self._http = httpx.AsyncClient(
+            timeout=15.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+
+    @asynccontextmanager
+    async def _http_client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """The shared client, starting without cookies from a previous login. Not closed on exit."""
+        self._http.cookies.clear()
+        yield self._http
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
     @property
     def ws_access_token(self) -> str:
         """Construct the correctly formatted token for Fyers V3 DataSocket."""
@@ -119,7 +148,7 @@ class BrokerService:
 
                 # 1. login_otp
                 import time
-                async with httpx.AsyncClient(timeout=15.0) as client:
+                async with self._http_client() as client:
                     # Global Redis Cooldown Check
                     now_ts = time.time()
                     if self.redis:
@@ -205,11 +234,12 @@ class BrokerService:
                     else:
                         app_base, app_type = self.app_id, "100"
 
-                    client.headers.update({"Authorization": f"Bearer {session_token}"})
+                    # Per request, not on the shared client's default headers
+                    auth = {"Authorization": f"Bearer {session_token}"}
                     r4 = await client.post("https://api-t1.fyers.in/api/v3/token", json={
                         "fyers_id": fy_id, "app_id": app_base, "redirect_uri": self.redirect_uri,
                         "appType": app_type, "response_type": "code", "create_cookie": True
-                    }, follow_redirects=False)
+                    }, headers=auth, follow_redirects=False)
                     
                     auth_code = None
                     if r4.status_code in (308, 200):
@@ -230,7 +260,7 @@ class BrokerService:
                     logger.info(f"[BROKER] 🔑 Step 5: Validating auth_code with hash {app_hash[:10]}...")
                     r5 = await client.post("https://api-t1.fyers.in/api/v3/validate-authcode", json={
                         "grant_type": "authorization_code", "appIdHash": app_hash, "code": auth_code
-                    })
+                    }, headers=auth)
                     if r5.status_code != 200 or r5.json().get("s") == "error": 
                         raise Exception(f"Step 5 failed: {r5.text}")
 
@@ -271,11 +301,20 @@ class BrokerService:
 
     async def set_access_token_from_auth_code(self, auth_code: str) -> bool:
         """Manually validate an auth_code and update the system with the new access_token."""
+        # Serialized with the TOTP flow: both use the shared client's cookie jar
+        async with self._refresh_lock:
+            self._refresh_event.clear()
+            try:
+                return await self._validate_auth_code(auth_code)
+            finally:
+                self._refresh_event.set()
+
+    async def _validate_auth_code(self, auth_code: str) -> bool:
         try:
             app_hash = hashlib.sha256(f"{self.app_id}:{self.secret_id}".encode()).hexdigest()
             logger.info(f"[BROKER] 🔑 Validating manual auth_code with hash {app_hash[:10]}...")
             
-            async with httpx.AsyncClient(timeout=15.0) as client:
+            async with self._http_client() as client:
                 r5 = await client.post("https://api-t1.fyers.in/api/v3/validate-authcode", json={
                     "grant_type": "authorization_code", "appIdHash": app_hash, "code": auth_code
                 })
@@ -394,9 +433,9 @@ class BrokerService:
         fund_limit = data.get("fund_limit", [])
         
         # Look for the main balance indicator (names can vary by account type)
-        target_titles = ["Total Balance", "Available Balance", "Net Balance", "Available Margin"]
+        by_title = {item.get("title"): item for item in fund_limit}
         equity_data = next(
-            (item for item in fund_limit if item.get("title") in target_titles), 
+            filter(None, map(by_title.get, _FUNDS_TITLES)),
             fund_limit[0] if fund_limit else {} # Fallback to first item
         )
         
@@ -422,12 +461,8 @@ class BrokerService:
             data = await self._api_call(self.client.positions)
             positions = data.get("netPositions", [])
             return [
-                {
-                    "symbol": p["symbol"],
-                    "net_qty": p["netQty"],
-                    "ltp": p["ltp"],
-                    "pnl": p["unrealizedProfit"]
-                } for p in positions
+                {"symbol": symbol, "net_qty": net_qty, "ltp": ltp, "pnl": pnl}
+                for symbol, net_qty, ltp, pnl in map(_POSITION_FIELDS, positions)
             ]
         except Exception:
             return []
@@ -437,14 +472,14 @@ class BrokerService:
         try:
             data = await self._api_call(self.client.orderbook)
             orders = data.get("orderBook", [])
-            status_map = {1: "CANCELLED", 2: "FILLED", 4: "TRANSIT", 5: "REJECTED", 6: "PENDING"}
+            status_map = _ORDER_STATUS_MAP
             return [
                 {
-                    "broker_order_id": o["id"],
-                    "status": status_map.get(o["status"], "UNKNOWN"),
-                    "filled_qty": o["filledQty"],
-                    "avg_price": o["tradedPrice"]
-                } for o in orders
+                    "broker_order_id": order_id,
+                    "status": status_map.get(status, "UNKNOWN"),
+                    "filled_qty": filled_qty,
+                    "avg_price": avg_price,
+                } for order_id, status, filled_qty, avg_price in map(_ORDER_FIELDS, orders)
             ]
         except Exception:
             return []
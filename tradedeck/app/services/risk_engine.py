@@ -18,10 +18,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.db import (
     AuditLog, CircuitBreakerState, KillSwitchReason,
-    Order, OrderStatus, Position, TradingSession,
+    Order, OrderStatus, Position, TradingSession, gen_uuid,
 )
 from app.core.locking import acquire_risk_lock, lock_session_row
 from app.core.circuit_breaker import BrokerCircuitBreakers
+from app.core.observability import set_realized_pnl
 
 logger = logging.getLogger(__name__)
 
@@ -152,7 +153,7 @@ class RiskEngine:
         used_margin      = 0
         total_margin     = 1
 
-        async with BrokerCircuitBreakers.funds.call(db) as allowed:
+        async with BrokerCircuitBreakers.funds().call(db) as allowed:
             if not allowed:
                 return RiskCheckResult(
                     approved=False, code="CIRCUIT_OPEN_FUNDS",
@@ -327,10 +328,12 @@ class RiskEngine:
         )
         # Post-fill: check if now in breach
         result = await db.execute(
-            text("SELECT realized_pnl + unrealized_pnl as day_pnl, max_daily_loss, is_killed FROM trading_sessions WHERE id=:id"),
+            text("SELECT realized_pnl, realized_pnl + unrealized_pnl as day_pnl, max_daily_loss, is_killed FROM trading_sessions WHERE id=:id"),
             {"id": session_id}
         )
         row = result.fetchone()
+        if row:
+            set_realized_pnl(row.realized_pnl)
         if row and not row.is_killed and row.day_pnl < -abs(row.max_daily_loss):
             await self._trigger_kill_switch(
                 db, session_id, KillSwitchReason.DAILY_LOSS,
@@ -348,9 +351,8 @@ class RiskEngine:
             return 100.0
 
     def _add_audit(self, db, session_id, event, actor, payload):
-        import uuid
         log = AuditLog(
-            id=str(uuid.uuid4()),
+            id=gen_uuid(),
             session_id=session_id,
             event_type=event,
             entity_type="session",
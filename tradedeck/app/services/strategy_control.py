@@ -33,7 +33,7 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.db import AuditLog
@@ -53,6 +53,15 @@ INTENT_RESULT = {
     "start":  "running",
 }
 
+# (current status, intent) pairs rejected before an intent is written
+INVALID_TRANSITIONS = {
+    ("paused",  "pause"),
+    ("stopped", "stop"),
+    ("stopped", "pause"),
+    ("running", "resume"),
+    ("running", "start"),
+}
+
 
 class StrategyControlError(Exception):
     def __init__(self, code: str, message: str):
@@ -204,6 +213,88 @@ class StrategyControlService:
                 ),
             }
 
+    async def send_intent_bulk(
+        self,
+        db: AsyncSession,
+        strategy_names: list[str],
+        intent: str,
+        actor: str,
+        ip_address: Optional[str] = None,
+    ) -> int:
+        """
+        Set the same intent on many strategies in one transaction, no ack wait.
+
+        One UPDATE writes every intent and RETURNs the rows it changed; one
+        INSERT … SELECT over those rows logs them all.
+        Strategies that already have a pending intent or for which the
+        transition is invalid are skipped.
+
+        Returns the number of strategies whose intent was set.
+        """
+        if intent not in VALID_INTENTS:
+            raise StrategyControlError("INVALID_INTENT", f"Unknown intent: {intent}")
+        if not strategy_names:
+            return 0
+
+        blocked = [cur for cur, i in INVALID_TRANSITIONS if i == intent]
+        intent_set_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        update_sql = (
+            "UPDATE strategy_states SET "
+            "  control_intent=:intent, intent_set_at=:ts, "
+            "  intent_actor=:actor, intent_acked_at=NULL, updated_at=CURRENT_TIMESTAMP "
+            "WHERE strategy_name IN :names AND control_intent IS NULL "
+            "  AND status NOT IN :blocked "
+            "RETURNING strategy_name, control_intent, intent_actor, status"
+        )
+        params = {
+            "intent":  intent,
+            "ts":      intent_set_at,
+            "actor":   actor,
+            "names":   strategy_names,
+            "blocked": blocked,
+            "ip":      ip_address,
+        }
+        expanding = (bindparam("names", expanding=True), bindparam("blocked", expanding=True))
+
+        # The log rows are exactly the rows the UPDATE returned; action/actor
+        # come from the row itself so the enum column gets an enum value.
+        if db.bind.dialect.name == "sqlite":
+            # No data-modifying CTEs → RETURNING, then one executemany INSERT
+            rows = (await db.execute(text(update_sql).bindparams(*expanding), params)).all()
+            if rows:
+                await db.execute(
+                    text(
+                        "INSERT INTO strategy_control_log "
+                        "(strategy_name, action, actor, ip_address, from_status) "
+                        "VALUES (:name, :action, :actor, :ip, :from_s)"
+                    ),
+                    [
+                        {"name": r.strategy_name, "action": r.control_intent,
+                         "actor": r.intent_actor, "ip": ip_address, "from_s": r.status}
+                        for r in rows
+                    ],
+                )
+            count = len(rows)
+        else:
+            result = await db.execute(
+                text(
+                    f"WITH upd AS ({update_sql}) "
+                    "INSERT INTO strategy_control_log "
+                    "(strategy_name, action, actor, ip_address, from_status) "
+                    "SELECT strategy_name, control_intent, intent_actor, :ip, status FROM upd"
+                ).bindparams(*expanding),
+                params,
+            )
+            count = result.rowcount
+        await db.commit()
+
+        logger.info(
+            f"Control intent '{intent}' set for {count}/{len(strategy_names)} "
+            f"strategies by {actor}"
+        )
+        return count
+
     async def _wait_for_ack(
         self,
         db: AsyncSession,
@@ -311,14 +402,7 @@ class StrategyControlService:
 
     def _validate_transition(self, current: str, intent: str) -> None:
         """Reject nonsensical transitions early."""
-        invalid = {
-            ("paused",  "pause"),
-            ("stopped", "stop"),
-            ("stopped", "pause"),
-            ("running", "resume"),
-            ("running", "start"),
-        }
-        if (current, intent) in invalid:
+        if (current, intent) in INVALID_TRANSITIONS:
             raise StrategyControlError(
                 "INVALID_TRANSITION",
                 f"Cannot '{intent}' a strategy that is already '{current}'."
@@ -330,8 +414,8 @@ class StrategyControlService:
         await db.execute(
             text(
                 "INSERT INTO strategy_control_log "
-                "(strategy_name, action, actor, ip_address, from_status, created_at) "
-                "VALUES (:name, :action, :actor, :ip, :from_s, CURRENT_TIMESTAMP)"
+                "(strategy_name, action, actor, ip_address, from_status) "
+                "VALUES (:name, :action, :actor, :ip, :from_s)"
             ),
             {
                 "name":   strategy_name,
@@ -39,6 +39,18 @@ CB_TRIP_THRESHOLD  = 5     # Trip circuit breaker after 5 consecutive failures
 # Reconnect backoff
 RECONNECT_DELAYS = [1, 2, 4, 8, 16, 30]  # seconds, capped at 30
 
+# Whole-second part of the last formatted tick time (ticks arrive many per second)
+_iso_second: list = [None, ""]
+
+
+def _iso_utc(ts: float) -> str:
+    """Epoch → naive-UTC ISO string, as datetime.isoformat() would render it."""
+    sec = int(ts)
+    if _iso_second[0] != sec:
+        _iso_second[0] = sec
+        _iso_second[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+    return f"{_iso_second[1]}.{int((ts - sec) * 1_000_000):06d}"
+
 
 class FeedWorker:
 
@@ -264,13 +276,13 @@ class FeedWorker:
             # Inject source and timestamp for observability and strategy consumption
             message["source"] = "ws"
             if "ts" not in message:
-                message["ts"] = datetime.now(timezone.utc).isoformat()
+                # Float epoch, as Fyers itself sends it; strategies parse both
+                message["ts"] = time.time()
             
             asyncio.run_coroutine_threadsafe(self._on_tick(message), self._loop)
 
     async def _on_tick(self, tick: dict) -> None:
         """Called on every tick. Critical path — must be fast."""
-        now = datetime.now(timezone.utc).replace(tzinfo=None)
         now_ts = time.time()
         self._last_tick_ts = now_ts
         self._tick_count += 1  # <--- Increment counter
@@ -279,7 +291,7 @@ class FeedWorker:
         if self.redis:
             try:
                 pipe = self.redis.pipeline()
-                pipe.set("tradedeck:last_tick_ts", now.isoformat(), ex=10)
+                pipe.set("tradedeck:last_tick_ts", _iso_utc(now_ts), ex=10)
                 pipe.set("tradedeck:ws_connected", "1", ex=10)
                 if symbol := tick.get("symbol"):
                     pipe.set(f"tradedeck:ltp:{symbol}", str(tick.get("ltp",0)), ex=10)
@@ -290,6 +302,7 @@ class FeedWorker:
 
         # ── Periodic DB heartbeat fallback (every 5s) ─────────────────────
         if not hasattr(self, "_last_db_write") or now_ts - self._last_db_write > 5.0:
+            now = datetime.fromtimestamp(now_ts, timezone.utc).replace(tzinfo=None)
             asyncio.create_task(self._write_db_heartbeat(now))
             self._last_db_write = now_ts
 
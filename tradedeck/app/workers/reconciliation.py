@@ -11,7 +11,6 @@ Critical fix from v1:
 import asyncio
 import logging
 import time
-import json
 from datetime import datetime, date, timezone
 from typing import Optional
 
@@ -22,6 +21,7 @@ from app.models.db import (
     Order, OrderStatus, Position, ReconcileStatus,
     ReconciliationLog, TradingSession, KillSwitchReason
 )
+from app.core.observability import set_reconcile_failures
 from app.services.broker_service import BrokerService, BrokerError
 
 logger = logging.getLogger(__name__)
@@ -104,6 +104,7 @@ class ReconciliationWorker:
             if fetch_failed:
                 # Increment persisted failure counter
                 new_count = await self._increment_failure_count(db, session)
+                set_reconcile_failures(new_count)
 
                 log = ReconciliationLog(
                     status="FAILED",
@@ -136,6 +137,7 @@ class ReconciliationWorker:
                 ),
                 {"id": str(session.id), "now": datetime.now(timezone.utc).replace(tzinfo=None)}
             )
+            set_reconcile_failures(0)
 
             # ── Reconcile ──────────────────────────────────────
             pm, pc = await self._reconcile_positions(db, session, broker_positions)
@@ -148,8 +150,8 @@ class ReconciliationWorker:
             # Update unrealized P&L from broker
             total_unrealized = sum(p.get("pnl", 0) for p in broker_positions)
             await db.execute(
-                text("UPDATE trading_sessions SET unrealized_pnl=:pnl WHERE id=:id"),
-                {"pnl": total_unrealized, "id": str(session.id)}
+                text("UPDATE trading_sessions SET unrealized_pnl=:pnl, updated_at=:now WHERE id=:id"),
+                {"pnl": total_unrealized, "id": str(session.id), "now": datetime.now(timezone.utc).replace(tzinfo=None)}
             )
 
             duration_ms = int(time.time() * 1000) - start_ms
@@ -157,8 +159,8 @@ class ReconciliationWorker:
 
             # Update session reconcile status
             await db.execute(
-                text("UPDATE trading_sessions SET last_reconcile_status=:s WHERE id=:id"),
-                {"s": status, "id": str(session.id)}
+                text("UPDATE trading_sessions SET last_reconcile_status=:s, updated_at=:now WHERE id=:id"),
+                {"s": status, "id": str(session.id), "now": datetime.now(timezone.utc).replace(tzinfo=None)}
             )
 
             log = ReconciliationLog(
@@ -209,7 +211,7 @@ class ReconciliationWorker:
                 await db.execute(
                     text(
                         "UPDATE positions SET net_quantity=:qty, broker_quantity=:bq, "
-                        "reconcile_status='CORRECTED', last_reconciled_at=:now "
+                        "reconcile_status='CORRECTED', last_reconciled_at=:now, updated_at=:now "
                         "WHERE id=:id"
                     ),
                     {"qty": broker_qty, "bq": broker_qty, "id": str(pos.id), "now": datetime.now(timezone.utc).replace(tzinfo=None)}
@@ -221,7 +223,7 @@ class ReconciliationWorker:
                 await db.execute(
                     text(
                         "UPDATE positions SET ltp=:ltp, broker_quantity=:bq, "
-                        "reconcile_status='OK', last_reconciled_at=:now WHERE id=:id"
+                        "reconcile_status='OK', last_reconciled_at=:now, updated_at=:now WHERE id=:id"
                     ),
                     {"ltp": ltp, "bq": broker_qty, "id": str(pos.id), "now": datetime.now(timezone.utc).replace(tzinfo=None)}
                 )
@@ -248,7 +250,7 @@ class ReconciliationWorker:
 
         from sqlalchemy import select
         result = await db.execute(
-            select(Order.id, Order.broker_order_id, Order.status, Order.status_history, Order.filled_quantity)
+            select(Order.id, Order.broker_order_id, Order.status, Order.filled_quantity)
             .where(Order.session_id == str(session.id))
             .where(Order.status.not_in(terminal))
         )
@@ -269,26 +271,28 @@ class ReconciliationWorker:
                     "local_status": order.status,
                     "broker_status": broker_status,
                 })
-                history = (order.status_history or []) + [{
-                    "status": target_status,
-                    "ts": datetime.now(timezone.utc).isoformat(),
-                    "actor":  "RECONCILIATION",
-                }]
+                now = datetime.now(timezone.utc).replace(tzinfo=None)
                 await db.execute(
                     text(
                         "UPDATE orders SET status=:s, filled_quantity=:fq, "
-                        "avg_fill_price=:ap, status_history=:h, updated_at=:now "
+                        "avg_fill_price=:ap, updated_at=:now "
                         "WHERE id=:id"
                     ),
                     {
                         "s":  target_status,
                         "fq": broker_order["filled_qty"],
                         "ap": broker_order["avg_price"],
-                        "h":  json.dumps(history),
                         "id": str(order.id),
-                        "now": datetime.now(timezone.utc).replace(tzinfo=None)
+                        "now": now,
                     }
                 )
+                await db.execute(
+                    text(
+                        "INSERT INTO order_status_history (order_id, status, actor, at) "
+                        "VALUES (:id, :s, 'RECONCILIATION', :now)"
+                    ),
+                    {"id": str(order.id), "s": target_status, "now": now}
+                )
                 corrections.append({"order_id": str(order.id), "action": f"STATUS→{target_status}"})
 
         await db.flush()
@@ -305,7 +309,7 @@ class ReconciliationWorker:
         sent_cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=60)
         result = await db.execute(
             text(
-                "SELECT id, broker_order_id, status, sent_at, created_at, status_history "
+                "SELECT id, broker_order_id, status, sent_at, created_at "
                 "FROM orders WHERE session_id=:sid AND status IN ('SENDING','ACKNOWLEDGED') "
                 "AND (sent_at IS NULL OR sent_at < :cutoff)"
             ),
@@ -318,24 +322,32 @@ class ReconciliationWorker:
                 sm = {"FILLED": "FILLED", "CANCELLED": "CANCELLED", "REJECTED": "REJECTED", "PENDING": "PENDING"}
                 resolved = sm.get(broker_order["status"], "REJECTED")
 
-            history = (order.status_history or []) + [{
-                "status": resolved, "time": datetime.now(timezone.utc).isoformat(),
-                "actor": "CRASH_RECOVERY",
-                "reason": f"Orphan recovery — broker: {broker_order['status'] if broker_order else 'NOT_FOUND'}"
-            }]
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
             await db.execute(
-                text(
-                    "UPDATE orders SET status=:s, status_history=:h, "
-                    "reject_reason=:r, updated_at=:now WHERE id=:id"
-                ),
+                text("UPDATE orders SET status=:s, updated_at=:now WHERE id=:id"),
                 {
                     "s":  resolved,
-                    "h":  json.dumps(history),
-                    "r":  "Recovered from orphaned state by reconciliation",
                     "id": str(order.id),
-                    "now": datetime.now(timezone.utc).replace(tzinfo=None)
+                    "now": now,
+                }
+            )
+            await db.execute(
+                text(
+                    "INSERT INTO order_status_history (order_id, status, actor, reason, at) "
+                    "VALUES (:id, :s, 'CRASH_RECOVERY', :reason, :now)"
+                ),
+                {
+                    "id": str(order.id), "s": resolved, "now": now,
+                    "reason": f"Orphan recovery — broker: {broker_order['status'] if broker_order else 'NOT_FOUND'}",
                 }
             )
+            await db.execute(
+                text(
+                    "INSERT INTO orders_audit (order_id, reject_reason) VALUES (:id, :r) "
+                    "ON CONFLICT (order_id) DO UPDATE SET reject_reason=excluded.reject_reason"
+                ),
+                {"id": str(order.id), "r": "Recovered from orphaned state by reconciliation"}
+            )
             corrections.append({"order_id": str(order.id), "action": f"ORPHAN→{resolved}"})
             logger.warning("Orphan recovery: order %s → %s", order.id, resolved)
 
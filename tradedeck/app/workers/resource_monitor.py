@@ -2,6 +2,8 @@
 app/workers/resource_monitor.py
 
 Logs RSS, CPU, pool stats, and open FDs to resource_metrics every 60 seconds.
+Samples are buffered and written METRICS_FLUSH_SAMPLES at a time (binary COPY
+on asyncpg); alerts are still evaluated and written on every sample.
 Detects slow leaks using a sliding window of samples.
 Fires resource_alerts when thresholds breach.
 
@@ -34,7 +36,25 @@ logger = logging.getLogger(__name__)
 
 # ── Thresholds ────────────────────────────────────────────────────────────────
 SAMPLE_INTERVAL_S     = 60       # Log every 60 seconds
-RETENTION_DAYS        = 7        # Delete samples older than this
+RETENTION_DAYS        = 7        # Drop daily partitions older than this
+PARTITION_MAINT_S     = 3600     # Create/drop time partitions hourly
+RETENTION_BATCH       = 1000     # Rows per DELETE batch for the DEFAULT partition
+METRICS_FLUSH_SAMPLES = 5        # Buffer samples, write them in one COPY
+METRICS_BUFFER_MAX    = 60       # Keep at most 1h of unwritten samples if the DB is down
+
+# resource_metrics columns, in the order samples are buffered
+METRIC_COLUMNS = (
+    "recorded_at", "rss_mb", "vms_mb", "rss_delta_mb", "cpu_pct", "cpu_sys_pct",
+    "pool_checked_out", "pool_size", "pool_overflow", "open_fds", "active_tasks",
+    "rss_leak_flag", "fd_leak_flag", "running_strategies", "tick_rate_hz",
+)
+
+# Range-partitioned tables (migration 0008): (table, step, partitions kept ahead)
+PARTITIONED_TABLES = (
+    ("audit_logs",           "month", 2),
+    ("strategy_control_log", "month", 2),
+    ("resource_metrics",     "day",   7),
+)
 
 RSS_WARN_MB           = 350      # Warn at 350MB (68% of 512MB limit)
 RSS_CRITICAL_MB       = 430      # Critical at 430MB (84%)
@@ -79,6 +99,11 @@ class ResourceMonitor:
         # Previous RSS for delta
         self._prev_rss_mb: Optional[float] = None
 
+        self._last_partition_maint = 0.0
+
+        # Samples not yet written to resource_metrics (see _flush_samples)
+        self._pending_samples: collections.deque = collections.deque(maxlen=METRICS_BUFFER_MAX)
+
     def record_tick(self) -> None:
         """Called by FeedWorker on every tick. Thread-safe increment."""
         self._tick_count += 1
@@ -96,6 +121,10 @@ class ResourceMonitor:
                 await asyncio.wait_for(self._task, timeout=5.0)
             except (asyncio.CancelledError, asyncio.TimeoutError):
                 pass
+        try:
+            await self._flush_samples()
+        except Exception as e:
+            logger.error("Resource monitor final flush failed: %s", e)
         logger.info("Resource monitor stopped.")
 
     # ─────────────────────────────────────────────────────────────────────
@@ -192,47 +221,33 @@ class ResourceMonitor:
                                               active_tasks, pool_out, pool_size,
                                               rss_leak_confirmed, fd_leak_confirmed)
         else:
-            async with self.session_factory() as db:
-                await db.execute(
-                    text(
-                        "INSERT INTO resource_metrics "
-                        "(recorded_at, rss_mb, vms_mb, rss_delta_mb, cpu_pct, cpu_sys_pct, "
-                        " pool_checked_out, pool_size, pool_overflow, open_fds, active_tasks, "
-                        " rss_leak_flag, fd_leak_flag, running_strategies, tick_rate_hz) "
-                        "VALUES "
-                        "(:ts, :rss, :vms, :delta, :cpu, :cpu_s, "
-                        " :pool_out, :pool_sz, :pool_of, :fds, :tasks, "
-                        " :rss_lk, :fd_lk, :run_s, :ticks)"
-                    ),
-                    {
-                        "ts":       now,
-                        "rss":      rss,   "vms":     vms,    "delta":   delta,
-                        "cpu":      cpu_proc, "cpu_s": cpu_sys,
-                        "pool_out": pool_out, "pool_sz": pool_size, "pool_of": pool_of,
-                        "fds":      open_fds, "tasks":   active_tasks,
-                        "rss_lk":   rss_leak_confirmed,
-                        "fd_lk":    fd_leak_confirmed,
-                        "run_s":    running_count,
-                        "ticks":    tick_rate,
-                    }
-                )
+            self._pending_samples.append((
+                now, rss, vms, delta, cpu_proc, cpu_sys,
+                pool_out, pool_size, pool_of, open_fds, active_tasks,
+                rss_leak_confirmed, fd_leak_confirmed, running_count, float(tick_rate),
+            ))
+            if len(self._pending_samples) >= METRICS_FLUSH_SAMPLES:
+                await self._flush_samples()
 
+            async with self.session_factory() as db:
                 # ── Fire alerts ────────────────────────────────────────────────
                 await self._check_thresholds(db, now, rss, cpu_proc, open_fds,
                                               active_tasks, pool_out, pool_size,
                                               rss_leak_confirmed, fd_leak_confirmed)
 
-                # ── Prune old samples ──────────────────────────────────────────
-                await db.execute(
-                    text(
-                        "DELETE FROM resource_metrics "
-                        "WHERE recorded_at < NOW() - INTERVAL ':days days'"
-                        .replace(":days days", f"{RETENTION_DAYS} days")
-                    )
-                )
+                # ── Partition maintenance / retention ──────────────────────────
+                maintain = now_ts - self._last_partition_maint >= PARTITION_MAINT_S
+                if maintain:
+                    await self._maintain_partitions(db)
+                    self._last_partition_maint = now_ts
 
                 await db.commit()
 
+            # Only once the DETACH/DROP above has committed: the prune runs on
+            # other connections and would wait on this transaction's locks
+            if maintain:
+                await self._prune_default_partition()
+
         # ── Structured log every sample ────────────────────────────────────
         logger.info(
             "rss=%.1fMB delta=%s cpu=%.1f%% fds=%s tasks=%d pool=%s/%s ticks/s=%.1f "
@@ -250,6 +265,90 @@ class ResourceMonitor:
             " ⚠ FD_LEAK"    if fd_leak_confirmed  else "",
         )
 
+    # ─────────────────────────────────────────────────────────────────────
+    # SAMPLE PERSISTENCE
+    # ─────────────────────────────────────────────────────────────────────
+    async def _flush_samples(self) -> None:
+        """
+        Write buffered samples in one round trip.
+
+        asyncpg: binary COPY (copy_records_to_table) — no per-row parse/plan.
+        Other drivers (aiosqlite, psycopg): a single executemany INSERT.
+        The buffer is only cleared once the write succeeds.
+        """
+        if not self._pending_samples:
+            return
+        records = list(self._pending_samples)
+        async with self.session_factory() as db:
+            conn = await db.connection()
+            if conn.dialect.driver == "asyncpg":
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    "resource_metrics", records=records, columns=METRIC_COLUMNS
+                )
+            else:
+                await db.execute(
+                    text(
+                        f"INSERT INTO resource_metrics ({', '.join(METRIC_COLUMNS)}) "
+                        f"VALUES ({', '.join(':' + c for c in METRIC_COLUMNS)})"
+                    ),
+                    [dict(zip(METRIC_COLUMNS, r)) for r in records]
+                )
+            await db.commit()
+        self._pending_samples.clear()
+
+    # ─────────────────────────────────────────────────────────────────────
+    # PARTITION MAINTENANCE
+    # ─────────────────────────────────────────────────────────────────────
+    async def _maintain_partitions(self, db) -> None:
+        """
+        Pre-create upcoming time partitions and enforce resource_metrics
+        retention by dropping whole days (DETACH + DROP, no DELETE bloat).
+        audit_logs / strategy_control_log are never pruned.
+
+        Each table's pre-create runs in its own savepoint: one failing
+        (e.g. a lock timeout on the detach in 0021) must not abort retention.
+        """
+        for table, step, ahead in PARTITIONED_TABLES:
+            try:
+                async with db.begin_nested():
+                    await db.execute(
+                        text("SELECT ensure_time_partitions(:t, :s, NOW()::timestamp, :a)"),
+                        {"t": table, "s": step, "a": ahead}
+                    )
+            except Exception as e:
+                logger.warning("Partition pre-create failed for %s: %s", table, e)
+        dropped = (await db.execute(
+            text(
+                "SELECT drop_time_partitions('resource_metrics', 'day', "
+                "NOW()::timestamp - make_interval(days => :d))"
+            ),
+            {"d": RETENTION_DAYS}
+        )).scalar()
+        if dropped:
+            logger.info("Dropped %d resource_metrics partition(s) past retention.", dropped)
+
+    async def _prune_default_partition(self) -> None:
+        """
+        Rows that landed in resource_metrics_default (maintenance lagged) are
+        never covered by a partition drop. Delete them in short batches, one
+        transaction each, so no long lock is held and autovacuum keeps up.
+        """
+        while True:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    text(
+                        "DELETE FROM resource_metrics_default WHERE ctid IN ("
+                        "  SELECT ctid FROM resource_metrics_default "
+                        "  WHERE recorded_at < NOW() - make_interval(days => :d) "
+                        "  LIMIT :batch)"
+                    ),
+                    {"d": RETENTION_DAYS, "batch": RETENTION_BATCH}
+                )
+                await db.commit()
+            if result.rowcount < RETENTION_BATCH:
+                break
+
     # ─────────────────────────────────────────────────────────────────────
     # LEAK DETECTION
     # ─────────────────────────────────────────────────────────────────────
@@ -25,10 +25,11 @@ from sqlalchemy import text, select, insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from app.core.observability import record_order, record_risk_rejection
 from app.services.strategy_control import StrategyControlService
 from app.models.db import (
-    StrategyState, TradingSession, Order, OrderStatus, 
-    ProductType, OrderType, OrderSide
+    StrategyState, TradingSession, Order, OrderAudit, OrderStatus, OrderStatusEvent,
+    ProductType, OrderType, OrderSide, gen_uuid,
 )
 from app.services.options_service import options_service
 
@@ -359,7 +360,7 @@ class StrategyExecutor:
                 if not session_obj:
                     logger.warning(f"No Active TradingSession found for {today}. Auto-creating one.")
                     session_obj = TradingSession(
-                        id=str(uuid.uuid4()),
+                        id=gen_uuid(),
                         date=today,
                         max_daily_loss=10000.0,
                         max_position_size=100,
@@ -391,11 +392,12 @@ class StrategyExecutor:
                     # RISK BLOCK REMOVED per user request - always proceed
                     if not risk_result.approved:
                         logger.warning(f"RISK VIOLATION IGNORED for {name}: {risk_result.message}")
+                        record_risk_rejection(risk_result.code)
                     
                     if True: # Risk bypass
                         # 4. Write Order to DB
                         new_order = Order(
-                            id=str(uuid.uuid4()),
+                            id=gen_uuid(),
                             session_id=session_obj.id,
                             idempotency_key=idempotency_key,
                             symbol=final_target_symbol,
@@ -406,7 +408,7 @@ class StrategyExecutor:
                             quantity=qty,
                             price=m.get("ltp"),
                             status=OrderStatus.PENDING,
-                            risk_snapshot=risk_result.snapshot
+                            audit=OrderAudit(risk_snapshot=risk_result.snapshot)
                         )
                         db.add(new_order)
                         await db.flush()
@@ -438,7 +440,7 @@ class StrategyExecutor:
                                 new_order.status = OrderStatus.ACKNOWLEDGED
                                 new_order.sent_at = datetime.now(timezone.utc).replace(tzinfo=None)
                                 new_order.acked_at = datetime.now(timezone.utc).replace(tzinfo=None)
-                                new_order.status_history = [{"status": "ACKNOWLEDGED", "time": datetime.now(timezone.utc).isoformat(), "actor": "SYSTEM", "reason": "Fyers API accept"}]
+                                db.add(OrderStatusEvent(order_id=new_order.id, status=OrderStatus.ACKNOWLEDGED, actor="SYSTEM", reason="Fyers API accept"))
                                 
                                 # Send Success Telegram Alert
                                 risk_tag = " (⚠️ OVERRIDE)" if not risk_result.approved else ""
@@ -450,21 +452,22 @@ class StrategyExecutor:
                                 ))
                             else:
                                 new_order.status = OrderStatus.REJECTED
-                                new_order.reject_reason = broker_resp.get("message", "Broker rejection")
-                                new_order.status_history = [{"status": "REJECTED", "time": datetime.now(timezone.utc).isoformat(), "actor": "BROKER", "reason": new_order.reject_reason}]
+                                new_order.audit.reject_reason = broker_resp.get("message", "Broker rejection")
+                                db.add(OrderStatusEvent(order_id=new_order.id, status=OrderStatus.REJECTED, actor="BROKER", reason=new_order.audit.reject_reason))
                                 asyncio.create_task(self.notifier.send_message(
                                     f"❌ *BROKER REJECTED*: `{name}`\n"
                                     f"• Action: {new_sig} {qty}x {final_target_symbol}\n"
-                                    f"• Reason: {new_order.reject_reason}"
+                                    f"• Reason: {new_order.audit.reject_reason}"
                                 ))
                         except Exception as e:
                             logger.error(f"Error submitting live order to broker: {e}")
                             new_order.status = OrderStatus.REJECTED
-                            new_order.reject_reason = f"Exception during submission: {str(e)}"
+                            new_order.audit.reject_reason = f"Exception during submission: {str(e)}"
                             asyncio.create_task(self.notifier.send_message(
                                 f"❌ *SYSTEM ERROR*: Failed to route `{name}` order to broker.\n"
                                 f"• Exception: {str(e)}"
                             ))
+                        record_order(new_order.status.value, db_side.value, ProductType.INTRADAY.value)
 
             # Exit Alert and LIVE ORDER PLACEMENT
             elif new_sig.startswith("EXIT_"):
@@ -496,7 +499,7 @@ class StrategyExecutor:
                 if not session_obj:
                     logger.warning(f"No Active TradingSession found for {today}. Auto-creating one.")
                     session_obj = TradingSession(
-                        id=str(uuid.uuid4()),
+                        id=gen_uuid(),
                         date=today,
                         max_daily_loss=10000.0,
                         max_position_size=100,
@@ -527,11 +530,12 @@ class StrategyExecutor:
                     # RISK BLOCK REMOVED per user request - always proceed
                     if not risk_result.approved:
                         logger.warning(f"RISK VIOLATION IGNORED (EXIT) for {name}: {risk_result.message}")
+                        record_risk_rejection(risk_result.code)
                     
                     if True: # Risk bypass
                         # 4. Write Order to DB
                         new_order = Order(
-                            id=str(uuid.uuid4()),
+                            id=gen_uuid(),
                             session_id=session_obj.id,
                             idempotency_key=idempotency_key,
                             symbol=final_target_symbol,
@@ -542,7 +546,7 @@ class StrategyExecutor:
                             quantity=qty,
                             price=m.get("ltp"),
                             status=OrderStatus.PENDING,
-                            risk_snapshot=risk_result.snapshot
+                            audit=OrderAudit(risk_snapshot=risk_result.snapshot)
                         )
                         db.add(new_order)
                         await db.flush()
@@ -573,7 +577,7 @@ class StrategyExecutor:
                                 new_order.status = OrderStatus.ACKNOWLEDGED
                                 new_order.sent_at = datetime.now(timezone.utc).replace(tzinfo=None)
                                 new_order.acked_at = datetime.now(timezone.utc).replace(tzinfo=None)
-                                new_order.status_history = [{"status": "ACKNOWLEDGED", "time": datetime.now(timezone.utc).isoformat(), "actor": "SYSTEM", "reason": "Fyers API accept"}]
+                                db.add(OrderStatusEvent(order_id=new_order.id, status=OrderStatus.ACKNOWLEDGED, actor="SYSTEM", reason="Fyers API accept"))
                                 
                                 # Send Success Telegram Alert
                                 risk_tag = " (⚠️ OVERRIDE)" if not risk_result.approved else ""
@@ -587,21 +591,22 @@ class StrategyExecutor:
                                 ))
                             else:
                                 new_order.status = OrderStatus.REJECTED
-                                new_order.reject_reason = broker_resp.get("message", "Broker rejection")
-                                new_order.status_history = [{"status": "REJECTED", "time": datetime.now(timezone.utc).isoformat(), "actor": "BROKER", "reason": new_order.reject_reason}]
+                                new_order.audit.reject_reason = broker_resp.get("message", "Broker rejection")
+                                db.add(OrderStatusEvent(order_id=new_order.id, status=OrderStatus.REJECTED, actor="BROKER", reason=new_order.audit.reject_reason))
                                 asyncio.create_task(self.notifier.send_message(
                                     f"❌ *BROKER REJECTED EXIT*: `{name}`\n"
                                     f"• Action: {new_sig} {qty}x {final_target_symbol}\n"
-                                    f"• Reason: {new_order.reject_reason}"
+                                    f"• Reason: {new_order.audit.reject_reason}"
                                 ))
                         except Exception as e:
                             logger.error(f"Error submitting live EXIT order to broker: {e}")
                             new_order.status = OrderStatus.REJECTED
-                            new_order.reject_reason = f"Exception during submission: {str(e)}"
+                            new_order.audit.reject_reason = f"Exception during submission: {str(e)}"
                             asyncio.create_task(self.notifier.send_message(
                                 f"❌ *SYSTEM ERROR*: Failed to route `{name}` EXIT to broker.\n"
                                 f"• Exception: {str(e)}"
                             ))
+                        record_order(new_order.status.value, db_side.value, ProductType.INTRADAY.value)
         
         self._prev_signals[name] = new_sig
         if m.get("last_trade_at"):
@@ -41,7 +41,13 @@ async def test_concurrent_orders_respect_position_limit():
             await asyncio.sleep(0.05)  # Simulate risk evaluation time
 
     mock_db = AsyncMock()
+    mock_db.bind.dialect.name = "postgresql"
     mock_db.execute = AsyncMock(return_value=MagicMock(scalar=lambda: True))
+    # asyncpg driver connection with the transaction already open → fetchval path
+    driver = MagicMock(is_in_transaction=MagicMock(return_value=True),
+                       fetchval=AsyncMock(return_value=True))
+    conn = MagicMock(get_raw_connection=AsyncMock(return_value=MagicMock(driver_connection=driver)))
+    mock_db.connection = AsyncMock(return_value=conn)
 
     # Run two concurrent "risk evaluations"
     await asyncio.gather(
@@ -186,6 +192,11 @@ async def test_daily_loss_triggers_kill_switch():
     no_duplicate.fetchone = lambda: None
     mock_db.execute = AsyncMock(return_value=no_duplicate)
 
+    # Funds circuit breaker row (the upsert in _get_or_create_state): CLOSED
+    cb_row = MagicMock(state="CLOSED", failure_count=0, success_count=0,
+                       last_failure_at=None, opened_at=None, next_attempt_at=None)
+    mock_db.scalars = AsyncMock(return_value=MagicMock(one=lambda: cb_row))
+
     result = await engine._evaluate(
         mock_db, mock_locked_row,
         symbol="NFO:NIFTY24200CE",
@@ -211,7 +222,7 @@ async def test_circuit_breaker_trips_and_fast_fails():
     Circuit breaker transitions CLOSED → OPEN.
     Subsequent calls return fast fail without hitting broker.
     """
-    from app.core.circuit_breaker import CircuitBreaker
+    from app.core.circuit_breaker import CircuitBreaker, _cb_cache
 
     cb = CircuitBreaker(
         service_name="test_broker",
@@ -241,6 +252,8 @@ async def test_circuit_breaker_trips_and_fast_fails():
     mock_state.next_attempt_at = None
     mock_state.opened_at     = None
     mock_state.last_failure_at = None
+    # Failures are an UPDATE … RETURNING of the row (Result.one() is sync)
+    mock_db.execute = AsyncMock(return_value=MagicMock(one=MagicMock(return_value=mock_state)))
 
     with patch.object(cb, '_get_or_create_state', return_value=mock_state):
         with patch.object(mock_db, 'flush', new_callable=AsyncMock):
@@ -251,12 +264,14 @@ async def test_circuit_breaker_trips_and_fast_fails():
                     await fake_broker_call(mock_db)
                 except Exception:
                     pass
+            # One atomic failure UPDATE per call
+            assert mock_db.execute.await_count == 3
 
             # Simulate state after trips
-            from datetime import timezone
             mock_state.state         = "OPEN"
             mock_state.failure_count = 3
-            mock_state.next_attempt_at = datetime(2099, 1, 1, tzinfo=timezone.utc)  # Far future
+            mock_state.next_attempt_at = datetime(2099, 1, 1)  # Far future (naive UTC, as stored)
+            _cb_cache.pop(cb.service_name, None)    # Next call re-reads the row
 
             # Next call: circuit is OPEN → should fast fail, NOT call broker
             result = await fake_broker_call(mock_db)
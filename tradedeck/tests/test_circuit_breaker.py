@@ -0,0 +1,122 @@
+"""
+CircuitBreaker write paths against a real (SQLite) circuit_breaker_states
+row: counter deltas and transitions must not overwrite another worker's trip.
+"""
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.circuit_breaker import CircuitBreaker, _cb_cache
+from app.models.db import Base
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _breaker(name: str) -> CircuitBreaker:
+    _cb_cache.pop(name, None)
+    return CircuitBreaker(service_name=name, failure_threshold=3,
+                          cooldown_seconds=60, success_threshold=2)
+
+
+async def _row(db, name: str):
+    return (await db.execute(
+        text("SELECT state, failure_count, success_count FROM circuit_breaker_states "
+             "WHERE service_name=:n"), {"n": name}
+    )).one()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.mark.asyncio
+async def test_success_reset_is_a_delta_that_keeps_concurrent_failures(session_factory):
+    cb = _breaker("cb_delta")
+    async with session_factory() as db:
+        snap = await cb._snapshot(db)
+        for _ in range(2):
+            snap = await cb._record_failure(db, snap, _now())
+        await db.commit()
+
+        # This worker sees a success → failure_count 2 → 0, held as a delta
+        await cb._record_outcome(db, snap, True, _now())
+        assert snap.failure_delta == -2
+        cb._flush_task.cancel()
+
+        # Meanwhile another worker's failure lands (a plain increment, so the
+        # row stays CLOSED); the reset must not erase it
+        await db.execute(text(
+            "UPDATE circuit_breaker_states SET failure_count = failure_count + 1 "
+            "WHERE service_name='cb_delta'"
+        ))
+        await cb._apply_deltas(db, snap, _now())
+        await db.commit()
+
+        assert tuple(await _row(db, "cb_delta")) == ("CLOSED", 1, 0)
+        assert not snap.dirty
+
+
+@pytest.mark.asyncio
+async def test_delta_flush_does_not_touch_a_row_another_worker_opened(session_factory):
+    cb = _breaker("cb_guard")
+    async with session_factory() as db:
+        snap = await cb._snapshot(db)
+        snap = await cb._record_failure(db, snap, _now())
+        await db.commit()
+        await cb._record_outcome(db, snap, True, _now())   # stale CLOSED snapshot, delta -1
+        cb._flush_task.cancel()
+
+        await db.execute(text(
+            "UPDATE circuit_breaker_states SET state='OPEN', failure_count=3 "
+            "WHERE service_name='cb_guard'"
+        ))
+        await cb._apply_deltas(db, snap, _now())
+        await db.commit()
+
+        assert tuple(await _row(db, "cb_guard")) == ("OPEN", 3, 0)
+
+
+@pytest.mark.asyncio
+async def test_transition_is_compare_and_set(session_factory):
+    cb = _breaker("cb_cas")
+    async with session_factory() as db:
+        snap = await cb._snapshot(db)
+        await db.commit()
+
+        # Another worker opened the breaker after our snapshot was taken
+        await db.execute(text(
+            "UPDATE circuit_breaker_states SET state='OPEN' WHERE service_name='cb_cas'"
+        ))
+        snap.state = "HALF_OPEN"
+        assert await cb._transition(db, snap, "CLOSED", _now()) is False
+        assert "cb_cas" not in _cb_cache          # next call re-reads the row
+        assert (await _row(db, "cb_cas")).state == "OPEN"
+
+        snap.state = "HALF_OPEN"
+        assert await cb._transition(db, snap, "OPEN", _now()) is True
+        assert (await _row(db, "cb_cas")).state == "HALF_OPEN"
+
+
+@pytest.mark.asyncio
+async def test_failures_trip_atomically_at_threshold(session_factory):
+    cb = _breaker("cb_trip")
+    async with session_factory() as db:
+        snap = await cb._snapshot(db)
+        states = []
+        for _ in range(3):
+            snap = await cb._record_failure(db, snap, _now())
+            states.append(snap.state)
+        await db.commit()
+
+        assert states == ["CLOSED", "CLOSED", "OPEN"]
+        assert snap.opened_at is not None and snap.next_attempt_at > snap.opened_at
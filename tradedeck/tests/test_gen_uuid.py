@@ -0,0 +1,34 @@
+"""
+app.models.db.gen_uuid — UUIDv7 layout and time ordering.
+"""
+import time
+import uuid
+
+from app.models import db
+
+
+def test_gen_uuid_is_rfc_v7():
+    for _ in range(100):
+        u = uuid.UUID(db.gen_uuid())
+        assert u.version == 7
+        assert u.variant == uuid.RFC_4122
+
+
+def test_gen_uuid_embeds_unix_ms():
+    before = time.time_ns() // 1_000_000
+    u = uuid.UUID(db.gen_uuid())
+    after = time.time_ns() // 1_000_000
+    assert before <= u.int >> 80 <= after
+
+
+def test_gen_uuid_sorts_by_creation_ms(monkeypatch):
+    # One id per millisecond; random bits must never reorder them
+    start_ns = 1_760_000_000_000 * 1_000_000
+    clock = iter(range(start_ns, start_ns + 500 * 1_000_000, 1_000_000))
+    monkeypatch.setattr(db.time, "time_ns", lambda: next(clock))
+
+    ids = [db.gen_uuid() for _ in range(500)]
+
+    assert ids == sorted(ids)                                   # text order (PK btree on str)
+    assert [uuid.UUID(i) for i in ids] == sorted(uuid.UUID(i) for i in ids)
+    assert len(set(ids)) == len(ids)
@@ -0,0 +1,41 @@
+"""
+Unit tests for app.core.locking — which path takes the advisory lock.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.locking import _try_xact_lock
+
+
+def _mock_db(in_transaction: bool):
+    driver = MagicMock(is_in_transaction=MagicMock(return_value=in_transaction),
+                       fetchval=AsyncMock(return_value=True))
+    conn = MagicMock(
+        get_raw_connection=AsyncMock(return_value=MagicMock(driver_connection=driver)),
+        execute=AsyncMock(return_value=MagicMock(scalar=lambda: False)),
+    )
+    db = MagicMock(connection=AsyncMock(return_value=conn))
+    return db, conn, driver
+
+
+@pytest.mark.asyncio
+async def test_fetchval_used_inside_driver_transaction():
+    db, conn, driver = _mock_db(in_transaction=True)
+
+    assert await _try_xact_lock(db, 42) is True
+
+    driver.fetchval.assert_awaited_once_with("SELECT pg_try_advisory_xact_lock($1)", 42)
+    conn.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_sqlalchemy_before_begin():
+    # The adapter has not issued BEGIN yet: an xact lock via fetchval would be
+    # released on return, so the statement must go through SQLAlchemy
+    db, conn, driver = _mock_db(in_transaction=False)
+
+    assert await _try_xact_lock(db, 42) is False
+
+    driver.fetchval.assert_not_awaited()
+    conn.execute.assert_awaited_once()
+    assert conn.execute.await_args.args[1] == {"key": 42}
@@ -0,0 +1,48 @@
+"""
+Order ↔ orders_audit sidecar: written through Order.audit on new orders,
+read back with an explicit selectinload — never lazy-loaded.
+"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from app.models.db import (
+    Base, Order, OrderAudit, OrderSide, OrderType, ProductType, TradingSession,
+)
+
+
+@pytest.mark.asyncio
+async def test_audit_round_trip_and_no_lazy_load():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as db:
+        session = TradingSession(date="2026-01-02")
+        db.add(session)
+        await db.flush()
+        order = Order(
+            session_id=session.id, idempotency_key="k1", symbol="NSE:X", display_symbol="X",
+            side=OrderSide.BUY, order_type=OrderType.MARKET, product_type=ProductType.INTRADAY,
+            quantity=1, audit=OrderAudit(risk_snapshot={"approved": True}),
+        )
+        db.add(order)
+        await db.flush()
+        # Same pattern as the executor: reject after the order row is flushed
+        order.audit.reject_reason = "Broker rejection"
+        await db.commit()
+
+    async with session_factory() as db:
+        plain = (await db.execute(select(Order))).scalar_one()
+        with pytest.raises(InvalidRequestError):
+            plain.audit
+
+    async with session_factory() as db:
+        loaded = (await db.execute(select(Order).options(selectinload(Order.audit)))).scalar_one()
+        assert loaded.audit.risk_snapshot == {"approved": True}
+        assert loaded.audit.reject_reason == "Broker rejection"
+
+    await engine.dispose()
@@ -0,0 +1,59 @@
+"""
+StrategyControlService.send_intent_bulk against a real (SQLite) schema.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.db import Base, StrategyState
+from app.services.strategy_control import StrategyControlService
+
+
+@pytest.mark.asyncio
+async def test_send_intent_bulk_sets_and_logs_eligible_strategies():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as db:
+        db.add_all([
+            StrategyState(strategy_name="alpha", status="running"),
+            StrategyState(strategy_name="beta",  status="running"),
+            StrategyState(strategy_name="gamma", status="paused"),     # pause blocked
+            StrategyState(strategy_name="delta", status="running",     # intent pending
+                          control_intent="stop", intent_actor="other"),
+            StrategyState(strategy_name="omega", status="running"),    # not requested
+        ])
+        await db.commit()
+
+        svc = StrategyControlService()
+        count = await svc.send_intent_bulk(
+            db, ["alpha", "beta", "gamma", "delta", "missing"], "pause", "ops", "10.0.0.1"
+        )
+
+        states = dict((await db.execute(text(
+            "SELECT strategy_name, control_intent FROM strategy_states"
+        ))).all())
+        logged = (await db.execute(text(
+            "SELECT strategy_name, action, actor, ip_address, from_status, created_at "
+            "FROM strategy_control_log ORDER BY strategy_name"
+        ))).all()
+
+        # Same call again: everything eligible now has a pending intent
+        again = await svc.send_intent_bulk(db, ["alpha", "beta"], "pause", "ops")
+        log_rows = (await db.execute(text("SELECT COUNT(*) FROM strategy_control_log"))).scalar()
+
+    await engine.dispose()
+
+    assert count == 2
+    assert states == {"alpha": "pause", "beta": "pause", "gamma": None,
+                      "delta": "stop", "omega": None}
+    assert count == len(logged)
+    assert [(r.strategy_name, r.action, r.actor, r.ip_address, r.from_status) for r in logged] == [
+        ("alpha", "pause", "ops", "10.0.0.1", "running"),
+        ("beta",  "pause", "ops", "10.0.0.1", "running"),
+    ]
+    assert all(r.created_at is not None for r in logged)   # column default applied
+    assert again == 0
+    assert log_rows == 2